@@ -0,0 +1,72 @@
+"""
+Concurrency benchmark: thread-per-council vs. the native asyncio engine
+
+Starts a local OpenAI-compatible stub server (stubs.StubLLMServer) and points
+real crewai.LLM objects at it, so litellm and its HTTP client are exercised.
+"to_thread" runs each council the way /ask used to, holding a default-executor
+thread for the whole run; "asyncio" awaits CouncilFactory.akickoff() directly.
+
+Usage:
+    python benchmarks/bench_concurrency.py [--councils 64] [--delay 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.factory import CouncilFactory
+from llm_council.stubs import StubLLMServer
+
+
+async def drive(run_one, councils):
+    peak_threads = threading.active_count()
+    done = asyncio.Event()
+
+    async def sample_threads():
+        nonlocal peak_threads
+        while not done.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.01)
+
+    sampler = asyncio.create_task(sample_threads())
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one({"question": f"Question {i}?"}) for i in range(councils)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await sampler
+    return {
+        "wall_s": round(elapsed, 3),
+        "councils_per_s": round(councils / elapsed, 2),
+        "peak_threads": peak_threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--councils", type=int, default=64, help="councils in flight at once")
+    parser.add_argument("--delay", type=float, default=0.2, help="stub server latency per call (s)")
+    args = parser.parse_args()
+
+    with StubLLMServer(delay=args.delay) as server:
+        factory = CouncilFactory(llms=server.llms())
+        results = {
+            "to_thread": asyncio.run(drive(
+                lambda inputs: asyncio.to_thread(factory.engine.kickoff, inputs), args.councils)),
+            "asyncio": asyncio.run(drive(factory.akickoff, args.councils)),
+        }
+
+    print(f"{'':<11}{'wall s':>9}{'councils/s':>12}{'peak threads':>14}")
+    for name, r in results.items():
+        print(f"{name:<11}{r['wall_s']:>9.3f}{r['councils_per_s']:>12.2f}{r['peak_threads']:>14}")
+    print(json.dumps({"councils": args.councils, "delay_s": args.delay,
+                      "executor_threads": min(32, (os.cpu_count() or 1) + 4), **results}))
+
+
+if __name__ == "__main__":
+    main()
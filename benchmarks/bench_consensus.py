@@ -0,0 +1,79 @@
+"""
+Consensus fast-path benchmark: full council vs. early exit when the drafts agree
+
+Uses stub LLMs with fixed per-call delays, so no API keys or network are needed.
+"agree" stubs return the same draft from every delegate; "disagree" stubs return
+unrelated drafts, so the fast path must not fire.
+
+Usage:
+    python benchmarks/bench_consensus.py [--delay 0.2] [--threshold 0.6] [--rounds 3]
+"""
+
+import argparse
+import json
+import os
+import time
+from statistics import median
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.consensus import MAJORITY, SYNTHESIZE, ConsensusPolicy
+from llm_council.factory import CouncilFactory
+from llm_council.stubs import StubLLM
+
+DRAFTS = {
+    "agree": {
+        "gpt4o": "Rayleigh scattering of sunlight by air molecules makes the sky blue.",
+        "claude3": "Rayleigh scattering of sunlight by air molecules makes the sky blue.",
+        "gemini2": "Rayleigh scattering of sunlight by air molecules makes the sky blue.",
+    },
+    "disagree": {
+        "gpt4o": "Short wavelengths scatter more strongly in the atmosphere.",
+        "claude3": "Oceans reflect their colour upward onto clouds.",
+        "gemini2": "Human eyes respond most to blue light at noon.",
+    },
+}
+
+
+def bench(scenario, policy, delay, rounds):
+    totals, calls = [], []
+    fired = 0
+    for _ in range(rounds):
+        llms = {name: StubLLM(model=f"stub/{name}", delay=delay, response=draft)
+                for name, draft in DRAFTS[scenario].items()}
+        factory = CouncilFactory(llms=llms, consensus=policy)
+        start = time.perf_counter()
+        result = factory.kickoff({"question": "Why is the sky blue?"})
+        totals.append(time.perf_counter() - start)
+        calls.append(sum(llm.calls for llm in llms.values()))
+        fired += bool(result.fast_path and result.fast_path["fired"])
+    return {"total_s": round(median(totals), 3), "llm_calls": median(calls), "fast_path_fired": fired}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.2, help="per-call stub delay (s)")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    policies = {
+        "full": None,
+        SYNTHESIZE: ConsensusPolicy(threshold=args.threshold, action=SYNTHESIZE),
+        MAJORITY: ConsensusPolicy(threshold=args.threshold, action=MAJORITY),
+    }
+    results = {
+        scenario: {name: bench(scenario, policy, args.delay, args.rounds) for name, policy in policies.items()}
+        for scenario in DRAFTS
+    }
+
+    print(f"{'scenario':<10}{'mode':<12}{'total_s':>10}{'calls':>8}{'fired':>8}")
+    for scenario, modes in results.items():
+        for name, r in modes.items():
+            print(f"{scenario:<10}{name:<12}{r['total_s']:>10.3f}{r['llm_calls']:>8}{r['fast_path_fired']:>8}")
+    print(json.dumps({"delay_s": args.delay, "threshold": args.threshold, **results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Structured critique benchmark: what the chairman reads with free-text vs. structured critiques
+
+Uses stub LLMs, so no API keys or network are needed. The critics make the
+same points in every mode; only the format changes:
+
+- free text: STRENGTH/WEAKNESS/MISSING prose per answer, pasted as is
+- structured, raw: CritiqueReport JSON pasted as is (no merging)
+- structured, merged: CritiqueReport JSON, merged per draft (critique.py)
+
+Each row reports the chairman's input tokens and the critique tokens in it
+(estimated, ~4 characters per token), and whether the drafts came out ranked.
+
+Usage:
+    python benchmarks/bench_critique.py [--claims 2]
+"""
+
+import argparse
+import json
+import os
+from dataclasses import replace
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.context import message_tokens
+from llm_council.crew import LlmCouncil
+from llm_council.factory import CouncilFactory
+from llm_council.stubs import StubLLM
+
+QUESTION = {"question": "Why is the sky blue?"}
+
+CLAIMS = {
+    "strengths": ["names Rayleigh scattering correctly", "explains the role of air molecules",
+                  "short and accurate"],
+    "weaknesses": ["never says why violet light is not dominant", "no wavelength dependence formula",
+                   "confuses scattering with reflection"],
+    "missing": ["why sunsets look red or orange", "the eye's sensitivity to blue light",
+                "how clouds scatter all colours equally"],
+}
+
+
+def reviews(name, claims):
+    """The same points in every mode: each critic reviews both answers it is given"""
+    offset = len(name)
+    return [
+        {"answer": answer, "score": 5 + (offset + answer) % 4,
+         **{kind: [texts[(offset + answer + i) % len(texts)] for i in range(claims)] for kind, texts in CLAIMS.items()}}
+        for answer in (1, 2)
+    ]
+
+
+def prose(review):
+    return "\n".join([f"Answer {review['answer']} ({review['score']}/10):"] + [
+        f"{label}: " + "; ".join(review[kind]) + "."
+        for label, kind in (("STRENGTH", "strengths"), ("WEAKNESS", "weaknesses"), ("MISSING", "missing"))
+    ])
+
+
+def responder(name, structured, claims):
+    def answer(messages):
+        prompt = messages[-1]["content"] if isinstance(messages, list) else messages
+        if "Review the OTHER models' answers" not in prompt:
+            return f"{name}: Rayleigh scattering by air molecules scatters blue sunlight the most."
+        if structured:
+            return json.dumps({"reviews": reviews(name, claims)})
+        return "\n\n".join(prose(review) for review in reviews(name, claims))
+    return answer
+
+
+def bench(mode, claims):
+    topology = LlmCouncil().topology
+    if mode != "structured, merged":
+        topology = replace(topology, phases=tuple(replace(phase, output=None) for phase in topology.phases))
+    llms = {name: StubLLM(model=f"stub/{name}", delay=0.0, response=responder(name, mode != "free text", claims))
+            for name in ("gpt4o", "claude3", "gemini2")}
+    result = CouncilFactory(llms=llms, topology=topology).kickoff(QUESTION)
+    final = result.tasks[-1]
+    return {
+        "chairman_input_tokens": message_tokens(final.messages or final.render(QUESTION)),
+        "critique_tokens": message_tokens([{"content": final.context_text()}]),
+        "ranked": bool(result.critiques and result.critiques["ranking"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--claims", type=int, default=2, help="claims per list in each review")
+    args = parser.parse_args()
+
+    modes = ["free text", "structured, raw", "structured, merged"]
+    results = {mode: bench(mode, args.claims) for mode in modes}
+
+    print(f"{'critiques':<20}{'chairman_in':>12}{'critiques':>11}{'ranked':>8}")
+    for mode, r in results.items():
+        print(f"{mode:<20}{r['chairman_input_tokens']:>12}{r['critique_tokens']:>11}{str(r['ranked']):>8}")
+    print(json.dumps({"claims": args.claims, **results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Resilience benchmark: how many councils answer when providers fail
+
+Stub LLMs raise on a fraction of calls (`--error-rates`). Councils run
+concurrently under three policies:
+
+- none: no retries or fallbacks, any failed call fails the council
+- retry+fallback: 2 attempts per model, then the FALLBACKS model (the
+  shipped agents.yaml sets no retries or fallbacks)
+- retry+fallback+degrade: the same, and a task that still fails leaves a
+  partial council instead of failing it
+
+Each row reports the share of councils that answered, the share of answers
+that were partial (degraded), p50/p99 latency and the model calls spent.
+
+Usage:
+    python benchmarks/bench_degrade.py [--councils 100] [--error-rates 0.05,0.2,0.5] [--backoff 0.01]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from statistics import quantiles
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.factory import CouncilFactory
+from llm_council.resilience import AgentPolicy, RetryPolicy
+from llm_council.stubs import StubLLM
+
+# Fallback model per agent role (the example in agents.yaml's header)
+FALLBACKS = {
+    "GPT Delegate": "claude3",
+    "Claude Delegate": "gemini2",
+    "Gemini Delegate": "claude3",
+    "Council Chairman": "claude3",
+}
+
+POLICIES = {
+    "none": (False, False),
+    "retry+fallback": (True, False),
+    "retry+fallback+degrade": (True, True),
+}
+
+
+def faulty_llms(args, error_rate, seed):
+    return {
+        name: StubLLM(model=f"stub/{name}", delay=args.delay, error_rate=error_rate, seed=seed + i)
+        for i, name in enumerate(("gpt4o", "claude3", "gemini2"))
+    }
+
+
+def build_factory(args, llms, resilient, degrade):
+    factory = CouncilFactory(llms=llms, degrade=degrade)
+    if resilient:
+        # A short backoff so a run takes seconds
+        factory.engine.policies = {
+            role: AgentPolicy(retry=RetryPolicy(attempts=2, backoff=args.backoff), fallbacks=[llms[model]])
+            for role, model in FALLBACKS.items()
+        }
+    return factory
+
+
+async def run_councils(factory, councils, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, degraded, failures = [], 0, 0
+
+    async def one(i):
+        nonlocal degraded, failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await factory.akickoff({"question": f"Question {i}?"})
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - start)
+            if result.degraded and result.degraded["partial"]:
+                degraded += 1
+
+    await asyncio.gather(*(one(i) for i in range(councils)))
+    return latencies, degraded, failures
+
+
+def summarize(latencies, degraded, failures, calls, councils):
+    cuts = quantiles(latencies, n=100) if len(latencies) > 1 else (latencies or [0.0]) * 99
+    return {
+        "answered": round(len(latencies) / councils, 3),
+        "degraded": round(degraded / max(1, len(latencies)), 3),
+        "failed": failures,
+        "p50_s": round(cuts[49], 3),
+        "p99_s": round(cuts[98], 3),
+        "calls_per_council": round(calls / councils, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--councils", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--delay", type=float, default=0.02, help="per-call delay (s)")
+    parser.add_argument("--error-rates", default="0.05,0.2,0.5", help="fractions of calls that raise")
+    parser.add_argument("--backoff", type=float, default=0.01, help="first retry delay (s)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = {}
+    for error_rate in [float(rate) for rate in args.error_rates.split(",")]:
+        for name, (resilient, degrade) in POLICIES.items():
+            llms = faulty_llms(args, error_rate, args.seed)
+            factory = build_factory(args, llms, resilient, degrade)
+            outcome = asyncio.run(run_councils(factory, args.councils, args.concurrency))
+            calls = sum(llm.calls for llm in llms.values())
+            results[f"{error_rate}/{name}"] = {"error_rate": error_rate, "policy": name,
+                                               **summarize(*outcome, calls, args.councils)}
+
+    print(f"{'errors':>7}  {'policy':<24}{'answered':>9}{'degraded':>9}{'p50_s':>8}{'p99_s':>8}{'calls':>7}")
+    for r in results.values():
+        print(f"{r['error_rate']:>7.2f}  {r['policy']:<24}{r['answered']:>9.3f}{r['degraded']:>9.3f}"
+              f"{r['p50_s']:>8.3f}{r['p99_s']:>8.3f}{r['calls_per_council']:>7.2f}")
+    print(json.dumps({"config": vars(args), "results": list(results.values())}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Load test of the FastAPI service: /ask, /ask/detailed and /status at increasing concurrency
+
+The app in api.py is driven in-process through httpx's ASGI transport, with
+stub LLMs behind it (configurable latency distribution and error rate), so
+no API keys or network are needed. Each virtual user is its own client IP
+and sends requests back to back. Every level reports throughput, p50/p95/p99
+latency per endpoint, the 429 and error rates, and peak threads and RSS.
+
+Results are JSON (--output); with --baseline a previous result file is
+compared and the run fails when throughput or p95 regress beyond --tolerance.
+--url drives an already running server instead (its own LLM backend, e.g.
+LLM_COUNCIL_REPLAY).
+
+Usage:
+    python benchmarks/bench_load.py [--levels 1,4,16,64] [--requests 100]
+        [--delay 0.2] [--distribution lognormal] [--spread 0.5] [--error-rate 0.0]
+        [--mix ask=0.7,detailed=0.2,status=0.1] [--repeat 0.0] [--rate-limit]
+        [--max-concurrent 5] [--queue-size 50] [--output results.json] [--baseline old.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+import httpx
+
+from llm_council.stubs import StubLLM, latency_distribution
+
+ENDPOINTS = {
+    "ask": ("POST", "/ask"),
+    "detailed": ("POST", "/ask/detailed"),
+    "status": ("GET", "/status"),
+}
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name!r} (expected {list(ENDPOINTS)})")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def rss_mb():
+    """Resident set size of this process (the server runs in it)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def summarize(samples, elapsed):
+    latencies = [s["latency"] for s in samples]
+    ok = [s for s in samples if s["status"] == 200]
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "p50_s": round(percentile(latencies, 50) or 0, 4),
+        "p95_s": round(percentile(latencies, 95) or 0, 4),
+        "p99_s": round(percentile(latencies, 99) or 0, 4),
+        "rate_429": round(sum(s["status"] == 429 for s in samples) / len(samples), 4) if samples else 0.0,
+        "error_rate": round(sum(s["status"] >= 500 or s["status"] == 0 for s in samples) / len(samples), 4)
+        if samples else 0.0,
+    }
+
+
+async def run_level(make_client, concurrency, requests, mix, repeat, rng, level_no):
+    """`concurrency` users share `requests` requests; returns the level's report"""
+    names, weights = list(mix), list(mix.values())
+    plan = [rng.choices(names, weights)[0] for _ in range(requests)]
+    asked = []
+    samples = []
+    peak = {"threads": threading.active_count(), "rss_mb": rss_mb()}
+    done = asyncio.Event()
+
+    async def sample():
+        while not done.is_set():
+            peak["threads"] = max(peak["threads"], threading.active_count())
+            peak["rss_mb"] = max(peak["rss_mb"], rss_mb())
+            await asyncio.sleep(0.05)
+
+    async def user(index):
+        async with make_client(index) as client:
+            while plan:
+                name = plan.pop()
+                method, path = ENDPOINTS[name]
+                body = None
+                if method == "POST":
+                    if asked and rng.random() < repeat:
+                        question = rng.choice(asked)
+                    else:
+                        question = f"Load question {level_no}-{len(asked)}: why is the sky blue?"
+                        asked.append(question)
+                    body = {"question": question}
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = 0
+                samples.append({"endpoint": name, "status": status, "latency": time.perf_counter() - start})
+
+    sampler = asyncio.create_task(sample())
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await sampler
+
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        **summarize(samples, elapsed),
+        "by_endpoint": {
+            name: summarize([s for s in samples if s["endpoint"] == name], elapsed)
+            for name in mix if any(s["endpoint"] == name for s in samples)
+        },
+        "peak_threads": peak["threads"],
+        "peak_rss_mb": round(peak["rss_mb"], 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regressions against a previous result file: lower throughput or higher p95 beyond `tolerance`"""
+    previous = {level["concurrency"]: level for level in baseline["levels"]}
+    regressions = []
+    for level in results["levels"]:
+        old = previous.get(level["concurrency"])
+        if old is None:
+            continue
+        if old["throughput_rps"] and level["throughput_rps"] < old["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"c={level['concurrency']}: throughput {old['throughput_rps']} -> "
+                               f"{level['throughput_rps']} rps")
+        if old["p95_s"] and level["p95_s"] > old["p95_s"] * (1 + tolerance):
+            regressions.append(f"c={level['concurrency']}: p95 {old['p95_s']} -> {level['p95_s']} s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", default="1,4,16,64", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=100, help="requests per level")
+    parser.add_argument("--delay", type=float, default=0.2, help="mean stub LLM call latency (s)")
+    parser.add_argument("--distribution", default="lognormal", help="fixed, uniform, exponential or lognormal")
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability a stub LLM call fails")
+    parser.add_argument("--mix", default="ask=0.7,detailed=0.2,status=0.1")
+    parser.add_argument("--repeat", type=float, default=0.0, help="share of questions asked before (cache hits)")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the per-IP hourly limits on")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="LLM_COUNCIL_MAX_CONCURRENT")
+    parser.add_argument("--queue-size", type=int, default=None, help="LLM_COUNCIL_QUEUE_SIZE")
+    parser.add_argument("--url", default=None, help="drive a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    # The app reads its limits when api.py is imported
+    if args.max_concurrent is not None:
+        os.environ["LLM_COUNCIL_MAX_CONCURRENT"] = str(args.max_concurrent)
+    if args.queue_size is not None:
+        os.environ["LLM_COUNCIL_QUEUE_SIZE"] = str(args.queue_size)
+    os.environ.setdefault("LLM_COUNCIL_TRACE", "off")
+
+    if args.url:
+        def make_client(index):
+            return httpx.AsyncClient(base_url=args.url, timeout=None)
+        settings = {"url": args.url}
+    else:
+        import llm_council.api as server
+        import llm_council.service as service
+
+        delay = latency_distribution(args.distribution, args.delay, args.spread)
+        llms = {
+            name: StubLLM(model=f"stub/{name}", delay=delay, error_rate=args.error_rate, seed=args.seed + i)
+            for i, name in enumerate(("gpt4o", "claude3", "gemini2"))
+        }
+        # The server's own builder, so every LLM_COUNCIL_* setting applies as it would in production
+        service._council_factory = service.build_council_factory(service.build_recorder(), llms=llms)
+        server.limiter.enabled = args.rate_limit
+
+        def make_client(index):
+            # One client IP per virtual user, so per-IP limits apply per user
+            transport = httpx.ASGITransport(app=server.app, client=(f"10.0.{index // 250}.{index % 250 + 1}", 4000))
+            return httpx.AsyncClient(transport=transport, base_url="http://council", timeout=None)
+        settings = {
+            "delay_s": args.delay, "distribution": args.distribution, "spread": args.spread,
+            "error_rate": args.error_rate, "rate_limit": args.rate_limit,
+            "max_concurrent": server.MAX_CONCURRENT, "queue_size": server.QUEUE_SIZE,
+        }
+
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    levels = []
+    for level_no, concurrency in enumerate(int(c) for c in args.levels.split(",")):
+        levels.append(asyncio.run(run_level(make_client, concurrency, args.requests, mix, args.repeat,
+                                            rng, level_no)))
+
+    print(f"{'conc':>5}{'rps':>9}{'p50_s':>9}{'p95_s':>9}{'p99_s':>9}{'429':>8}{'err':>8}{'threads':>9}{'rss_mb':>9}")
+    for level in levels:
+        print(f"{level['concurrency']:>5}{level['throughput_rps']:>9.2f}{level['p50_s']:>9.3f}"
+              f"{level['p95_s']:>9.3f}{level['p99_s']:>9.3f}{level['rate_429']:>8.3f}{level['error_rate']:>8.3f}"
+              f"{level['peak_threads']:>9}{level['peak_rss_mb']:>9.1f}")
+
+    results = {"settings": {**settings, "requests_per_level": args.requests, "mix": mix,
+                            "repeat": args.repeat, "seed": args.seed},
+               "levels": levels}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Phase-level latency benchmark: crewAI sequential kickoff vs. the phase-parallel engine
+
+Uses stub LLMs with fixed per-call delays, so no API keys or network are needed.
+
+Usage:
+    python benchmarks/bench_phases.py [--gpt 0.3] [--claude 0.2] [--gemini 0.1] [--rounds 3]
+"""
+
+import argparse
+import json
+import os
+import time
+from statistics import median
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.crew import LlmCouncil
+from llm_council.engine import PARALLEL, SEQUENTIAL, CouncilEngine, council_phases, phase_name
+from llm_council.stubs import stub_llms
+
+
+def quiet_crew(delays):
+    crew = LlmCouncil(llms=stub_llms(**delays)).crew()
+    crew.verbose = False
+    for agent in crew.agents:
+        agent.verbose = False
+    return crew
+
+
+def phase_wall_times(crew):
+    """Wall time per phase from each task's start/end timestamps (crew.kickoff runs)"""
+    timings = {}
+    for index, phase in enumerate(council_phases(crew.tasks)):
+        start = min(task.start_time for task in phase)
+        end = max(task.end_time for task in phase)
+        timings[phase_name(index)] = (end - start).total_seconds()
+    return timings
+
+
+def bench(mode, delays, rounds):
+    totals, phases = [], []
+    inputs = {"question": "Why is the sky blue?"}
+    for _ in range(rounds):
+        crew = quiet_crew(delays)
+        start = time.perf_counter()
+        if mode == SEQUENTIAL:
+            crew.kickoff(inputs=inputs)
+            totals.append(time.perf_counter() - start)
+            phases.append(phase_wall_times(crew))
+        else:
+            result = CouncilEngine(crew).kickoff(inputs)
+            totals.append(time.perf_counter() - start)
+            phases.append(result.phase_timings)
+    return {
+        "total_s": round(median(totals), 3),
+        "phases_s": {name: round(median(p[name] for p in phases), 3) for name in phases[0]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--gpt", type=float, default=0.3, help="gpt4o stub delay (s)")
+    parser.add_argument("--claude", type=float, default=0.2, help="claude3 stub delay (s)")
+    parser.add_argument("--gemini", type=float, default=0.1, help="gemini2 stub delay (s)")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    delays = {"gpt": args.gpt, "claude": args.claude, "gemini": args.gemini}
+    results = {mode: bench(mode, delays, args.rounds) for mode in (SEQUENTIAL, PARALLEL)}
+
+    print(f"{'phase':<12}{'sequential':>12}{'parallel':>12}")
+    for name in results[SEQUENTIAL]["phases_s"]:
+        print(f"{name:<12}{results[SEQUENTIAL]['phases_s'][name]:>12.3f}{results[PARALLEL]['phases_s'][name]:>12.3f}")
+    print(f"{'total':<12}{results[SEQUENTIAL]['total_s']:>12.3f}{results[PARALLEL]['total_s']:>12.3f}")
+    print(json.dumps({"delays_s": delays, **results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Connection pool benchmark: per-call latency against a local HTTPS stub provider
+
+Real crewai.LLM objects (litellm, the OpenAI SDK and httpx) call a local
+OpenAI-compatible stub (stubs.stub_llm_app) over TLS, served from its own
+process so it does not compete with the clients for the GIL. Each client
+setup runs in a fresh process (so one-time costs land where a new server
+would pay them), with councils running concurrently:
+
+- litellm: litellm's own cached clients (no pool installed)
+- no keep-alive: the pool with no idle connections kept, so every call
+  opens a TCP connection and does a TLS handshake
+- pooled: the shared keep-alive pool (pool.py), cold
+- pooled+warm: the same, after warm() (connections opened, SDK loaded)
+
+Each row reports per-call latency (all calls and the first council's),
+council latency, and the TCP connections and TLS handshakes per call. The
+stub is on localhost, so handshakes cost far less than over a real network;
+the per-call savings scale with the provider's round-trip time.
+
+Usage:
+    python benchmarks/bench_pool.py [--councils 50] [--concurrency 10] [--delay 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from statistics import quantiles
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+import litellm
+
+from crewai import LLM
+
+from llm_council.factory import CouncilFactory
+from llm_council.pool import ClientPool, set_client_pool
+from llm_council.stubs import self_signed_certificate, stub_llm_app
+
+HOST = "127.0.0.1"
+
+
+def serve(port, delay, certificate, key):
+    """The stub provider (run in a child process by main())"""
+    import uvicorn
+
+    uvicorn.run(stub_llm_app(delay), host=HOST, port=port, log_level="warning", access_log=False,
+                ssl_certfile=certificate, ssl_keyfile=key)
+
+
+def start_server(args, certificate, key):
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen([sys.executable, __file__, "--serve", str(port), "--delay", str(args.delay),
+                                "--certificate", certificate, "--key", key])
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=0.5).close()
+            return process, f"https://{HOST}:{port}/v1"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("stub provider did not start")
+
+
+MODES = ["litellm", "no keep-alive", "pooled", "pooled+warm"]
+
+
+def build_pool(mode, certificate):
+    if mode == "litellm":
+        litellm.ssl_verify = certificate  # litellm's own clients must trust the stub too
+        return None
+    return ClientPool(max_keepalive=0 if mode == "no keep-alive" else 20, verify=certificate)
+
+
+def stub_llms(base_url):
+    return {name: LLM(model=f"openai/stub-{name}", base_url=base_url, api_key="stub")
+            for name in ("gpt4o", "claude3", "gemini2")}
+
+
+def percentile(values, p):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return quantiles(values, n=100)[p - 1]
+
+
+async def run_mode(base_url, pool, warm, args):
+    set_client_pool(pool)
+    try:
+        factory = CouncilFactory(llms=stub_llms(base_url))
+        if pool is not None and warm:
+            await pool.warm(factory.council_llms(), connections=args.concurrency)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        councils, calls, first = [], [], []
+
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                result = await factory.akickoff({"question": f"Question {i}?"})
+                councils.append(time.perf_counter() - start)
+                latencies = [record.latency for record in result.usage]
+                calls.extend(latencies)
+                if i == 0:
+                    first.extend(latencies)
+
+        await one(0)  # the first council alone: what a fresh server's first request sees
+        await asyncio.gather(*(one(i) for i in range(1, args.councils)))
+        stats = pool.stats()["endpoints"] if pool is not None else {}
+        return councils, calls, first, stats
+    finally:
+        if pool is not None:
+            await pool.close()
+        set_client_pool(None)
+
+
+def summarize(councils, calls, first, stats):
+    connections = sum(s["connections"] - s["warmed"] for s in stats.values())
+    handshakes = sum(s["tls_handshakes"] for s in stats.values()) - sum(s["warmed"] for s in stats.values())
+    return {
+        "call_p50_ms": round(percentile(calls, 50) * 1000, 2),
+        "call_p95_ms": round(percentile(calls, 95) * 1000, 2),
+        "first_council_call_ms": round(sum(first) / len(first) * 1000, 2),
+        "council_p50_ms": round(percentile(councils, 50) * 1000, 2),
+        "connections_per_call": round(connections / len(calls), 3) if stats else None,
+        "tls_per_call": round(handshakes / len(calls), 3) if stats else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--councils", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.02, help="stub response delay per call (s)")
+    # Internal: the stub provider process, and one client setup's run
+    parser.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--certificate", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--key", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve is not None:
+        serve(args.serve, args.delay, args.certificate, args.key)
+        return
+    if args.mode is not None:
+        pool = build_pool(args.mode, args.certificate)
+        outcome = asyncio.run(run_mode(args.base_url, pool, args.mode == "pooled+warm", args))
+        print(json.dumps(summarize(*outcome)))
+        return
+
+    certificate, key = self_signed_certificate(HOST)
+    process, base_url = start_server(args, certificate, key)
+    results = {}
+    try:
+        for mode in MODES:
+            run = subprocess.run([sys.executable, __file__, "--mode", mode, "--base-url", base_url,
+                                  "--certificate", certificate, "--councils", str(args.councils),
+                                  "--concurrency", str(args.concurrency)],
+                                 capture_output=True, text=True, check=True)
+            results[mode] = json.loads(run.stdout.strip().splitlines()[-1])
+    finally:
+        process.terminate()
+        process.wait()
+        for path in (certificate, key):
+            os.unlink(path)
+
+    print(f"{'clients':<15}{'call_p50':>10}{'call_p95':>10}{'1st_call':>10}{'council':>10}{'conn/call':>11}{'tls/call':>10}")
+    for name, r in results.items():
+        conn = "n/a" if r["connections_per_call"] is None else f"{r['connections_per_call']:.3f}"
+        tls = "n/a" if r["tls_per_call"] is None else f"{r['tls_per_call']:.3f}"
+        print(f"{name:<15}{r['call_p50_ms']:>10.2f}{r['call_p95_ms']:>10.2f}{r['first_council_call_ms']:>10.2f}"
+              f"{r['council_p50_ms']:>10.2f}{conn:>11}{tls:>10}")
+    config = {"councils": args.councils, "concurrency": args.concurrency, "delay": args.delay}
+    print(json.dumps({"config": config, **results}))
+
+
+if __name__ == "__main__":
+    main()
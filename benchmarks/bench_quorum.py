@@ -0,0 +1,95 @@
+"""
+Quorum benchmark: p50/p99 council latency with a fault-injecting delegate
+
+Stub LLMs with a latency tail (`--slow-rate` of calls take `--slow-delay`)
+and random errors stand in for a flaky provider. Councils run concurrently;
+each one's wall time is recorded under three policies:
+
+- all: wait for every delegate (errors fail the council)
+- quorum: proceed once k delegates answered, cancel the rest
+- quorum+deadline: the same, plus a per-model deadline
+
+Usage:
+    python benchmarks/bench_quorum.py [--councils 200] [--k 2] [--deadline 0.3] [--slow-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from statistics import quantiles
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.engine import QuorumPolicy
+from llm_council.factory import CouncilFactory
+from llm_council.stubs import StubLLM
+
+
+def faulty_llms(args, seed):
+    """Every delegate has the same latency tail and error rate"""
+    return {
+        name: StubLLM(model=f"stub/{name}", delay=args.delay, slow_rate=args.slow_rate,
+                      slow_delay=args.slow_delay, error_rate=args.error_rate, seed=seed + i)
+        for i, name in enumerate(("gpt4o", "claude3", "gemini2"))
+    }
+
+
+async def run_councils(factory, councils, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one(i):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await factory.akickoff({"question": f"Question {i}?"})
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(councils)))
+    return latencies, failures
+
+
+def summarize(latencies, failures):
+    cuts = quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {"p50_s": round(cuts[49], 3), "p99_s": round(cuts[98], 3), "failed": failures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--councils", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.05, help="normal per-call delay (s)")
+    parser.add_argument("--slow-rate", type=float, default=0.1, help="fraction of calls in the latency tail")
+    parser.add_argument("--slow-delay", type=float, default=1.0, help="per-call delay in the tail (s)")
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--k", type=int, default=2)
+    parser.add_argument("--deadline", type=float, default=0.3, help="per-model deadline (s)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    models = [f"stub/{name}" for name in ("gpt4o", "claude3", "gemini2")]
+    policies = {
+        "all": None,
+        "quorum": QuorumPolicy(k=args.k),
+        "quorum+deadline": QuorumPolicy(k=args.k, model_timeouts={m: args.deadline for m in models}),
+    }
+    results = {}
+    for name, policy in policies.items():
+        factory = CouncilFactory(llms=faulty_llms(args, args.seed), quorum=policy)
+        results[name] = summarize(*asyncio.run(run_councils(factory, args.councils, args.concurrency)))
+
+    print(f"{'policy':<18}{'p50_s':>8}{'p99_s':>8}{'failed':>8}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['p50_s']:>8.3f}{r['p99_s']:>8.3f}{r['failed']:>8}")
+    print(json.dumps({"config": vars(args), **results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Difficulty routing evaluation: full council vs. routed councils on a question set
+
+Every question is answered twice with stub LLMs (per-model delays, no API keys
+or network): once by the full council and once by the tier the router picks
+(config/router.yaml). Reports latency and model calls per mode and tier, and,
+when the question set has "difficulty" labels, how often the router agrees.
+
+Question sets are JSONL: {"id": ..., "question": ..., "difficulty": "easy"}.
+
+Usage:
+    python benchmarks/bench_routing.py [--questions benchmarks/data/routing_questions.jsonl]
+        [--router-config path/to/router.yaml] [--scale 1.0]
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from statistics import mean
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.factory import CouncilFactory
+from llm_council.routing import ROUTER_CONFIG, DifficultyRouter
+from llm_council.stubs import stub_llms
+
+QUESTIONS = os.path.join(os.path.dirname(__file__), "data", "routing_questions.jsonl")
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(factory, llms, question, topology=None):
+    before = sum(llm.calls for llm in llms.values())
+    start = time.perf_counter()
+    factory.kickoff({"question": question}, topology=topology)
+    return time.perf_counter() - start, sum(llm.calls for llm in llms.values()) - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--questions", default=QUESTIONS)
+    parser.add_argument("--router-config", default=ROUTER_CONFIG)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplies the stub delays (o3-mini 0.3s, Haiku 0.2s, Flash-Lite 0.1s)")
+    args = parser.parse_args()
+
+    llms = stub_llms(gpt=0.3 * args.scale, claude=0.2 * args.scale, gemini=0.1 * args.scale)
+    factory = CouncilFactory(llms=llms)
+    router = DifficultyRouter.from_yaml(factory.topology, args.router_config)
+
+    rows = []
+    for record in load(args.questions):
+        decision = router.route(record["question"])
+        full_s, full_calls = run(factory, llms, record["question"])
+        routed_s, routed_calls = run(factory, llms, record["question"], decision.topology)
+        rows.append({
+            "id": record.get("id"), "label": record.get("difficulty"), "tier": decision.tier,
+            "score": decision.score, "full_s": full_s, "full_calls": full_calls,
+            "routed_s": routed_s, "routed_calls": routed_calls,
+        })
+
+    print(f"{'id':<6}{'label':<8}{'tier':<8}{'score':>7}{'full_s':>9}{'routed_s':>10}{'calls':>9}")
+    for r in rows:
+        print(f"{str(r['id']):<6}{str(r['label'] or '-'):<8}{r['tier']:<8}{r['score']:>7.3f}"
+              f"{r['full_s']:>9.3f}{r['routed_s']:>10.3f}{r['full_calls']:>5}->{r['routed_calls']:<3}")
+
+    full_calls = sum(r["full_calls"] for r in rows)
+    routed_calls = sum(r["routed_calls"] for r in rows)
+    summary = {
+        "questions": len(rows),
+        "tiers": dict(Counter(r["tier"] for r in rows)),
+        "full": {"mean_s": round(mean(r["full_s"] for r in rows), 3), "calls": full_calls},
+        "routed": {"mean_s": round(mean(r["routed_s"] for r in rows), 3), "calls": routed_calls},
+        "calls_saved_pct": round(100 * (1 - routed_calls / full_calls), 1) if full_calls else 0.0,
+        "by_tier": {
+            tier: {
+                "mean_full_s": round(mean(r["full_s"] for r in tier_rows), 3),
+                "mean_routed_s": round(mean(r["routed_s"] for r in tier_rows), 3),
+                "calls_per_question": tier_rows[0]["routed_calls"],
+            }
+            for tier in dict.fromkeys(r["tier"] for r in rows)
+            for tier_rows in [[r for r in rows if r["tier"] == tier]]
+        },
+    }
+    labelled = [r for r in rows if r["label"]]
+    if labelled:
+        summary["label_agreement"] = round(sum(r["label"] == r["tier"] for r in labelled) / len(labelled), 3)
+        # A hard question sent to a smaller council is the costly mistake
+        summary["under_routed"] = [r["id"] for r in labelled if r["label"] == "hard" and r["tier"] != "hard"]
+        summary["confusion"] = {
+            label: dict(Counter(r["tier"] for r in labelled if r["label"] == label))
+            for label in dict.fromkeys(r["label"] for r in labelled)
+        }
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Per-request setup cost: building LlmCouncil().crew() vs. a graph from the shared template
+
+"before" is what /ask did on every request (re-read the YAML configs, build
+4 Agents, 7 Tasks and a Crew); "after" is CouncilFactory's per-request work.
+No LLM calls are made.
+
+Usage:
+    python benchmarks/bench_setup.py [--requests 200]
+"""
+
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.crew import LlmCouncil
+from llm_council.engine import build_graph
+from llm_council.factory import CouncilFactory
+from llm_council.stubs import stub_llms
+
+
+def measure(build, requests):
+    """Mean seconds per call and bytes still allocated after `requests` calls"""
+    build()  # warm imports and caches
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(requests):
+        build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"per_request_us": round(elapsed / requests * 1e6, 1), "retained_kb": round(retained / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    llms = stub_llms()
+    factory = CouncilFactory(llms=llms)
+    results = {
+        "before": measure(lambda: LlmCouncil(llms=llms).crew(), args.requests),
+        "after": measure(lambda: build_graph(factory.template), args.requests),
+    }
+
+    print(f"{'':<8}{'us/request':>12}{'retained KB':>14}")
+    for name, r in results.items():
+        print(f"{name:<8}{r['per_request_us']:>12.1f}{r['retained_kb']:>14.1f}")
+    print(json.dumps({"requests": args.requests, **results}))
+
+
+if __name__ == "__main__":
+    main()
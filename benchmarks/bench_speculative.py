@@ -0,0 +1,104 @@
+"""
+Speculative chairman benchmark: full council vs. a chairman draft overlapping the critiques
+
+Uses stub LLMs with fixed per-call delays, so no API keys or network are needed.
+The chairman gets its own, slower stub (like o3-mini next to the delegates).
+"covered" delegates raise critique points the chairman's draft already covers,
+so the draft stands; "uncovered" ones raise points it misses, so every council
+pays for a revise pass on top of the draft.
+
+Usage:
+    python benchmarks/bench_speculative.py [--delay 0.2] [--chairman-delay 0.6] [--rounds 3]
+"""
+
+import argparse
+import json
+import os
+import time
+from statistics import median
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from llm_council.crew import LlmCouncil
+from llm_council.factory import CouncilFactory
+from llm_council.speculative import SpeculativePolicy
+from llm_council.stubs import StubLLM, answers_given
+
+CHAIRMAN = ("Rayleigh scattering by air molecules scatters short wavelengths of sunlight most, so the sky "
+            "looks blue. At sunset light crosses more atmosphere, the blue is scattered away and the sky looks red.")
+
+# Each delegate's (strength, weakness, missing) points: its draft states them, and its structured
+# critique raises them on every answer it reviews
+POINTS = {
+    "covered": {
+        "gpt4o": ("names Rayleigh scattering", "skips short wavelengths", "sunset red"),
+        "claude3": ("clear", "no word on air molecules", "why sunsets look red"),
+        "gemini2": ("short", "vague on scattering", "more atmosphere at sunset"),
+    },
+    "uncovered": {
+        "gpt4o": ("names Rayleigh scattering", "ignores ozone absorption", "violet light"),
+        "claude3": ("clear", "no word on cone sensitivity", "human eye response"),
+        "gemini2": ("short", "vague on Mie aerosols", "cloud whiteness"),
+    },
+}
+
+
+def responder(points):
+    strength, weakness, missing = points
+
+    def answer(messages):
+        prompt = messages[-1]["content"] if isinstance(messages, list) else messages
+        if "Review the OTHER models' answers" not in prompt:
+            return f"STRENGTH: {strength}.\nWEAKNESS: {weakness}.\nMISSING: {missing}."
+        return json.dumps({"reviews": [
+            {"answer": position, "score": 6, "strengths": [strength], "weaknesses": [weakness], "missing": [missing]}
+            for position in range(1, answers_given(messages) + 1)
+        ]})
+    return answer
+
+
+def bench(scenario, policy, args):
+    totals, calls, tokens = [], [], []
+    accepted = 0
+    for _ in range(args.rounds):
+        llms = {name: StubLLM(model=f"stub/{name}", delay=args.delay, response=responder(points))
+                for name, points in POINTS[scenario].items()}
+        llms["chair"] = StubLLM(model="stub/chairman", delay=args.chairman_delay, response=CHAIRMAN)
+        topology = LlmCouncil(llms=llms).topology.override(models={"chairman": "chair"})
+        factory = CouncilFactory(llms=llms, topology=topology, speculative=policy)
+        start = time.perf_counter()
+        result = factory.kickoff({"question": "Why is the sky blue?"})
+        totals.append(time.perf_counter() - start)
+        calls.append(len(result.usage))
+        tokens.append(sum(record.prompt_tokens + record.completion_tokens for record in result.usage))
+        accepted += bool(result.speculative and result.speculative["accepted"])
+    return {"total_s": round(median(totals), 3), "llm_calls": median(calls), "tokens": median(tokens),
+            "accepted": accepted}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.2, help="per-call delegate stub delay (s)")
+    parser.add_argument("--chairman-delay", type=float, default=0.6, help="per-call chairman stub delay (s)")
+    parser.add_argument("--accept", type=float, default=0.5, help="speculative accept threshold")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    policies = {"full": None, "speculative": SpeculativePolicy(accept_threshold=args.accept)}
+    results = {
+        scenario: {name: bench(scenario, policy, args) for name, policy in policies.items()}
+        for scenario in POINTS
+    }
+
+    print(f"{'scenario':<11}{'mode':<13}{'total_s':>10}{'calls':>8}{'tokens':>8}{'accepted':>10}")
+    for scenario, modes in results.items():
+        for name, r in modes.items():
+            print(f"{scenario:<11}{name:<13}{r['total_s']:>10.3f}{r['llm_calls']:>8}{r['tokens']:>8}"
+                  f"{r['accepted']:>10}")
+    config = {"delay_s": args.delay, "chairman_delay_s": args.chairman_delay, "accept": args.accept}
+    print(json.dumps({"config": config, **results}))
+
+
+if __name__ == "__main__":
+    main()
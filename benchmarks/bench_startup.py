@@ -0,0 +1,151 @@
+"""
+Cold start of the CLI and the server: import time, `run`, `serve` until /health and the first /ask
+
+Every measurement is a fresh Python process, so nothing is warm but the OS
+file cache. The council answers from an empty recording with synthetic
+replies (LLM_COUNCIL_REPLAY, fixed latency per call), so no API keys or
+network are needed and the timings are the app's own start-up cost plus
+a known model latency.
+
+The import profile (python -X importtime) lists the packages that cost most
+when importing main.py, and when building the first council.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 3] [--latency 0.05] [--top 10]
+        [--port 8765] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+QUESTION = "Why is the sky blue?"
+
+
+def environment(latency, port):
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": SRC + os.pathsep + env.get("PYTHONPATH", ""),
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+        # An empty recording: every model call gets a synthetic reply after `latency` seconds
+        "LLM_COUNCIL_REPLAY": os.path.join(tempfile.gettempdir(), "llm_council_startup_bench.jsonl"),
+        "LLM_COUNCIL_REPLAY_MISSING": "synthetic",
+        "LLM_COUNCIL_REPLAY_LATENCY": str(latency),
+        "LLM_COUNCIL_TRACE": "off",
+        "LLM_COUNCIL_PORT": str(port),
+    })
+    return env
+
+
+def timed(command, env, stdin=None):
+    start = time.perf_counter()
+    subprocess.run(command, env=env, input=stdin, text=True, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def request(url, body=None, timeout=60.0):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.status
+
+
+def serve_timings(env, port, timeout=120.0):
+    """(seconds until /health answers, seconds until the first /ask is answered), from process start"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "llm_council.main", "serve"], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with {process.returncode}")
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError("server did not answer /health in time")
+            try:
+                request(base + "/health", timeout=1.0)
+                break
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.02)
+        health = time.perf_counter() - start
+        request(base + "/ask", {"question": QUESTION}, timeout=timeout)
+        first_ask = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+    return health, first_ask
+
+
+def import_profile(env, code, top):
+    """The `top` packages by import time (ms, their modules' own time summed) for `code`"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, text=True,
+                            capture_output=True, check=True)
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)", line)
+        if match:
+            name = match.group(2).split(".")[0]
+            packages[name] = packages.get(name, 0) + int(match.group(1)) / 1000
+    return sorted(({"package": name, "ms": round(ms, 1)} for name, ms in packages.items()),
+                  key=lambda row: -row["ms"])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (the median is reported)")
+    parser.add_argument("--latency", type=float, default=0.05, help="synthetic model latency per call (s)")
+    parser.add_argument("--top", type=int, default=10, help="packages shown in the import profile")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    env = environment(args.latency, args.port)
+    python = [sys.executable]
+    measurements = {
+        "import main": lambda: timed(python + ["-c", "import llm_council.main"], env),
+        "import api": lambda: timed(python + ["-c", "import llm_council.api"], env),
+        "build council": lambda: timed(python + ["-c", "import llm_council.service as s; s.get_council_factory()"], env),
+        "run (one question)": lambda: timed(python + ["-m", "llm_council.main"], env, stdin=QUESTION + "\n"),
+    }
+    samples = {name: [measure() for _ in range(args.repeat)] for name, measure in measurements.items()}
+    serves = [serve_timings(env, args.port) for _ in range(args.repeat)]
+    samples["serve: /health"] = [health for health, _ in serves]
+    samples["serve: first /ask"] = [first_ask for _, first_ask in serves]
+
+    print(f"{'measurement':<22}{'median_s':>10}{'min_s':>9}{'max_s':>9}")
+    results = {}
+    for name, values in samples.items():
+        results[name] = {"median_s": round(statistics.median(values), 3),
+                         "min_s": round(min(values), 3), "max_s": round(max(values), 3)}
+        print(f"{name:<22}{results[name]['median_s']:>10.3f}{results[name]['min_s']:>9.3f}{results[name]['max_s']:>9.3f}")
+
+    profiles = {
+        "import main": import_profile(env, "import llm_council.main", args.top),
+        "build council": import_profile(env, "import llm_council.service as s; s.get_council_factory()", args.top),
+    }
+    for name, rows in profiles.items():
+        print(f"\nimport profile: {name}")
+        for row in rows:
+            print(f"  {row['package']:<24}{row['ms']:>10.1f} ms")
+
+    report = {"settings": {"repeat": args.repeat, "latency_s": args.latency}, "timings": results,
+              "import_profile": profiles}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Admission queue for the LLM Council API
+
+Rejecting requests the moment every council slot is busy throws bursts away
+even when a slot frees up seconds later. AdmissionQueue instead lets up to
+`max_queue` requests wait (at most `max_wait` seconds each) and hands freed
+slots to waiting clients round-robin, so one client's burst cannot starve
+everyone else. A slot is only counted as active once it has been granted.
+
+Each admission reports the queue position and ETA it saw on entry; queue
+depth and wait times are kept as histograms for /status.
+
+With a SharedState (shared.py) the cap is cluster-wide: a locally admitted
+request also takes a lease on one of `max_concurrent` shared slots, waiting
+for one (within the same max_wait) when other workers hold them all.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Sequence, Tuple
+
+try:
+    from .shared import SharedState
+    from .tracing import get_tracer
+except ImportError:
+    from shared import SharedState
+    from tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+DEPTH_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """Cumulative bucket counts in the Prometheus style, plus bucket-resolution quantiles"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty or in +Inf)"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {
+            "buckets": cumulative,
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class AdmissionRejected(Exception):
+    """The request was not admitted; `retry_after` is a hint in seconds"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueFull(AdmissionRejected):
+    pass
+
+
+class QueueTimeout(AdmissionRejected):
+    pass
+
+
+@dataclass
+class Ticket:
+    """What a request saw when it was admitted"""
+    position: int          # requests ahead of it on entry (0: admitted straight away)
+    eta: Optional[float]   # estimated wait on entry, seconds (None until a council has finished)
+    waited: float = 0.0    # actual wait, seconds
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"X-Queue-Position": str(self.position), "X-Queue-Wait": f"{self.waited:.3f}"}
+        if self.eta is not None:
+            headers["X-Queue-ETA"] = f"{self.eta:.1f}"
+        return headers
+
+
+class AdmissionQueue:
+    """`max_concurrent` slots, a bounded per-client-fair wait queue and a maximum wait"""
+
+    def __init__(self, max_concurrent: int = 5, max_queue: int = 50, max_wait: float = 30.0,
+                 shared: Optional[SharedState] = None, shared_name: str = "councils", lease_ttl: float = 60.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.shared = shared
+        self.shared_name = shared_name
+        self.lease_ttl = lease_ttl
+        self.shared_errors = 0
+        self.active = 0
+        self.waiting = 0
+        # client -> its waiters; clients are served round-robin in this order
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._service_time: Optional[float] = None  # moving average of how long a slot is held
+        self.depth = Histogram(DEPTH_BUCKETS)
+        self.wait_time = Histogram(WAIT_BUCKETS)
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def full(self) -> bool:
+        return self.active >= self.max_concurrent and self.waiting >= self.max_queue
+
+    def estimate(self, client: str) -> Tuple[int, Optional[float]]:
+        """(position, eta seconds) a request from `client` would get right now"""
+        if self.active < self.max_concurrent and not self.waiting:
+            return 0, 0.0
+        own = len(self._queues.get(client, ()))
+        # Round-robin: every other client gets at most one turn per turn of ours
+        ahead = own + sum(min(len(q), own + 1) for other, q in self._queues.items() if other != client)
+        if self._service_time is None:
+            return ahead, None
+        return ahead, round((ahead // self.max_concurrent + 1) * self._service_time, 1)
+
+    @asynccontextmanager
+    async def admit(self, client: str) -> AsyncIterator[Ticket]:
+        """Hold a slot for the duration of the block
+
+        Raises QueueFull when the queue is at max_queue and QueueTimeout after max_wait.
+        """
+        position, eta = self.estimate(client)
+        self.depth.observe(self.waiting)
+        start = time.monotonic()
+        if self.active < self.max_concurrent and not self.waiting:
+            self.active += 1
+        else:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise QueueFull("Server is at capacity and the queue is full", retry_after=eta)
+            await self._wait(client, eta)
+
+        lease = None
+        if self.shared is not None:
+            try:
+                lease = await self._acquire_lease(start, eta)
+            except BaseException:
+                self._release()
+                raise
+
+        ticket = Ticket(position=position, eta=eta, waited=time.monotonic() - start)
+        now = time.perf_counter()
+        get_tracer().add_span("admission.wait", now - ticket.waited, now, position=position)
+        self.wait_time.observe(ticket.waited)
+        self.admitted += 1
+        held_since = time.monotonic()
+        keepalive = asyncio.create_task(self._keep_lease(lease)) if lease else None
+        try:
+            yield ticket
+        finally:
+            held = time.monotonic() - held_since
+            self._service_time = held if self._service_time is None else 0.8 * self._service_time + 0.2 * held
+            if keepalive is not None:
+                keepalive.cancel()
+                await self._shared_call(self.shared.release(self.shared_name, lease))
+            self._release()
+
+    # ============================================
+    # Cluster-wide slots (shared state)
+    # ============================================
+    async def _shared_call(self, call, default=None):
+        """Shared-state errors fail open: the local cap still applies"""
+        try:
+            return await call
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning("Shared admission state unavailable: %s", e)
+            return default
+
+    async def _acquire_lease(self, start: float, eta: Optional[float]) -> Optional[str]:
+        """Take one of the cluster's max_concurrent leases, polling until max_wait runs out"""
+        lease = uuid.uuid4().hex
+        delay = 0.05
+        while True:
+            acquired = await self._shared_call(
+                self.shared.try_acquire(self.shared_name, lease, self.max_concurrent, self.lease_ttl), default=None)
+            if acquired is None:
+                return None
+            if acquired:
+                return lease
+            if time.monotonic() - start + delay > self.max_wait:
+                self.timed_out += 1
+                raise QueueTimeout(f"Waited {self.max_wait:g}s without a free slot in the cluster",
+                                   retry_after=eta)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    async def _keep_lease(self, lease: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            await self._shared_call(self.shared.renew(self.shared_name, lease, self.lease_ttl))
+
+    async def cluster_active(self) -> Optional[int]:
+        """Councils running across all workers (None without shared state)"""
+        if self.shared is None:
+            return None
+        holders = await self._shared_call(self.shared.holders(self.shared_name))
+        return None if holders is None else len(holders)
+
+    async def _wait(self, client: str, eta: Optional[float]) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(client, deque()).append(future)
+        self.waiting += 1
+        try:
+            await asyncio.wait([future], timeout=self.max_wait)
+        except asyncio.CancelledError:
+            if future.done():
+                self._release()  # granted just as the client went away
+            else:
+                self._remove(client, future)
+            raise
+        if not future.done():
+            self._remove(client, future)
+            self.timed_out += 1
+            raise QueueTimeout(f"Waited {self.max_wait:g}s without a free slot", retry_after=eta)
+
+    def _remove(self, client: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(client)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            self.waiting -= 1
+            if not queue:
+                del self._queues[client]
+
+    def _release(self) -> None:
+        """Hand the slot to the next client in round-robin order, or free it"""
+        while self._queues:
+            client, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            self.waiting -= 1
+            if queue:
+                self._queues.move_to_end(client)
+            else:
+                del self._queues[client]
+            if not future.done():
+                future.set_result(None)  # the slot passes on; active is unchanged
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "waiting": self.waiting,
+            "waiting_clients": len(self._queues),
+            "max_queue": self.max_queue,
+            "max_wait_s": self.max_wait,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "shared_errors": self.shared_errors if self.shared is not None else None,
+            "avg_service_s": round(self._service_time, 3) if self._service_time is not None else None,
+            "queue_depth": self.depth.snapshot(),
+            "wait_seconds": self.wait_time.snapshot(),
+        }
@@ -0,0 +1,738 @@
+"""
+Rate limiting implementation for LLM Council API
+Install: pip install slowapi redis
+
+The FastAPI app: per-IP rate limits, the admission queue, tracing and the
+/ask endpoints. Council configuration and the question flow live in
+service.py; the council itself is built in the background at startup, so
+the server answers /health while crewAI is still loading.
+"""
+
+import asyncio
+import json
+import math
+import os
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.util import get_remote_address
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
+
+try:
+    from .admission import AdmissionQueue, AdmissionRejected, QueueFull
+    from .batch import BatchItem, parse_item, run_batch
+    from .jobs import DONE, FAILED, Job
+    from .cache import CachedAnswer
+    from .pool import get_client_pool
+    from .scheduler import ProviderSaturated
+    from .service import (BATCH_CONCURRENCY, BATCH_MAX_QUESTIONS, REDIS_URL, STATE_KIND, WORKER_ID, WORKER_TTL,
+                          answer_question, cached_answer, close_connections, council_ready, get_council_factory,
+                          get_response_cache, get_job_runner, get_router, route_question, run_council, shared_state,
+                          warm_connections, warm_council)
+    from .topology import Topology, load_topology
+    from .tracing import TraceMiddleware, get_tracer, set_tracer, trace_summary, tracer_from_env
+except ImportError:
+    from admission import AdmissionQueue, AdmissionRejected, QueueFull
+    from batch import BatchItem, parse_item, run_batch
+    from jobs import DONE, FAILED, Job
+    from cache import CachedAnswer
+    from pool import get_client_pool
+    from scheduler import ProviderSaturated
+    from service import (BATCH_CONCURRENCY, BATCH_MAX_QUESTIONS, REDIS_URL, STATE_KIND, WORKER_ID, WORKER_TTL,
+                         answer_question, cached_answer, close_connections, council_ready, get_council_factory,
+                         get_response_cache, get_job_runner, get_router, route_question, run_council, shared_state,
+                         warm_connections, warm_council)
+    from topology import Topology, load_topology
+    from tracing import TraceMiddleware, get_tracer, set_tracer, trace_summary, tracer_from_env
+
+# ============================================
+# Rate Limiting Setup
+# ============================================
+# In-memory rate limiting (single instance), or Redis-based with LLM_COUNCIL_STATE=redis
+# so every worker and host counts against the same per-IP limits
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=REDIS_URL if STATE_KIND == "redis" else "memory://"
+)
+
+# ============================================
+# Concurrent Request Limiter (admission queue)
+# ============================================
+# Max 5 questions being processed at once by default. Councils await their
+# model calls instead of holding a thread each, so one worker can keep far
+# more in flight: raise LLM_COUNCIL_MAX_CONCURRENT to suit.
+# When every slot is busy, requests wait in a bounded queue (LLM_COUNCIL_QUEUE_SIZE)
+# for at most LLM_COUNCIL_QUEUE_MAX_WAIT seconds; freed slots go to waiting
+# clients round-robin (see admission.py).
+MAX_CONCURRENT = int(os.getenv("LLM_COUNCIL_MAX_CONCURRENT", "5"))
+QUEUE_SIZE = int(os.getenv("LLM_COUNCIL_QUEUE_SIZE", "50"))
+QUEUE_MAX_WAIT = float(os.getenv("LLM_COUNCIL_QUEUE_MAX_WAIT", "30"))
+# With shared state LLM_COUNCIL_MAX_CONCURRENT is the cap for the whole cluster
+admission_queue = AdmissionQueue(max_concurrent=MAX_CONCURRENT, max_queue=QUEUE_SIZE, max_wait=QUEUE_MAX_WAIT,
+                                 shared=shared_state)
+
+def capacity_error(e: AdmissionRejected) -> HTTPException:
+    headers = {"Retry-After": str(max(1, math.ceil(e.retry_after)))} if e.retry_after else None
+    return HTTPException(status_code=429, detail=f"{e}. Please try again in a moment.", headers=headers)
+
+def check_capacity(client: str) -> Dict[str, str]:
+    """Refuse up front only when the wait queue (or a provider's call queue) is full
+
+    Returns the queue position/ETA headers the client would get right now.
+    """
+    position, eta = admission_queue.estimate(client)
+    # No model call can be in flight before the council exists
+    call_limiter = get_council_factory().engine.limiter if council_ready() else None
+    if admission_queue.full() or (call_limiter is not None and call_limiter.saturated()):
+        raise capacity_error(QueueFull("Server is at capacity", retry_after=eta))
+    headers = {"X-Queue-Position": str(position)}
+    if eta is not None:
+        headers["X-Queue-ETA"] = f"{eta:.1f}"
+    return headers
+
+
+# ============================================
+# FastAPI Setup
+# ============================================
+# Tracing (see tracing.py): a span tree per request with a critical-path breakdown
+# LLM_COUNCIL_TRACE: comma-separated exporters, "memory" (default, served by /traces),
+# "console" (stderr) and "otel" (OpenTelemetry SDK); "off" disables tracing
+# LLM_COUNCIL_TRACE_KEEP: traces kept in memory (default 100)
+set_tracer(tracer_from_env())
+
+app = FastAPI(
+    title="LLM Council API",
+    description="Multi-model AI council API with rate limiting",
+    version="1.0.0"
+)
+
+# Add rate limiting
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(TraceMiddleware)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+_warmup: Optional[asyncio.Task] = None
+_prewarm: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def build_council():
+    """Start building the council crew (and answer cache) in the background
+
+    Loading crewAI and the LLM clients takes seconds; the server answers /health
+    meanwhile, and requests that need the council wait for it (warm_council).
+    The providers' connections are opened next (warm_connections).
+    """
+    global _warmup, _prewarm
+    _warmup = asyncio.create_task(warm_council())
+    _prewarm = asyncio.create_task(warm_connections())
+
+async def worker_heartbeat():
+    while True:
+        try:
+            await shared_state.try_acquire("workers", WORKER_ID, None, WORKER_TTL)
+        except Exception as e:
+            print(f"⚠️ Shared state unavailable: {e}", file=sys.stderr)
+        await asyncio.sleep(WORKER_TTL / 3)
+
+_heartbeat: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def register_worker():
+    """Announce this worker in the shared state (shown on /status)"""
+    global _heartbeat
+    if shared_state is not None:
+        _heartbeat = asyncio.create_task(worker_heartbeat())
+
+# Job runs take admission slots like /ask requests, all as one client, so jobs and
+# interactive requests take turns. A job is not dropped when the queue is full or its
+# wait runs out: it stays queued and asks again.
+JOBS_CLIENT = "jobs"
+
+@asynccontextmanager
+async def admit_job(job: Job) -> AsyncIterator[None]:
+    async with AsyncExitStack() as stack:
+        while True:
+            try:
+                await stack.enter_async_context(admission_queue.admit(JOBS_CLIENT))
+                break
+            except AdmissionRejected as e:
+                await asyncio.sleep(e.retry_after or 1.0)
+        yield
+
+@app.on_event("startup")
+async def start_jobs():
+    """Start the job workers; jobs a previous run left unfinished resume from their saved tasks"""
+    get_job_runner().start(admit=admit_job)
+
+@app.on_event("shutdown")
+async def stop_jobs():
+    await get_job_runner().stop()
+    await close_connections()
+
+@app.on_event("shutdown")
+async def unregister_worker():
+    if _heartbeat is not None:
+        _heartbeat.cancel()
+        try:
+            await shared_state.release("workers", WORKER_ID)
+        except Exception:
+            pass
+
+# Request/Response Models
+class CouncilOverride(BaseModel):
+    """Per-request council shape (see topology.py); omitted fields keep the configured council"""
+    delegates: Optional[List[str]] = None  # agents.yaml keys, e.g. ["gpt_delegate", "gemini_delegate"]
+    phases: Optional[List[str]] = None  # e.g. ["gather", "synthesis"] to skip the critiques
+    models: Optional[Dict[str, str]] = None  # agent -> a registry model (GET /council: available_models)
+
+class QuestionRequest(BaseModel):
+    question: str
+    council: Optional[CouncilOverride] = None
+
+class SimpleResponse(BaseModel):
+    question: str
+    answer: str
+    timestamp: str
+    execution_time: float
+    rate_limit_info: Optional[dict] = None
+    cache_hit: Optional[str] = None  # "exact" or "semantic" when served from the answer cache
+    fast_path: Optional[dict] = None  # consensus early-exit report (agreement, calls saved, ...)
+    quorum: Optional[dict] = None  # per phase: which tasks answered, timed out, failed or were cancelled
+    context_tokens: Optional[dict] = None  # per phase: estimated input tokens "before"/"after" context compaction
+    routing: Optional[dict] = None  # difficulty tier, score and calls saved (LLM_COUNCIL_ROUTER)
+    degraded: Optional[dict] = None  # tasks that failed or were skipped, retries and fallback models used
+    speculative: Optional[dict] = None  # speculative chairman: draft kept or revised, latency cut, extra tokens
+
+class BatchQuestion(BaseModel):
+    id: Optional[str] = None
+    question: str
+
+class BatchRequest(BaseModel):
+    questions: List[Union[str, BatchQuestion]]
+    detailed: bool = False  # include every draft and critique in each result row
+    council: Optional[CouncilOverride] = None  # council shape for every question of the batch
+
+class TaskOutput(BaseModel):
+    agent: str
+    task_name: str
+    output: str
+
+class DetailedResponse(BaseModel):
+    question: str
+    timestamp: str
+    individual_outputs: List[TaskOutput]
+    final_answer: str
+    execution_time: float
+    rate_limit_info: Optional[dict] = None
+    cache_hit: Optional[str] = None
+    fast_path: Optional[dict] = None
+    quorum: Optional[dict] = None
+    context_tokens: Optional[dict] = None
+    usage: Optional[dict] = None  # every model call (tokens, latency, cost) plus totals per phase and model
+    routing: Optional[dict] = None
+    degraded: Optional[dict] = None
+    speculative: Optional[dict] = None
+    critiques: Optional[dict] = None  # structured critiques: drafts ranked by mean score, each review, invalid replies, dropped reviews
+
+# Display names for the council tasks, keyed by task name (tasks.yaml)
+TASK_NAMES = {
+    "gpt_gather": "GPT Initial Answer",
+    "claude_gather": "Claude Initial Answer",
+    "gemini_gather": "Gemini Initial Answer",
+    "gpt_critique": "GPT Critique",
+    "claude_critique": "Claude Critique",
+    "gemini_critique": "Gemini Critique",
+    "final_answer": "Chairman Synthesis",
+    "consensus_answer": "Chairman Synthesis (consensus)",
+    "speculative_answer": "Chairman Draft (speculative)",
+    "revise_answer": "Chairman Synthesis (revised)"
+}
+
+def task_display_name(name: str, index: int) -> str:
+    # Tasks of delegates added in agents.yaml are named <delegate>_<phase>
+    return TASK_NAMES.get(name) or (name.replace("_", " ").title() if name else f"Task {index+1}")
+
+def resolve_topology(override: Optional[CouncilOverride]) -> Optional[Topology]:
+    """The request's council shape (None: the configured council); invalid overrides are a 400"""
+    if override is None:
+        return None
+    try:
+        return get_council_factory().topology.override(**override.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid council: {e}")
+
+async def route_request(question_req: QuestionRequest) -> Tuple[Optional[Topology], Optional[dict]]:
+    """The request's council shape and routing report (once the council is built)"""
+    await warm_council()
+    return route_question(question_req.question, resolve_topology(question_req.council))
+
+# ============================================
+# FastAPI Endpoints
+# ============================================
+@app.get("/")
+def root():
+    return {
+        "message": "LLM Council API",
+        "version": "1.0.0",
+        "rate_limits": {
+            "per_user": "10 requests per hour",
+            "concurrent": f"{MAX_CONCURRENT} max concurrent requests, up to {QUEUE_SIZE} more queued",
+            "cost_per_question": f"{load_topology().describe()['calls_per_question']} LLM API calls"
+        },
+        "endpoints": {
+            "POST /ask": "Get final answer only (rate limited)",
+            "POST /ask/detailed": "Get all outputs (rate limited)",
+            "POST /ask/stream": "Stream drafts, critiques and chairman tokens as Server-Sent Events (rate limited)",
+            "POST /ask/batch": "Answer many questions, results streamed back as JSON lines (rate limited)",
+            "GET /health": "Health check",
+            "GET /council": "The configured council: delegates, models, phases (override per request with \"council\")",
+            "GET /status": "Rate limit and cache status",
+            "GET /metrics": "Token, cost and latency metrics (Prometheus text format)",
+            "GET /traces": "Recent request traces with their critical-path breakdown",
+            "POST /jobs": "Submit a question as a background job (rate limited); poll or stream it by id",
+            "GET /jobs/{id}": "A job's status, finished task outputs and, once done, its answer",
+            "GET /jobs/{id}/stream": "A job's task outputs and answer as Server-Sent Events",
+            "GET /docs": "API documentation"
+        }
+    }
+
+@app.get("/health")
+def health_check():
+    return {"status": "healthy"}
+
+@app.get("/council")
+def council_topology():
+    """Delegates, models and phases of the configured council, and what a request may override"""
+    return get_council_factory().topology.describe()
+
+@app.get("/status")
+async def status_check(request: Request):
+    """Check current rate limit and cache status"""
+    factory = await warm_council()
+    cache = get_response_cache()
+    engine = factory.engine
+    phase_cache = engine.phase_cache
+    cluster = {"enabled": False}
+    if shared_state is not None:
+        try:
+            workers = await shared_state.holders("workers")
+        except Exception:
+            workers = None
+        cluster = {
+            "backend": type(shared_state).__name__,
+            "active_concurrent_requests": await admission_queue.cluster_active(),
+            "workers": workers,
+        }
+    return {
+        "active_concurrent_requests": admission_queue.active,
+        "max_concurrent_requests": admission_queue.max_concurrent,
+        "queued_requests": admission_queue.waiting,
+        "worker": WORKER_ID,
+        "cluster": cluster,
+        "your_ip": get_remote_address(request),
+        "rate_limit": "10 requests per hour per IP",
+        "admission": admission_queue.stats(),
+        "cache": cache.stats() if cache is not None else {"enabled": False},
+        "phase_cache": phase_cache.stats() if phase_cache is not None else {"enabled": False},
+        "consensus": engine.consensus_stats() or {"enabled": False},
+        "speculative": engine.speculative_stats() or {"enabled": False},
+        "critiques": engine.critique_stats(),
+        "quorum": engine.quorum_stats() or {"enabled": False},
+        "resilience": engine.resilience_stats(),
+        "context": engine.context_stats(),
+        "usage": engine.usage.stats(),
+        "routing": get_router().stats() if get_router() is not None else {"enabled": False},
+        "outbound_calls": engine.limiter.stats() if engine.limiter is not None else {"enabled": False},
+        "recording": factory.recorder.stats() if factory.recorder is not None else {"enabled": False},
+        "jobs": get_job_runner().stats(),
+        "http_pool": get_client_pool().stats() if get_client_pool() is not None else {"enabled": False}
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Model calls, tokens, cost and call latency per model, phase, task and agent"""
+    return get_council_factory().engine.usage.prometheus()
+
+@app.get("/traces")
+def recent_traces(limit: int = 20):
+    """Most recent traces (newest first), each with its critical-path latency breakdown"""
+    memory = get_tracer().memory()
+    if memory is None:
+        raise HTTPException(status_code=404, detail="In-memory tracing is off (LLM_COUNCIL_TRACE)")
+    return {"traces": memory.recent(limit)}
+
+@app.get("/traces/{trace_id}")
+def trace_detail(trace_id: str):
+    """Every span of one trace (ids as in the X-Trace-Id response header)"""
+    memory = get_tracer().memory()
+    spans = memory.get(trace_id) if memory is not None else None
+    if spans is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired trace id")
+    return dict(trace_summary(spans), spans=[span.to_dict() for span in sorted(spans, key=lambda s: s.start)])
+
+@app.post("/ask", response_model=SimpleResponse)
+@limiter.limit("10/hour")  # 10 requests per hour per IP
+async def ask_council(request: Request, question_req: QuestionRequest, response: Response):
+    """
+    Submit a question and get the final synthesized answer
+    
+    Rate Limits:
+    - 10 requests per hour per IP address
+    - Max LLM_COUNCIL_MAX_CONCURRENT (default 5) concurrent requests across all users
+      (answers served from the cache do not take a slot); when all are busy the
+      request waits its turn, see the X-Queue-Position / X-Queue-Wait headers
+    """
+    
+    if not question_req.question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+    start_time = datetime.now()
+    topology, routing = await route_request(question_req)
+    answer, cache_hit = await cached_answer(question_req.question, topology)
+    
+    if answer is None:
+        # Check concurrent request limit (only a full queue is refused right away)
+        client = get_remote_address(request)
+        response.headers.update(check_capacity(client))
+        
+        try:
+            async with admission_queue.admit(client) as ticket:
+                response.headers.update(ticket.headers())
+                # Execute the council (model calls are awaited, no worker thread is held)
+                answer = await run_council(question_req.question, topology=topology)
+        except AdmissionRejected as e:
+            raise capacity_error(e)
+        except ProviderSaturated as e:
+            raise HTTPException(status_code=503, detail=f"Model provider is saturated: {e}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    execution_time = (datetime.now() - start_time).total_seconds()
+    
+    return SimpleResponse(
+        question=question_req.question,
+        answer=answer.final_answer,
+        timestamp=start_time.isoformat(),
+        execution_time=execution_time,
+        rate_limit_info={
+            "limit": "10 per hour",
+            "ip": get_remote_address(request)
+        },
+        cache_hit=cache_hit,
+        fast_path=answer.fast_path,
+        quorum=answer.quorum,
+        context_tokens=answer.context_tokens,
+        routing=routing,
+        degraded=answer.degraded,
+        speculative=answer.speculative
+    )
+
+@app.post("/ask/detailed", response_model=DetailedResponse)
+@limiter.limit("5/hour")  # Stricter limit for detailed endpoint (more data)
+async def ask_council_detailed(request: Request, question_req: QuestionRequest, response: Response):
+    """
+    Submit a question and get all outputs (initial answers + critiques + final)
+    
+    With structured critiques (`output: critique` in tasks.yaml), "critiques" ranks
+    the drafts by their mean score, with the claims the critics made about each.
+    
+    Rate Limits:
+    - 5 requests per hour per IP address (stricter than /ask)
+    - Max LLM_COUNCIL_MAX_CONCURRENT (default 5) concurrent requests across all users
+      (answers served from the cache do not take a slot); when all are busy the
+      request waits its turn, see the X-Queue-Position / X-Queue-Wait headers
+    """
+    
+    if not question_req.question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+    start_time = datetime.now()
+    topology, routing = await route_request(question_req)
+    answer, cache_hit = await cached_answer(question_req.question, topology)
+    
+    if answer is None:
+        # Check concurrent request limit (only a full queue is refused right away)
+        client = get_remote_address(request)
+        response.headers.update(check_capacity(client))
+        
+        try:
+            async with admission_queue.admit(client) as ticket:
+                response.headers.update(ticket.headers())
+                # Execute the council (model calls are awaited, no worker thread is held)
+                answer = await run_council(question_req.question, topology=topology)
+        except AdmissionRejected as e:
+            raise capacity_error(e)
+        except ProviderSaturated as e:
+            raise HTTPException(status_code=503, detail=f"Model provider is saturated: {e}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    # Extract outputs
+    individual_outputs = []
+    for i, output in enumerate(answer.outputs):
+        individual_outputs.append(TaskOutput(
+            agent=output["agent"],
+            task_name=task_display_name(output["name"], i),
+            output=output["output"]
+        ))
+    
+    usage = None
+    if answer.usage is not None:
+        usage = dict(answer.usage, calls=[
+            dict(call, task_name=task_display_name(call["task"], i)) for i, call in enumerate(answer.usage["calls"])
+        ])
+    
+    execution_time = (datetime.now() - start_time).total_seconds()
+    
+    return DetailedResponse(
+        question=question_req.question,
+        timestamp=start_time.isoformat(),
+        individual_outputs=individual_outputs,
+        final_answer=answer.final_answer,
+        execution_time=execution_time,
+        rate_limit_info={
+            "limit": "5 per hour",
+            "ip": get_remote_address(request)
+        },
+        cache_hit=cache_hit,
+        fast_path=answer.fast_path,
+        quorum=answer.quorum,
+        context_tokens=answer.context_tokens,
+        usage=usage,
+        routing=routing,
+        degraded=answer.degraded,
+        speculative=answer.speculative,
+        critiques=answer.critiques
+    )
+
+# ============================================
+# Streaming
+# ============================================
+def sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def council_event_sse(event: Dict[str, Any]) -> str:
+    """Engine progress event -> SSE, using the same task names as /ask/detailed"""
+    if event["event"] == "token":
+        return sse("token", {"task_name": task_display_name(event["task"], event["index"]),
+                             "delta": event["delta"]})
+    return sse("task", {
+        "task_name": task_display_name(event["task"], event["index"]),
+        "agent": event["agent"],
+        "output": event["output"],
+        "cached": event["cached"],
+    })
+
+async def stream_council(question: str, answer: Optional[CachedAnswer], cache_hit: Optional[str],
+                         start_time: datetime, client: str, topology: Optional[Topology] = None,
+                         routing: Optional[dict] = None) -> AsyncIterator[str]:
+    if answer is None:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce() -> CachedAnswer:
+            try:
+                async with admission_queue.admit(client):
+                    return await run_council(question, listener=queue.put, topology=topology)
+            finally:
+                await queue.put(None)
+
+        # The council runs as its own task: if the client goes away the run
+        # still finishes and lands in the answer cache
+        council = asyncio.create_task(produce())
+        while (event := await queue.get()) is not None:
+            yield council_event_sse(event)
+        try:
+            answer = await council
+        except Exception as e:
+            yield sse("error", {"detail": str(e)})
+            return
+    else:
+        for i, output in enumerate(answer.outputs):
+            yield sse("task", {"task_name": task_display_name(output["name"], i), "agent": output["agent"],
+                               "output": output["output"], "cached": True})
+
+    yield sse("final", {
+        "question": question,
+        "final_answer": answer.final_answer,
+        "timestamp": start_time.isoformat(),
+        "execution_time": (datetime.now() - start_time).total_seconds(),
+        "cache_hit": cache_hit,
+        "fast_path": answer.fast_path,
+        "quorum": answer.quorum,
+        "context_tokens": answer.context_tokens,
+        "routing": routing,
+        "degraded": answer.degraded,
+        "speculative": answer.speculative,
+    })
+
+@app.post("/ask/stream")
+@limiter.limit("5/hour")  # Same budget as /ask/detailed (same data, delivered progressively)
+async def ask_council_stream(request: Request, question_req: QuestionRequest):
+    """
+    Submit a question and receive each output as soon as it exists (Server-Sent Events)
+    
+    Events:
+    - task: {"task_name", "agent", "output", "cached"} for every draft, critique and the synthesis
+    - token: {"task_name", "delta"} chunks of the chairman's answer while it is generated
+    - final: {"question", "final_answer", "timestamp", "execution_time", "cache_hit", "fast_path", "quorum",
+      "context_tokens", "routing", "degraded", "speculative"}
+    - error: {"detail"} if the council fails part way (or waited too long for a slot)
+    """
+    
+    if not question_req.question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+    start_time = datetime.now()
+    topology, routing = await route_request(question_req)
+    answer, cache_hit = await cached_answer(question_req.question, topology)
+    
+    # Check concurrent request limit before the stream starts, so clients still get a 429
+    # (and learn their queue position / ETA from the headers)
+    client = get_remote_address(request)
+    queue_headers = check_capacity(client) if answer is None else {}
+    
+    return StreamingResponse(
+        stream_council(question_req.question, answer, cache_hit, start_time, client, topology, routing),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **queue_headers}
+    )
+
+# ============================================
+# Batch
+# ============================================
+async def stream_batch(items: List[BatchItem], detailed: bool, client: str,
+                       topology: Optional[Topology] = None) -> AsyncIterator[str]:
+    async def answer(question: str):
+        # Each council of the batch takes its own slot, so a batch counts like that many /ask
+        # requests (a full queue or a timeout is that question's "error")
+        async with admission_queue.admit(client):
+            return await answer_question(question, topology=topology)
+
+    async for row in run_batch(items, answer, BATCH_CONCURRENCY, detailed):
+        yield json.dumps(row) + "\n"
+
+@app.post("/ask/batch")
+@limiter.limit("5/hour")
+async def ask_council_batch(request: Request, batch_req: BatchRequest):
+    """
+    Submit many questions at once; one JSON line per question is streamed back as it completes
+
+    Each line: {"id", "question", "final_answer", "cache_hit", "execution_time"}
+    (plus "outputs" with `detailed`, "routing" with LLM_COUNCIL_ROUTER, "degraded" when part of its council
+    failed, or "error" if that question failed).
+    Ids default to the question's position (1-based).
+
+    Rate Limits:
+    - 5 batches per hour per IP address, up to LLM_COUNCIL_BATCH_MAX_QUESTIONS (default 1000) questions each
+    - Runs LLM_COUNCIL_BATCH_CONCURRENCY (default 4) councils at a time, each taking a concurrent request slot
+    """
+
+    if not batch_req.questions:
+        raise HTTPException(status_code=400, detail="No questions in the batch")
+    if len(batch_req.questions) > BATCH_MAX_QUESTIONS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_QUESTIONS} questions per batch")
+    await warm_council()
+    topology = resolve_topology(batch_req.council)
+
+    items = []
+    for position, entry in enumerate(batch_req.questions, start=1):
+        record = entry if isinstance(entry, str) else entry.model_dump(exclude_none=True)
+        try:
+            items.append(parse_item(record, position))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Question {position} is empty")
+
+    # Check concurrent request limit
+    client = get_remote_address(request)
+    queue_headers = check_capacity(client)
+
+    return StreamingResponse(stream_batch(items, batch_req.detailed, client, topology),
+                             media_type="application/x-ndjson", headers=queue_headers)
+
+# ============================================
+# Jobs
+# ============================================
+@app.post("/jobs", status_code=202)
+@limiter.limit("10/hour")  # Same budget as /ask
+async def submit_job(request: Request, question_req: QuestionRequest):
+    """
+    Submit a question as a background job; returns at once with the job id
+
+    The council runs on the job workers (LLM_COUNCIL_JOB_WORKERS), each run taking
+    a concurrent request slot, whether or not the client stays connected. Every finished task is saved, so with
+    LLM_COUNCIL_JOBS_DB set the job resumes from its last finished task after a
+    restart. Poll GET /jobs/{id} or stream GET /jobs/{id}/stream.
+    """
+    if not question_req.question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+    await warm_council()
+    resolve_topology(question_req.council)  # an invalid council is a 400 now, not a failed job later
+    council = question_req.council.model_dump() if question_req.council is not None else None
+    job = get_job_runner().submit(question_req.question, council)
+    return {"job_id": job.id, "status": job.status, "poll": f"/jobs/{job.id}", "stream": f"/jobs/{job.id}/stream"}
+
+def job_outputs(job_id: str) -> List[Dict[str, Any]]:
+    return [{"task_name": task_display_name(event["task"], event["index"]), "agent": event["agent"],
+             "output": event["output"], "cached": event["cached"]}
+            for event in get_job_runner().store.outputs(job_id)]
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """Status of a job, the task outputs finished so far and, once done, its answer ("result")"""
+    job = get_job_runner().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return {**job.to_dict(), "outputs": job_outputs(job_id)}
+
+async def stream_job(job_id: str) -> AsyncIterator[str]:
+    runner = get_job_runner()
+    # Subscribe before reading the store, so nothing finishing in between is missed
+    queue = runner.subscribe(job_id)
+    try:
+        seen = set()
+        for event in runner.store.outputs(job_id):
+            seen.add(event["task"])
+            yield council_event_sse(event)
+        job = runner.store.get(job_id)
+        while job.status not in (DONE, FAILED):
+            event = await queue.get()
+            if event["event"] == "task":
+                if event["task"] in seen:
+                    continue
+                seen.add(event["task"])
+            if event["event"] in ("final", "error"):
+                job = runner.store.get(job_id)
+            else:
+                yield council_event_sse(event)
+        if job.status == DONE:
+            yield sse("final", job.to_dict())
+        else:
+            yield sse("error", {"detail": job.error})
+    finally:
+        runner.unsubscribe(job_id, queue)
+
+@app.get("/jobs/{job_id}/stream")
+async def job_stream(job_id: str):
+    """
+    A job's progress as Server-Sent Events: the tasks finished so far, then live
+    task/token events, then "final" (the job with its result) or "error" ({"detail"})
+    """
+    if get_job_runner().store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return StreamingResponse(stream_job(job_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
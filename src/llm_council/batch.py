@@ -0,0 +1,95 @@
+"""
+Batch runs of the LLM Council
+
+Questions are read from JSONL, one object per line:
+
+    {"id": "q1", "question": "Why is the sky blue?"}
+    {"request_id": "user-001", "title": "...", "body": "..."}   (requests.jsonl shape)
+
+Every council of the batch is started at once (up to `max_councils` in
+flight); their model calls are then interleaved across questions by the
+engine's CallLimiter, which serves later phases first so finished answers
+stream out steadily instead of all at the end. Results come back as JSON
+rows in completion order.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .cache import CachedAnswer
+except ImportError:
+    from cache import CachedAnswer
+
+# question -> (answer, "exact" | "semantic" | None)
+Answerer = Callable[[str], Awaitable[Tuple[CachedAnswer, Optional[str]]]]
+
+
+@dataclass
+class BatchItem:
+    id: str
+    question: str
+
+
+def parse_item(record: Any, line_no: int) -> BatchItem:
+    """One JSONL record (or a bare string) -> BatchItem; the id defaults to the line number"""
+    if isinstance(record, str):
+        record = {"question": record}
+    if not isinstance(record, dict):
+        raise ValueError(f"Line {line_no}: expected a JSON object or string")
+    question = record.get("question")
+    if question is None:
+        question = "\n\n".join(str(record[key]) for key in ("title", "body") if record.get(key))
+    if not str(question).strip():
+        raise ValueError(f"Line {line_no}: no 'question' (or 'title'/'body') field")
+    item_id = record.get("id", record.get("request_id", line_no))
+    return BatchItem(id=str(item_id), question=str(question))
+
+
+def read_jsonl(lines: Iterable[str]) -> List[BatchItem]:
+    return [
+        parse_item(json.loads(line), line_no)
+        for line_no, line in enumerate(lines, start=1)
+        if line.strip()
+    ]
+
+
+async def run_batch(items: List[BatchItem], answer: Answerer, max_councils: int = 50,
+                    detailed: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """Answer every item, yielding one result row per item as soon as it completes
+
+    A failing question yields a row with "error" instead of stopping the batch.
+    """
+    semaphore = asyncio.Semaphore(max_councils)
+
+    async def one(item: BatchItem) -> Dict[str, Any]:
+        async with semaphore:
+            start = time.perf_counter()
+            row: Dict[str, Any] = {"id": item.id, "question": item.question}
+            try:
+                result, cache_hit = await answer(item.question)
+            except Exception as e:
+                row["error"] = str(e)
+            else:
+                row.update(final_answer=result.final_answer, cache_hit=cache_hit)
+                if result.routing is not None:
+                    row["routing"] = result.routing
+                if result.degraded is not None:
+                    row["degraded"] = result.degraded
+                if detailed:
+                    row["outputs"] = result.outputs
+            row["execution_time"] = round(time.perf_counter() - start, 3)
+            return row
+
+    pending = [asyncio.create_task(one(item)) for item in items]
+    try:
+        for next_row in asyncio.as_completed(pending):
+            yield await next_row
+    finally:
+        # Consumer went away (client disconnect, Ctrl+C): stop the rest
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,349 @@
+"""
+Answer cache for the LLM Council API
+
+Every council costs 7 LLM calls, so repeated questions are served from a cache
+in front of the council:
+
+- exact tier: key is a hash of the normalized question (case, whitespace and
+  trailing punctuation ignored) plus a namespace that changes whenever the
+  council configuration changes
+- semantic tier (optional): an embedding of the question is compared against
+  recent questions; a cosine similarity >= threshold reuses that answer
+
+Entries expire after a TTL and the in-process backend evicts least recently
+used entries. RedisBackend shares the exact tier across workers; any object
+with async get/set/delete/__len__ can be plugged in instead.
+
+PhaseCache memoizes individual council tasks on the same backends, keyed by
+(agent role, model id, rendered prompt hash, upstream context hash): editing
+one phase's prompt only recomputes that phase and the phases after it.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+
+try:
+    from .usage import request_usage
+except ImportError:
+    from usage import request_usage
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], Awaitable[List[float]]]
+
+
+# ============================================
+# Cached value
+# ============================================
+@dataclass
+class CachedAnswer:
+    """What a council run produced, in a backend-friendly (JSON) shape"""
+    final_answer: str
+    outputs: List[Dict[str, str]] = field(default_factory=list)  # {"agent", "name", "output"}
+    created_at: float = field(default_factory=time.time)
+    fast_path: Optional[Dict[str, Any]] = None
+    quorum: Optional[Dict[str, Any]] = None
+    context_tokens: Optional[Dict[str, Dict[str, int]]] = None
+    usage: Optional[Dict[str, Any]] = None  # usage.request_usage() of the run that produced it
+    routing: Optional[Dict[str, Any]] = None  # routing.RoutingDecision of the request it was returned for
+    degraded: Optional[Dict[str, Any]] = None  # failed/skipped tasks, retries and fallbacks (resilience.py)
+    speculative: Optional[Dict[str, Any]] = None  # speculative chairman report (speculative.py)
+    critiques: Optional[Dict[str, Any]] = None  # structured critiques: draft ranking (critique.py)
+
+    @classmethod
+    def from_result(cls, result: Any) -> "CachedAnswer":
+        """Snapshot a CouncilResult (engine) or crewAI-task-backed result"""
+        return cls(
+            final_answer=str(result),
+            outputs=[
+                {"agent": task.agent.role, "name": task.name or "", "output": task.output.raw}
+                for task in result.tasks
+            ],
+            fast_path=getattr(result, "fast_path", None),
+            quorum=getattr(result, "quorum", None),
+            context_tokens=getattr(result, "context_tokens", None),
+            usage=request_usage(result.usage) if getattr(result, "usage", None) else None,
+            degraded=getattr(result, "degraded", None),
+            speculative=getattr(result, "speculative", None),
+            critiques=getattr(result, "critiques", None),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "CachedAnswer":
+        return cls(**json.loads(data))
+
+
+# ============================================
+# Backends
+# ============================================
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[str]: ...
+    async def set(self, key: str, value: str, ttl: float) -> None: ...
+    async def delete(self, key: str) -> None: ...
+    def __len__(self) -> int: ...
+
+
+class InMemoryBackend:
+    """Process-local LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Redis-backed entries (TTL via SETEX, eviction via Redis' maxmemory-policy)
+
+    Install: pip install redis
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379", prefix: str = "llm_council:answer:", client: Any = None):
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self._known = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+        self._known += 1
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    def __len__(self) -> int:
+        # Entries written by this process; Redis owns the real count
+        return self._known
+
+
+# ============================================
+# Embeddings (semantic tier)
+# ============================================
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def hashing_embedder(dimensions: int = 256) -> Embedder:
+    """Local bag-of-words embedder: no model call, catches rewordings and reorderings"""
+    async def embed(text: str) -> List[float]:
+        vector = [0.0] * dimensions
+        for word in _WORD.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            vector[int.from_bytes(digest, "big") % dimensions] += 1.0
+        return vector
+    return embed
+
+
+def litellm_embedder(model: str) -> Embedder:
+    """Embeddings from a provider model via litellm (e.g. "text-embedding-3-small")"""
+    async def embed(text: str) -> List[float]:
+        import litellm
+        response = await litellm.aembedding(model=model, input=[text])
+        return list(response.data[0]["embedding"])
+    return embed
+
+
+def cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+# ============================================
+# Response cache
+# ============================================
+def normalize_question(question: str) -> str:
+    return re.sub(r"\s+", " ", question).strip().rstrip("?!. ").lower()
+
+
+class ResponseCache:
+    """Exact-match + optional semantic cache of council answers, with hit/miss counters"""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 3600,
+        namespace: str = "",
+        embedder: Optional[Embedder] = None,
+        similarity_threshold: float = 0.92,
+        max_semantic_entries: int = 1024,
+    ):
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self.ttl = ttl
+        self.namespace = namespace
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        # exact key -> (variant, question embedding) for recent questions; values live in the backend
+        self._vectors: "OrderedDict[str, Tuple[str, List[float]]]" = OrderedDict()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def key(self, question: str, variant: str = "") -> str:
+        scope = f"{self.namespace}\n{variant}" if variant else self.namespace
+        return hashlib.sha256(f"{scope}\n{normalize_question(question)}".encode()).hexdigest()
+
+    async def get(self, question: str, variant: str = "") -> Tuple[Optional[CachedAnswer], Optional[str]]:
+        """Return (answer, "exact" | "semantic") on a hit, (None, None) on a miss
+
+        `variant` keeps answers of different council shapes apart (see topology.py).
+        A failing backend or embedder counts as a miss: the council still answers.
+        """
+        try:
+            return await self._get(question, variant)
+        except Exception as e:
+            self.errors += 1
+            self.misses += 1
+            logger.warning("Answer cache lookup failed: %s", e)
+            return None, None
+
+    async def _get(self, question: str, variant: str) -> Tuple[Optional[CachedAnswer], Optional[str]]:
+        key = self.key(question, variant)
+        value = await self.backend.get(key)
+        if value is not None:
+            self.exact_hits += 1
+            return CachedAnswer.from_json(value), "exact"
+
+        if self.embedder is not None and self._vectors:
+            vector = await self.embedder(normalize_question(question))
+            best_key, best_score = None, 0.0
+            for other_key, (other_variant, other) in self._vectors.items():
+                if other_variant != variant:
+                    continue
+                score = cosine(vector, other)
+                if score > best_score:
+                    best_key, best_score = other_key, score
+            if best_key is not None and best_score >= self.similarity_threshold:
+                value = await self.backend.get(best_key)
+                if value is not None:
+                    self._vectors.move_to_end(best_key)
+                    self.semantic_hits += 1
+                    return CachedAnswer.from_json(value), "semantic"
+                # Expired or evicted from the backend
+                del self._vectors[best_key]
+
+        self.misses += 1
+        return None, None
+
+    async def set(self, question: str, answer: CachedAnswer, variant: str = "") -> None:
+        try:
+            await self._set(question, answer, variant)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Answer cache store failed: %s", e)
+
+    async def _set(self, question: str, answer: CachedAnswer, variant: str) -> None:
+        key = self.key(question, variant)
+        await self.backend.set(key, answer.to_json(), self.ttl)
+        if self.embedder is not None:
+            self._vectors[key] = (variant, await self.embedder(normalize_question(question)))
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_semantic_entries:
+                self._vectors.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+            "semantic_threshold": self.similarity_threshold if self.embedder is not None else None,
+        }
+
+
+# ============================================
+# Phase cache (per-task memoization)
+# ============================================
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class PhaseCache:
+    """Memoized outputs of individual council tasks, with per-task hit/miss counters"""
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: float = 3600):
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self.ttl = ttl
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.errors = 0
+
+    @staticmethod
+    def key(role: str, model: str, prompt: str, context: str) -> str:
+        """Upstream outputs are part of the key, so a recomputed phase invalidates everything after it"""
+        return _sha256(json.dumps([role, model, _sha256(prompt), _sha256(context)]))
+
+    async def get(self, key: str, task_name: str = "") -> Optional[str]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Phase cache lookup failed: %s", e)
+            value = None
+        counter = self.hits if value is not None else self.misses
+        counter[task_name] = counter.get(task_name, 0) + 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Phase cache store failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": sum(self.hits.values()),
+            "misses": sum(self.misses.values()),
+            "errors": self.errors,
+            "by_task": {
+                name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)}
+                for name in sorted(set(self.hits) | set(self.misses))
+            },
+            "ttl_seconds": self.ttl,
+        }
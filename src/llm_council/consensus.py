@@ -0,0 +1,94 @@
+"""
+Early-exit consensus for the LLM Council
+
+Critiques plus the chairman are 4 of the 7 calls. When the three gather
+drafts already say the same thing, that work buys little, so the engine can
+score pairwise agreement of the drafts with a cheap local measure and skip
+the critique phase:
+
+- "synthesize": one short chairman call merges the drafts (consensus_answer
+  in tasks.yaml) -> 4 calls instead of 7
+- "majority": return the draft closest to the other two -> 3 calls
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from itertools import combinations
+from typing import List, Optional
+
+SYNTHESIZE = "synthesize"
+MAJORITY = "majority"
+
+JACCARD = "jaccard"
+COSINE = "cosine"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Too common to say anything about agreement
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "which with".split()
+)
+
+
+def terms(text: str) -> List[str]:
+    """Lower-cased words of `text` minus stopwords"""
+    return [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def jaccard(a: str, b: str) -> float:
+    """Token-set overlap"""
+    terms_a, terms_b = set(terms(a)), set(terms(b))
+    if not terms_a and not terms_b:
+        return 1.0
+    return len(terms_a & terms_b) / len(terms_a | terms_b)
+
+
+def term_cosine(a: str, b: str) -> float:
+    """Cosine similarity of term-frequency vectors"""
+    counts_a, counts_b = Counter(terms(a)), Counter(terms(b))
+    dot = sum(counts_a[term] * counts_b[term] for term in counts_a)
+    norm = math.sqrt(sum(v * v for v in counts_a.values())) * math.sqrt(sum(v * v for v in counts_b.values()))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class ConsensusDecision:
+    agreement: float       # mean pairwise similarity of the drafts
+    agreed: bool
+    majority_index: int    # draft with the highest mean similarity to the others
+
+
+@dataclass
+class ConsensusPolicy:
+    """When (threshold) and how (action) to skip the critique phase"""
+    threshold: float = 0.6
+    method: str = JACCARD
+    action: str = SYNTHESIZE
+
+    def __post_init__(self):
+        if self.method not in (JACCARD, COSINE):
+            raise ValueError(f"Unknown consensus method: {self.method!r} (expected '{JACCARD}' or '{COSINE}')")
+        if self.action not in (SYNTHESIZE, MAJORITY):
+            raise ValueError(f"Unknown consensus action: {self.action!r} (expected '{SYNTHESIZE}' or '{MAJORITY}')")
+
+    def similarity(self, a: str, b: str) -> float:
+        return jaccard(a, b) if self.method == JACCARD else term_cosine(a, b)
+
+    def evaluate(self, drafts: List[str]) -> Optional[ConsensusDecision]:
+        """Score the drafts; None when there are too few to compare"""
+        if len(drafts) < 2:
+            return None
+        scores = [[1.0] * len(drafts) for _ in drafts]
+        for i, j in combinations(range(len(drafts)), 2):
+            scores[i][j] = scores[j][i] = self.similarity(drafts[i], drafts[j])
+        pairs = [scores[i][j] for i, j in combinations(range(len(drafts)), 2)]
+        agreement = sum(pairs) / len(pairs)
+        closeness = [(sum(row) - 1.0) / (len(drafts) - 1) for row in scores]
+        return ConsensusDecision(
+            agreement=round(agreement, 3),
+            agreed=agreement >= self.threshold,
+            majority_index=max(range(len(drafts)), key=closeness.__getitem__),
+        )
@@ -0,0 +1,146 @@
+"""
+Context building for critique and chairman calls
+
+crewAI's rendering puts each task's persona first and pastes its context
+after the task text, so no two calls of a council share a prompt prefix, and
+drafts that repeat each other are sent over and over. ContextBuilder lays
+every call after the gather phase out as:
+
+    system: Question + the council's drafts   <- identical for every call of the run
+    user:   persona, extra context (critiques), task instructions
+
+- the shared prefix lets provider-side prompt caching hit on every critique
+  and chairman call (the chairman shares gpt4o's model with gpt_critique)
+- sentences repeated across a call's extra context (the critiques) are sent
+  once; the drafts themselves are never deduped, since critiques review them
+- token budgets cap the shared prefix and each phase's extra context,
+  dropping trailing sentences of the longest items first
+
+Critiques still only review the *other* delegates' drafts: the instructions
+name the answers to work from (numbered, for structured critiques). The
+chairman sees the drafts as well as the critiques.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .critique import answer_label
+    from .scheduler import estimate_tokens
+except ImportError:
+    from critique import answer_label
+    from scheduler import estimate_tokens
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_NORMALIZE = re.compile(r"[^a-z0-9]+")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence for sentence in _SENTENCE.split(text.strip()) if sentence]
+
+
+def dedupe_sentences(texts: List[str]) -> Tuple[List[str], int]:
+    """Drop sentences already seen in an earlier text; returns (texts, sentences removed)"""
+    seen = set()
+    removed = 0
+    result = []
+    for text in texts:
+        kept = []
+        for sentence in split_sentences(text):
+            key = _NORMALIZE.sub(" ", sentence.lower()).strip()
+            if key and key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+            kept.append(sentence)
+        result.append(" ".join(kept) if kept else "(Nothing beyond the context above.)")
+    return result, removed
+
+
+def fit_budget(texts: List[str], budget: Optional[int]) -> Tuple[List[str], bool]:
+    """Trim trailing sentences of the longest texts until all of them fit in `budget` tokens
+
+    Texts already down to one sentence are cut to an equal share of the budget.
+    """
+    if budget is None or sum(estimate_tokens(text) for text in texts) <= budget:
+        return texts, False
+    sentences = [split_sentences(text) for text in texts]
+    trimmed = [False] * len(texts)
+    while sum(estimate_tokens(" ".join(s)) for s in sentences) > budget:
+        longest = max(range(len(sentences)), key=lambda i: estimate_tokens(" ".join(sentences[i])))
+        if len(sentences[longest]) <= 1:
+            share = max(1, budget // len(texts)) * 4  # characters, at ~4 per token
+            sentences = [[" ".join(s)[:share].rsplit(" ", 1)[0]] if len(" ".join(s)) > share else s
+                         for s in sentences]
+            trimmed = [cut or len(" ".join(s)) >= share for s, cut in zip(sentences, trimmed)]
+            break
+        sentences[longest].pop()
+        trimmed[longest] = True
+    return [" ".join(s) + (" [...]" if cut else "") for s, cut in zip(sentences, trimmed)], True
+
+
+@dataclass
+class SharedPrefix:
+    """The run's question + drafts block, reused verbatim by every later call"""
+    text: str
+    labels: Dict[int, str]  # id(draft task) -> label
+    deduped_sentences: int = 0  # dropped from extra context across the run's calls
+    truncated: bool = False
+
+
+@dataclass
+class ContextBuilder:
+    """Compact, prefix-stable prompts for every call after the gather phase
+
+    prefix_budget: tokens allowed for the shared question + drafts block
+    phase_budgets: tokens allowed for each phase's extra context per call,
+        keyed by phase name (e.g. {"synthesis": 1200})
+    """
+    prefix_budget: Optional[int] = None
+    phase_budgets: Dict[str, int] = field(default_factory=dict)
+    dedupe: bool = True
+
+    def prefix(self, inputs: Dict[str, str], drafts: List[Any]) -> SharedPrefix:
+        from crewai.utilities.string_utils import interpolate_only  # imported here: building a builder stays cheap
+        # Drafts stay whole: every one of them is reviewed by some critique
+        texts = [task.output.raw for task in drafts]
+        texts, truncated = fit_budget(texts, self.prefix_budget)
+        labels = {id(task): interpolate_only(task.agent.role, inputs) for task in drafts}
+        blocks = [f"[{labels[id(task)]}]\n{text}" for task, text in zip(drafts, texts)]
+        text = f"Question: {inputs.get('question', '')}\n\nThe council's answers:\n\n" + "\n\n".join(blocks)
+        return SharedPrefix(text=text, labels=labels, truncated=truncated)
+
+    def render(self, task: Any, prefix: SharedPrefix, inputs: Dict[str, str], phase: str) -> List[Dict[str, str]]:
+        """Messages for one critique/synthesis task: shared prefix first, task-specific text last"""
+        referenced = [prefix.labels[id(t)] for t in task.context if id(t) in prefix.labels]
+        extra = [t for t in task.context if id(t) not in prefix.labels]
+
+        parts = [task.persona(inputs)]
+        if extra:
+            from crewai.utilities.string_utils import interpolate_only
+            texts = [t.output.raw for t in extra]
+            if self.dedupe:
+                texts, removed = dedupe_sentences(texts)
+                prefix.deduped_sentences += removed
+            texts, _ = fit_budget(texts, self.phase_budgets.get(phase))
+            # Merged critiques (engine.py) have no single author: labelled by name only
+            labels = [f"{interpolate_only(t.agent.role, inputs)}: {t.name}" if t.agent is not None else t.name
+                      for t in extra]
+            parts.append("Further context:\n\n" + "\n\n".join(
+                f"[{label}]\n{text}" for label, text in zip(labels, texts)))
+        parts.append(task.task_prompt(inputs))
+        if referenced and getattr(task, "numbered", False):
+            # Structured critiques name drafts by position (critique.py)
+            parts.append("Review these answers above, numbered in this order: " + ", ".join(
+                f"{answer_label(position)} = [{label}]" for position, label in enumerate(referenced, 1)) + ".")
+        elif referenced and len(referenced) < len(prefix.labels):
+            parts.append("Work only from these answers above: " + ", ".join(f"[{label}]" for label in referenced) + ".")
+        return [
+            {"role": "system", "content": prefix.text},
+            {"role": "user", "content": "\n\n".join(parts)},
+        ]
+
+
+def message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(message["content"]) for message in messages)
@@ -1,15 +1,41 @@
 
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, crew
 from crewai import LLM
 
 from dotenv import load_dotenv
-load_dotenv()
 
-# Define LLM configurations
-gpt4o = LLM(model="openai/o3-mini-2025-01-31")
-claude3 = LLM(model="anthropic/claude-3-5-haiku-20241022")
-gemini2 = LLM(model="gemini/gemini-2.0-flash-lite")
+try:
+    from .critique import STRUCTURED_OUTPUTS
+    from .resilience import AgentPolicy, RetryPolicy
+    from .topology import DELEGATES, DRAFTS, OTHERS, OWN, PREVIOUS, Topology, task_prefix
+except ImportError:
+    from critique import STRUCTURED_OUTPUTS
+    from resilience import AgentPolicy, RetryPolicy
+    from topology import DELEGATES, DRAFTS, OTHERS, OWN, PREVIOUS, Topology, task_prefix
+
+# Define LLM configurations (agents.yaml refers to these by name). The LLM
+# clients are created on first use, so a council built entirely on stubs or a
+# recording never constructs them; `from crew import gpt4o` still works.
+MODELS = {
+    "gpt4o": "openai/o3-mini-2025-01-31",
+    "claude3": "anthropic/claude-3-5-haiku-20241022",
+    "gemini2": "gemini/gemini-2.0-flash-lite",
+}
+_default_llms: Dict[str, LLM] = {}
+
+def default_llm(name: str) -> LLM:
+    if name not in _default_llms:
+        load_dotenv()  # API keys from .env, read when the first client is created
+        _default_llms[name] = LLM(model=MODELS[name])
+    return _default_llms[name]
+
+def __getattr__(name: str):
+    if name in MODELS:
+        return default_llm(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # @CrewBase
@@ -157,138 +183,180 @@ gemini2 = LLM(model="gemini/gemini-2.0-flash-lite")
 
 @CrewBase
 class LlmCouncil():
-    """LlmCouncil crew - Optimized for token efficiency"""
+    """LlmCouncil crew - Optimized for token efficiency
+
+    The council is generated from the `council:` entries in agents.yaml and
+    tasks.yaml (see topology.py): one task per delegate for each delegates'
+    phase, one chairman task for each chairman phase. The default council is
+    3 delegates x (gather, critique) + the chairman's final_answer; pass a
+    Topology to build another shape.
+    """
 
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
-    # -------------------
-    # AGENTS
-    # -------------------
-    @agent
-    def gpt_delegate(self) -> Agent:
-        return Agent(
-            config=self.agents_config["gpt_delegate"],
-            llm=gpt4o,
-            verbose=True
-        )
-
-    @agent
-    def claude_delegate(self) -> Agent:
-        return Agent(
-            config=self.agents_config["claude_delegate"],
-            llm=claude3,
-            verbose=True
-        )
-
-    @agent
-    def gemini_delegate(self) -> Agent:
-        return Agent(
-            config=self.agents_config["gemini_delegate"],
-            llm=gemini2,
-            verbose=True
-        )
-
-    @agent
-    def chairman(self) -> Agent:
-        return Agent(
-            config=self.agents_config["chairman"],
-            llm=gpt4o,
-            verbose=True
-        )
+    def __init__(self, llms: Optional[Dict[str, object]] = None, topology: Optional[Topology] = None,
+                 wrap_llm: Optional[Callable[[Any], Any]] = None):
+        # Benchmarks and tests can swap any of the module-level LLMs for stubs
+        self.llms = dict(llms or {})
+        self._topology = topology
+        self._wrap_llm = wrap_llm  # e.g. Recorder.wrap (recording.py)
+        self._agents: Dict[str, Agent] = {}
+        self._tasks: Optional[List[Task]] = None
+        self._drafts: List[Task] = []
+
+    @property
+    def topology(self) -> Topology:
+        # agents_config/tasks_config are only loaded once CrewBase's __init__ has run
+        if self._topology is None:
+            # Overrides may pick any crew.py LLM, or an LLM this council was given (stubs)
+            self._topology = Topology.from_config(self.agents_config, self.tasks_config,
+                                                  models=list(MODELS) + list(self.llms))
+        return self._topology
+
+    def _llm(self, agent_name: str):
+        name = self.topology.llms.get(agent_name)
+        if name is None:
+            raise ValueError(f"Agent {agent_name} has no 'llm' in agents.yaml")
+        return self._model(name)
+
+    def _model(self, name: str):
+        if name in self.llms:
+            llm = self.llms[name]
+        else:
+            llm = default_llm(name) if name in MODELS else LLM(model=name)
+        return self._wrap_llm(llm) if self._wrap_llm is not None else llm
+
+    def policies(self) -> Dict[str, AgentPolicy]:
+        """Retry and fallback settings (`retry`, `fallback` in agents.yaml) keyed by agent role"""
+        return {
+            spec["role"]: AgentPolicy(
+                retry=RetryPolicy.from_config(spec.get("retry")),
+                fallbacks=[self._model(name) for name in spec.get("fallback") or []],
+            )
+            for spec in self.agents_config.values()
+            if spec.get("retry") is not None or spec.get("fallback")
+        }
 
     # -------------------
-    # TASKS (Phase 1: Drafting)
+    # AGENTS
     # -------------------
-    @task
-    def gpt_gather(self) -> Task:
-        return Task(
-            config=self.tasks_config["gather_answers"],
-            agent=self.gpt_delegate(),
-            async_execution=True
-        )
-
-    @task
-    def claude_gather(self) -> Task:
-        return Task(
-            config=self.tasks_config["gather_answers"],
-            agent=self.claude_delegate(),
-            async_execution=True
-        )
-
-    @task
-    def gemini_gather(self) -> Task:
-        return Task(
-            config=self.tasks_config["gather_answers"],
-            agent=self.gemini_delegate(),
-            async_execution=True
-        )
+    def council_agent(self, name: str) -> Agent:
+        if name not in self._agents:
+            self._agents[name] = Agent(
+                config=self.agents_config[name],
+                llm=self._llm(name),
+                verbose=True
+            )
+        return self._agents[name]
 
     # -------------------
-    # TASKS (Phase 2: Cross-Critiquing)
+    # TASKS
     # -------------------
-    # KEY OPTIMIZATION: Each model only critiques OTHER models' answers
-    # This reduces context by ~33% per critique task
-    
-    @task
-    def gpt_critique(self) -> Task:
+    # Phase 1 (gather) tasks are async so crewAI's Process.sequential drafts in
+    # parallel. Later tasks are synchronous: crewAI refuses async tasks whose
+    # context holds the async tasks right before them.
+    #
+    # KEY OPTIMIZATION: with `sees: others` each model only critiques OTHER
+    # models' answers, which reduces context by ~33% per critique task.
+    # With `output: critique` the critiques are validated CritiqueReports and
+    # the chairman reads them merged (see critique.py).
+    def council_tasks(self) -> List[Task]:
+        if self._tasks is not None:
+            return self._tasks
+        topology = self.topology
+        tasks: List[Task] = []
+        previous: List[Tuple[Optional[str], Task]] = []  # (delegate or None for the chairman, task)
+        for index, phase in enumerate(topology.phases):
+            if phase.output is not None and phase.output not in STRUCTURED_OUTPUTS:
+                raise ValueError(f"Phase {phase.name}: unknown output {phase.output!r} "
+                                 f"(expected one of {list(STRUCTURED_OUTPUTS)})")
+            runners = list(topology.delegates) if phase.run_by == DELEGATES else [None]
+            current = []
+            for delegate in runners:
+                current.append((delegate, Task(
+                    config=self.tasks_config[phase.task],
+                    name=f"{task_prefix(delegate)}_{phase.name}" if delegate else phase.task,
+                    agent=self.council_agent(delegate or topology.chairman),
+                    context=self._context(phase.sees, delegate, previous) or None,
+                    async_execution=index == 0 and len(runners) > 1,
+                    output_pydantic=STRUCTURED_OUTPUTS.get(phase.output),
+                )))
+            if index == 0:
+                self._drafts = [task for _, task in current]
+            tasks.extend(task for _, task in current)
+            previous = current
+        self._tasks = tasks
+        return tasks
+
+    def _context(self, sees: tuple, delegate: Optional[str],
+                 previous: List[Tuple[Optional[str], Task]]) -> List[Task]:
+        context: List[Task] = []
+        for kind in sees:
+            if kind == PREVIOUS:
+                chosen = [task for _, task in previous]
+            elif kind == OTHERS:
+                chosen = [task for owner, task in previous if owner is None or owner != delegate]
+            elif kind == OWN:
+                chosen = [task for owner, task in previous if owner == delegate]
+            elif kind == DRAFTS:
+                chosen = self._drafts
+            else:
+                chosen = []
+            context.extend(task for task in chosen if task not in context)
+        return context
+
+    # Consensus fast path: not part of the crew's task list; the engine runs it
+    # from the gather drafts when they already agree (see consensus.py)
+    def consensus_answer(self) -> Optional[Task]:
+        name = self.topology.consensus_task
+        if name is None:
+            return None
+        self.council_tasks()
         return Task(
-            config=self.tasks_config["critique_answers"],
-            agent=self.gpt_delegate(),
-            # GPT only sees Claude and Gemini answers (not its own)
-            context=[self.claude_gather(), self.gemini_gather()],
+            config=self.tasks_config[name],
+            name=name,
+            agent=self.council_agent(self.topology.chairman),
+            context=list(self._drafts)
         )
 
-    @task
-    def claude_critique(self) -> Task:
-        return Task(
-            config=self.tasks_config["critique_answers"],
-            agent=self.claude_delegate(),
-            # Claude only sees GPT and Gemini answers (not its own)
-            context=[self.gpt_gather(), self.gemini_gather()],
+    # Speculative chairman: not part of the crew's task list either; the engine
+    # runs the draft from the gather drafts alongside the critiques, and the
+    # revise pass (over the draft and the critiques) when the draft falls short
+    # (see speculative.py)
+    def speculative_answers(self) -> Optional[Tuple[Task, Task]]:
+        draft_name, revise_name = self.topology.speculative_task, self.topology.revise_task
+        if draft_name is None or revise_name is None:
+            return None
+        self.council_tasks()
+        chairman = self.council_agent(self.topology.chairman)
+        draft = Task(
+            config=self.tasks_config[draft_name],
+            name=draft_name,
+            agent=chairman,
+            context=list(self._drafts)
         )
-
-    @task
-    def gemini_critique(self) -> Task:
-        return Task(
-            config=self.tasks_config["critique_answers"],
-            agent=self.gemini_delegate(),
-            # Gemini only sees GPT and Claude answers (not its own)
-            context=[self.gpt_gather(), self.claude_gather()],
-        )
-
-    # -------------------
-    # TASKS (Phase 3: Synthesis)
-    # -------------------
-    @task
-    def final_answer(self) -> Task:
-        return Task(
-            config=self.tasks_config["final_answer"],
-            agent=self.chairman(),
-            context=[self.gpt_critique(), self.claude_critique(), self.gemini_critique()]
+        revise = Task(
+            config=self.tasks_config[revise_name],
+            name=revise_name,
+            agent=chairman,
+            context=[draft]
         )
+        return draft, revise
 
     # -------------------
     # CREW FLOW
     # -------------------
+    # Process.sequential runs the critiques one after another. The "parallel"
+    # mode in engine.py runs this same task list phase by phase (gather ->
+    # critique -> synthesis), fanning out each phase.
     @crew
     def crew(self) -> Crew:
+        tasks = self.council_tasks()
+        topology = self.topology
         return Crew(
-            agents=[
-                self.gpt_delegate(),
-                self.claude_delegate(),
-                self.gemini_delegate(),
-                self.chairman(),
-            ],
-            tasks=[
-                self.gpt_gather(),
-                self.claude_gather(),
-                self.gemini_gather(),
-                self.gpt_critique(),
-                self.claude_critique(),
-                self.gemini_critique(),
-                self.final_answer()
-            ],
+            agents=[self.council_agent(name) for name in topology.delegates + (topology.chairman,)],
+            tasks=tasks,
             process=Process.sequential,
             verbose=True,
         )
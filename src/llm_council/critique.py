@@ -0,0 +1,142 @@
+"""
+Structured critiques for the LLM Council
+
+Free-text critiques leave the chairman re-reading three blocks of prose. With
+`output: critique` on a phase in tasks.yaml, each critique task gets
+CritiqueReport as its output_pydantic: crewAI appends the schema to the
+prompt (so does the engine), and the reply is validated into per-draft
+scores and short claim lists. The engine then:
+
+- gives later tasks (the chairman) one compact merged block instead of the
+  raw critiques: per draft, the mean score and every distinct claim
+- reports a ranking of the drafts by score on the result (/ask/detailed)
+
+Reviews name drafts by position: `answer` 1 is the first answer the critic
+was given (its context order). Both prompt renderings mark the drafts with
+answer_label ("Answer 1: ..." in plain prompts, "Answer 1 = [GPT Delegate]"
+in ContextBuilder ones). Reviews of a position the critic was not given, or
+a second review of the same one, are dropped and reported. A reply that does
+not validate keeps its raw text and reaches the chairman as before.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Claims kept per list (extra ones are dropped rather than failing validation)
+MAX_CLAIMS = 3
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_NORMALIZE = re.compile(r"[^a-z0-9]+")
+
+
+class DraftReview(BaseModel):
+    """One critic's verdict on one draft"""
+    answer: int = Field(ge=1, description="Position of the reviewed answer (1 = the first one given)")
+    score: int = Field(ge=1, le=10, description="Accuracy and completeness, 1-10")
+    strengths: List[str] = Field(default_factory=list)
+    weaknesses: List[str] = Field(default_factory=list)
+    missing: List[str] = Field(default_factory=list)
+
+    @field_validator("strengths", "weaknesses", "missing")
+    @classmethod
+    def _claims(cls, claims: List[str]) -> List[str]:
+        return [claim.strip() for claim in claims if claim.strip()][:MAX_CLAIMS]
+
+
+class CritiqueReport(BaseModel):
+    """A critique task's output: one review per answer it was given"""
+    reviews: List[DraftReview]
+
+
+# tasks.yaml `output:` values -> output_pydantic models
+STRUCTURED_OUTPUTS: Dict[str, Type[BaseModel]] = {"critique": CritiqueReport}
+
+
+def answer_label(position: int) -> str:
+    """How prompts mark the answer a review names by `position` (1-based)"""
+    return f"Answer {position}"
+
+
+def parse_structured(raw: str, model: Type[BaseModel]) -> Optional[BaseModel]:
+    """Validate a reply against `model`; tolerates prose or code fences around the JSON object"""
+    match = _JSON_OBJECT.search(raw)
+    if match is None:
+        return None
+    try:
+        return model.model_validate_json(match.group(0))
+    except ValidationError:
+        return None
+
+
+@dataclass
+class DraftSummary:
+    """Every review of one draft, merged across critics"""
+    name: str
+    label: str
+    scores: List[int] = field(default_factory=list)
+    strengths: List[str] = field(default_factory=list)
+    weaknesses: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def score(self) -> Optional[float]:
+        return round(sum(self.scores) / len(self.scores), 2) if self.scores else None
+
+    def add(self, review: DraftReview) -> None:
+        self.scores.append(review.score)
+        for kind in ("strengths", "weaknesses", "missing"):
+            merged = getattr(self, kind)
+            seen = {_NORMALIZE.sub(" ", claim.lower()).strip() for claim in merged}
+            for claim in getattr(review, kind):
+                key = _NORMALIZE.sub(" ", claim.lower()).strip()
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(claim)
+
+
+def summarize(critiques: Sequence[Tuple[str, Sequence[Any], CritiqueReport]],
+              labels: Dict[str, str]) -> Tuple[List[DraftSummary], Dict[str, List[int]]]:
+    """Merge reviews per draft; `critiques`: (critic name, the drafts it was given in order, its report)
+
+    Drafts are matched by task name; `labels` maps draft names to display labels
+    (agent roles). Returns the summaries and, per critic, the answer numbers of
+    the reviews dropped: positions it was not given, or already reviewed.
+    """
+    summaries: Dict[str, DraftSummary] = {}
+    dropped: Dict[str, List[int]] = {}
+    for critic, drafts, report in critiques:
+        reviewed = set()
+        for review in report.reviews:
+            if review.answer > len(drafts) or review.answer in reviewed:
+                dropped.setdefault(critic, []).append(review.answer)
+                continue
+            reviewed.add(review.answer)
+            name = drafts[review.answer - 1].name
+            summary = summaries.setdefault(name, DraftSummary(name=name, label=labels.get(name, name)))
+            summary.add(review)
+    return list(summaries.values()), dropped
+
+
+def merged_text(summaries: List[DraftSummary]) -> str:
+    """The compact block the chairman reads instead of the raw critiques"""
+    blocks = ["Critiques of the answers (mean score out of 10; points raised by any critic):"]
+    for summary in summaries:
+        lines = [f"[{summary.label}] {summary.score}/10"]
+        for label, claims in (("STRENGTH", summary.strengths), ("WEAKNESS", summary.weaknesses),
+                              ("MISSING", summary.missing)):
+            if claims:
+                lines.append(f"{label}: " + "; ".join(claims))
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def ranking(summaries: List[DraftSummary]) -> List[Dict[str, Any]]:
+    """Drafts from best to worst mean score, with their merged claims"""
+    return [
+        {"draft": summary.name, "agent": summary.label, "score": summary.score, "reviews": len(summary.scores),
+         "strengths": summary.strengths, "weaknesses": summary.weaknesses, "missing": summary.missing}
+        for summary in sorted(summaries, key=lambda summary: -summary.score)
+    ]
@@ -0,0 +1,1100 @@
+"""
+Phase-parallel execution engine for the LLM Council crew
+
+crewAI's Process.sequential only runs *consecutive* async tasks together and
+refuses async tasks whose context contains the async tasks right before them,
+so the three critiques in LlmCouncil.crew() have to run one after another.
+The council is really a 3-level DAG (gather -> critique -> synthesis), so this
+engine groups the crew's tasks by their `context` dependencies and runs every
+task of a phase at once. Critique wall time becomes the slowest critique
+instead of the sum of all three.
+
+The crew handed to CouncilEngine is a read-only template: YAML parsing and
+Agent/Task construction happen once. Every kickoff builds a fresh, cheap
+graph of CouncilTask objects that holds the rendered prompts and outputs for
+that request only, and calls each agent's LLM directly. crewAI Agents keep
+per-execution state (agent_executor, tools_results), so the shared template
+is never executed through crewAI itself.
+
+The engine is native asyncio: akickoff() awaits every model call on the
+caller's event loop (litellm.acompletion for crewai.LLM), so an in-flight
+council holds no thread. crew.kickoff_async() is only asyncio.to_thread()
+around the blocking kickoff, which is what this replaces.
+
+With a ConsensusPolicy the engine scores the gather drafts and, when they
+already agree, skips straight from gather to a short synthesis (or returns
+the majority draft), see consensus.py.
+
+With a SpeculativePolicy the chairman drafts the final answer from the
+gather drafts while the critiques run, then keeps that draft or revises it
+once they land, see speculative.py.
+
+Phases with a structured output (`output: critique` in tasks.yaml) are
+validated into Pydantic models; the chairman reads the critiques merged into
+one compact block, and the result ranks the drafts by score, see critique.py.
+
+With a QuorumPolicy a fan-out phase moves on once k of its tasks have
+answered or their per-model deadlines passed, and stragglers are cancelled.
+Later tasks only see the upstream outputs that actually arrived.
+
+With a ContextBuilder every call after gather starts with the same
+question + drafts prefix (compacted and budgeted), see context.py. Every
+result reports the input tokens each phase sent, next to what crewAI-style
+rendering would have sent.
+
+Every model call is recorded (tokens, latency, cost; see usage.py) on the
+result and in the engine's UsageTracker. Phases, tasks, limiter waits and
+model calls are traced as spans (see tracing.py).
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import litellm
+from crewai import LLM, Agent, Crew, Task
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.converter import generate_model_description
+from crewai.utilities.i18n import I18N
+from crewai.utilities.string_utils import interpolate_only
+
+try:
+    from .cache import PhaseCache
+    from .consensus import MAJORITY, ConsensusPolicy
+    from .context import ContextBuilder, SharedPrefix, message_tokens
+    from .critique import CritiqueReport, answer_label, merged_text, parse_structured, ranking, summarize
+    from .pool import get_client_pool
+    from .resilience import NO_RETRY, AgentPolicy, TaskFailed, degradation_report, most_central
+    from .scheduler import CallHandle, CallLimiter, ProviderSaturated, estimate_tokens
+    from .speculative import SpeculativePolicy
+    from .tracing import current_span, get_tracer
+    from .usage import CallRecord, UsageTracker
+except ImportError:
+    from cache import PhaseCache
+    from consensus import MAJORITY, ConsensusPolicy
+    from context import ContextBuilder, SharedPrefix, message_tokens
+    from critique import CritiqueReport, answer_label, merged_text, parse_structured, ranking, summarize
+    from pool import get_client_pool
+    from resilience import NO_RETRY, AgentPolicy, TaskFailed, degradation_report, most_central
+    from scheduler import CallHandle, CallLimiter, ProviderSaturated, estimate_tokens
+    from speculative import SpeculativePolicy
+    from tracing import current_span, get_tracer
+    from usage import CallRecord, UsageTracker
+
+# Execution modes
+SEQUENTIAL = "sequential"  # crew.kickoff() - crewAI's own Process.sequential
+PARALLEL = "parallel"      # CouncilEngine - every phase fans out
+
+PHASE_NAMES = ["gather", "critique", "synthesis"]
+SPECULATIVE_PHASE = "speculative"  # timings/trace label of the speculative chairman draft
+MERGED_CRITIQUES = "critiques"  # context entry standing in for the structured critiques (critique.py)
+
+logger = logging.getLogger(__name__)
+
+_i18n = I18N()
+
+# Receives progress events while a council runs:
+#   {"event": "task", "index", "task", "agent", "output", "cached"}  a task finished
+#   {"event": "token", "index", "task", "delta"}                      a chunk of a final-phase task
+Listener = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _raise_saturated(errors: Iterable[BaseException]) -> None:
+    """A saturated provider fails the whole request (a 503 to back off), never just one task"""
+    for error in errors:
+        if isinstance(error, ProviderSaturated):
+            raise error
+
+
+def _context_tasks(task: Task) -> List[Task]:
+    # Task.context defaults to a NOT_SPECIFIED sentinel rather than a list
+    return task.context if isinstance(task.context, list) else []
+
+
+def council_phases(tasks: list, context: Callable[[Any], list] = _context_tasks) -> List[list]:
+    """Group tasks into phases: each task runs one phase after the latest task in its context"""
+    levels: Dict[int, int] = {}
+    phases: List[list] = []
+    for task in tasks:
+        level = max((levels[id(t)] + 1 for t in context(task)), default=0)
+        levels[id(task)] = level
+        while len(phases) <= level:
+            phases.append([])
+        phases[level].append(task)
+    return phases
+
+
+def phase_name(index: int, names: List[str] = PHASE_NAMES) -> str:
+    return names[index] if index < len(names) else f"phase_{index + 1}"
+
+
+# ============================================
+# Quorum (hedged phases)
+# ============================================
+@dataclass
+class QuorumPolicy:
+    """How long a fan-out phase (gather, critique) waits for its tasks
+
+    k: the phase proceeds as soon as k of its tasks answered (None waits
+       for all of them); the rest are cancelled
+    timeout: default per-task deadline in seconds (None: no deadline)
+    model_timeouts: per-model deadlines keyed by LLM model id, e.g.
+       {"openai/o3-mini-2025-01-31": 20}
+
+    A task that fails or misses its deadline is dropped instead of failing
+    the council, as long as at least one task of the phase answered.
+    Single-task phases (the chairman) have nothing to fall back on, so they
+    always run to completion.
+    """
+    k: Optional[int] = None
+    timeout: Optional[float] = None
+    model_timeouts: Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.k is not None and self.k < 1:
+            raise ValueError(f"Quorum k must be at least 1, got {self.k}")
+
+    def timeout_for(self, model: str) -> Optional[float]:
+        return self.model_timeouts.get(model, self.timeout)
+
+    def needed(self, n: int) -> int:
+        return n if self.k is None else min(self.k, n)
+
+
+# ============================================
+# Per-request task graph
+# ============================================
+@dataclass(eq=False)
+class CouncilTask:
+    """One request's copy of a crew Task (the template Task and its Agent are only read)"""
+    name: str
+    template: Task
+    agent: Agent
+    index: int = 0  # position in crew.tasks
+    phase: int = 0  # position of its phase (gather = 0)
+    phase_label: str = PHASE_NAMES[0]  # name of its phase (topology.py)
+    context: List["CouncilTask"] = field(default_factory=list)
+    output: Optional[TaskOutput] = None
+    cached: bool = False  # output came from the phase cache (or `restored`)
+    restored: Optional[str] = None  # output saved by an interrupted run of this council (jobs.py)
+    messages: Optional[List[Dict[str, str]]] = None  # set by a ContextBuilder instead of render()
+    call: Optional[CallRecord] = None  # usage of its model call (None when served from the phase cache)
+    attempts: int = 0  # model calls made, retries and fallbacks included
+    model: Optional[str] = None  # model that answered (a fallback's when the agent's own failed)
+    streamed: bool = False  # tokens already went to the listener (a retry would repeat them)
+
+    def persona(self, inputs: Dict[str, str]) -> str:
+        agent = self.agent
+        return _i18n.slice("role_playing").format(
+            role=interpolate_only(agent.role, inputs),
+            goal=interpolate_only(agent.goal, inputs),
+            backstory=interpolate_only(agent.backstory, inputs),
+        )
+
+    def task_prompt(self, inputs: Dict[str, str]) -> str:
+        parts = [
+            interpolate_only(self.template.description, inputs),
+            _i18n.slice("expected_output").format(
+                expected_output=interpolate_only(self.template.expected_output, inputs)
+            ),
+        ]
+        if self.template.output_pydantic is not None:
+            # The schema instructions crewAI's Agent appends for output_pydantic tasks
+            parts.append(_i18n.slice("formatted_task_instructions").format(
+                output_format=generate_model_description(self.template.output_pydantic)
+            ))
+        return "\n".join(parts)
+
+    @property
+    def numbered(self) -> bool:
+        """Structured critiques name drafts by position, so their prompts mark each one (critique.py)"""
+        return self.template.output_pydantic is CritiqueReport
+
+    def context_text(self) -> str:
+        if self.numbered:
+            return "\n\n----------\n\n".join(
+                f"{answer_label(position)}:\n{t.output.raw}" for position, t in enumerate(self.context, 1))
+        return "\n\n----------\n\n".join(t.output.raw for t in self.context)
+
+    def render(self, inputs: Dict[str, str]) -> List[Dict[str, str]]:
+        """Chat messages for this task, worded like crewAI's own agent prompts"""
+        prompt = self.task_prompt(inputs)
+        if self.context:
+            prompt = _i18n.slice("task_with_context").format(task=prompt, context=self.context_text())
+        return [
+            {"role": "system", "content": self.persona(inputs)},
+            {"role": "user", "content": prompt},
+        ]
+
+
+def build_graph(crew: Crew) -> List[CouncilTask]:
+    """Fresh CouncilTask objects mirroring crew.tasks and their context wiring"""
+    by_template: Dict[int, CouncilTask] = {}
+    graph: List[CouncilTask] = []
+    for index, task in enumerate(crew.tasks):
+        node = CouncilTask(
+            name=task.name,
+            template=task,
+            agent=task.agent,
+            index=index,
+            context=[by_template[id(t)] for t in _context_tasks(task)],
+        )
+        by_template[id(task)] = node
+        graph.append(node)
+    return graph
+
+
+@dataclass
+class CouncilResult:
+    """Outcome of one council run (str() gives the final answer, like CrewOutput)"""
+    final_answer: str
+    tasks: List[CouncilTask]  # the tasks that actually ran, in crew order
+    phase_timings: Dict[str, float] = field(default_factory=dict)
+    fast_path: Optional[Dict[str, Any]] = None  # consensus decision, when a ConsensusPolicy is set
+    quorum: Optional[Dict[str, Dict[str, List[str]]]] = None  # per phase: answered/cancelled/timed_out/failed/skipped
+    context_tokens: Optional[Dict[str, Dict[str, int]]] = None  # per phase: input tokens "before"/"after" compaction
+    usage: List[CallRecord] = field(default_factory=list)  # one record per model call
+    degraded: Optional[Dict[str, Any]] = None  # failed/skipped tasks, retries and fallbacks (resilience.py)
+    speculative: Optional[Dict[str, Any]] = None  # speculative chairman: accepted/revised, latency cut, extra tokens
+    critiques: Optional[Dict[str, Any]] = None  # structured critiques: draft ranking, invalid replies (critique.py)
+
+    @property
+    def raw(self) -> str:
+        return self.final_answer
+
+    def __str__(self) -> str:
+        return self.final_answer
+
+
+# ============================================
+# LLM calls
+# ============================================
+def _read_usage(response: Any, usage: Optional[Dict[str, int]]) -> None:
+    reported = getattr(response, "usage", None)
+    if usage is not None and reported is not None:
+        usage["prompt_tokens"] = reported.prompt_tokens or 0
+        usage["completion_tokens"] = reported.completion_tokens or 0
+
+
+def _completion_params(llm: LLM, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    """litellm.acompletion arguments for a crewai.LLM, on the shared HTTP client when a pool is set (pool.py)"""
+    params = llm._prepare_completion_params(messages)
+    pool = get_client_pool()
+    if pool is not None:
+        params.update(pool.completion_kwargs(llm))
+    return params
+
+
+async def acall_llm(llm: Any, messages: List[Dict[str, str]], task: Optional[Task] = None,
+                    agent: Optional[Agent] = None, usage: Optional[Dict[str, int]] = None) -> str:
+    """Await one chat completion without tying up a thread
+
+    LLMs exposing `acall` (stubs, wrappers) are awaited directly; crewai.LLM
+    goes through litellm.acompletion; anything else falls back to a worker thread. Token counts the
+    provider reports are written into `usage` when given (wrappers with
+    `accepts_usage`, see recording.py, fill it themselves).
+    """
+    acall = getattr(llm, "acall", None)
+    if acall is not None:
+        if getattr(llm, "accepts_usage", False):
+            return await acall(messages, from_task=task, from_agent=agent, usage=usage)
+        return await acall(messages, from_task=task, from_agent=agent)
+    if isinstance(llm, LLM):
+        response = await litellm.acompletion(**_completion_params(llm, messages))
+        _read_usage(response, usage)
+        return response.choices[0].message.content or ""
+    return await run_in_thread(llm.call, messages, from_task=task, from_agent=agent)
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """asyncio.to_thread() that records how long the call queued for a worker thread on the current span"""
+    submitted = time.perf_counter()
+
+    def timed() -> Any:
+        current_span().set(thread_wait_s=round(time.perf_counter() - submitted, 6))
+        return func(*args, **kwargs)
+
+    return await asyncio.to_thread(timed)
+
+
+async def astream_llm(llm: Any, messages: List[Dict[str, str]], task: Optional[Task] = None,
+                      agent: Optional[Agent] = None, usage: Optional[Dict[str, int]] = None) -> AsyncIterator[str]:
+    """Yield a chat completion chunk by chunk (a single chunk if the LLM cannot stream)"""
+    astream = getattr(llm, "astream", None)
+    if astream is not None:
+        kwargs = {"from_task": task, "from_agent": agent, "usage": usage} if getattr(llm, "accepts_usage", False) else {}
+        async for delta in astream(messages, **kwargs):
+            yield delta
+        return
+    if isinstance(llm, LLM):
+        params = _completion_params(llm, messages)
+        params["stream"] = True
+        params["stream_options"] = {"include_usage": True}
+        response = await litellm.acompletion(**params)
+        async for chunk in response:
+            _read_usage(chunk, usage)
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+        return
+    yield await acall_llm(llm, messages, task, agent, usage)
+
+
+@dataclass
+class _Speculation:
+    """A speculative chairman draft in flight (see CouncilEngine._speculate)"""
+    draft: CouncilTask
+    revise: CouncilTask
+    future: "asyncio.Task[Optional[float]]"  # the draft's duration, None when it failed
+
+
+# ============================================
+# Engine
+# ============================================
+class CouncilEngine:
+    """Run a council crew phase by phase, with all tasks of a phase in parallel
+
+    Safe to share across concurrent requests: kickoff() never mutates the crew.
+    With a phase_cache, a task whose persona, model, prompt and upstream
+    outputs are unchanged reuses its earlier output instead of calling the LLM.
+    With a consensus policy, agreeing drafts skip the critique phase; the
+    `consensus_task` template (chairman) then synthesizes from the drafts.
+    With a quorum policy, phases stop waiting for slow or failing tasks.
+    With a call limiter, every model call waits for a global/per-provider
+    slot and rate budget, later phases first (see scheduler.py).
+    With a context builder, calls after gather share a compact prefix.
+    Token usage and cost of every call are totalled in `usage`.
+    `policies` (keyed by agent role) retry calls and fall back to other models;
+    with `degrade`, failed tasks leave a partial council instead of failing it.
+    With a speculative policy, the `speculative_tasks` templates (chairman
+    draft, revise pass) overlap the final answer with the critiques.
+    """
+
+    def __init__(self, crew: Crew, phase_cache: Optional[PhaseCache] = None,
+                 consensus: Optional[ConsensusPolicy] = None, consensus_task: Optional[Task] = None,
+                 quorum: Optional[QuorumPolicy] = None, limiter: Optional[CallLimiter] = None,
+                 context: Optional[ContextBuilder] = None, usage: Optional[UsageTracker] = None,
+                 phase_names: Optional[List[str]] = None, policies: Optional[Dict[str, AgentPolicy]] = None,
+                 degrade: bool = False, speculative: Optional[SpeculativePolicy] = None,
+                 speculative_tasks: Optional[Tuple[Task, Task]] = None):
+        self.crew = crew
+        self.phase_names = list(phase_names or PHASE_NAMES)
+        self.phase_cache = phase_cache
+        self.consensus = consensus
+        self.consensus_task = consensus_task
+        self.quorum = quorum
+        self.limiter = limiter
+        self.context = context
+        self.usage = usage or UsageTracker()
+        self.policies = dict(policies or {})
+        self.degrade = degrade
+        self.speculative = speculative
+        self.speculative_tasks = speculative_tasks
+        self._rng = random.Random()
+        self._resilience_counts = {"retries": 0, "fallbacks": 0, "failed_tasks": 0, "degraded": 0}
+        self._context_counts = {"councils": 0, "tokens_before": 0, "tokens_after": 0,
+                                "deduped_sentences": 0, "truncated": 0}
+        self._quorum_counts: Dict[str, Dict[str, int]] = {}
+        # Moving average of each phase's wall time on full runs, to estimate fast-path savings
+        self._phase_avg: Dict[str, float] = {}
+        self._consensus_counts = {"councils": 0, "fast_path": 0, "calls_saved": 0, "latency_saved_s": 0.0}
+        self._critique_counts = {"councils": 0, "critiques": 0, "invalid": 0, "dropped": 0, "tokens_raw": 0, "tokens_merged": 0}
+        self._speculative_counts = {"councils": 0, "accepted": 0, "revised": 0, "failed": 0,
+                                    "latency_saved_s": 0.0, "extra_tokens": 0}
+
+    async def _execute(self, task: CouncilTask, inputs: Dict[str, str],
+                       listener: Optional[Listener] = None, stream: bool = False) -> None:
+        with get_tracer().span(f"task {task.name}", agent=task.agent.role, model=task.agent.llm.model,
+                               phase=task.phase_label) as span:
+            await self._execute_traced(task, inputs, listener, stream)
+            span.set(cached=task.cached)
+
+    async def _execute_traced(self, task: CouncilTask, inputs: Dict[str, str],
+                              listener: Optional[Listener], stream: bool) -> None:
+        messages = task.messages or task.render(inputs)
+        raw, key = task.restored, None
+        task.cached = raw is not None
+        if raw is None and self.phase_cache is not None:
+            key = PhaseCache.key(
+                role=task.agent.role,
+                model=task.agent.llm.model,
+                prompt=task.persona(inputs) + "\n" + task.task_prompt(inputs),
+                context=json.dumps(task.messages) if task.messages else task.context_text(),
+            )
+            raw = await self.phase_cache.get(key, task.name)
+            task.cached = raw is not None
+        if raw is None:
+            raw = await self._call_with_retry(task, messages, listener, stream)
+            # The key names the agent's own model: a fallback model's reply is not stored under it
+            if key is not None and task.model == task.agent.llm.model:
+                await self.phase_cache.set(key, str(raw))
+        model = task.template.output_pydantic
+        structured = parse_structured(str(raw), model) if model is not None else None
+        if model is not None and structured is None:
+            logger.warning("Council task %s: reply is not a valid %s, kept as text", task.name, model.__name__)
+        task.output = TaskOutput(
+            name=task.name,
+            description=messages[-1]["content"],
+            agent=task.agent.role,
+            raw=str(raw),
+            pydantic=structured,
+            json_dict=structured.model_dump() if structured is not None else None,
+            output_format=OutputFormat.PYDANTIC if structured is not None else OutputFormat.RAW,
+        )
+        if listener is not None:
+            await listener({
+                "event": "task", "index": task.index, "task": task.name,
+                "agent": task.agent.role, "output": task.output.raw, "cached": task.cached,
+            })
+
+    async def _call_with_retry(self, task: CouncilTask, messages: List[Dict[str, str]],
+                               listener: Optional[Listener], stream: bool) -> str:
+        """Call the agent's model, retrying with backoff, then each fallback model in turn"""
+        policy = self.policies.get(task.agent.role)
+        retry = policy.retry if policy is not None else NO_RETRY
+        chain = [task.agent.llm] + (list(policy.fallbacks) if policy is not None else [])
+        errors: List[Tuple[str, BaseException]] = []
+        for position, llm in enumerate(chain):
+            if position > 0:
+                self._resilience_counts["fallbacks"] += 1
+            for attempt in range(retry.attempts):
+                if attempt > 0:
+                    self._resilience_counts["retries"] += 1
+                    await asyncio.sleep(retry.delay(attempt, self._rng))
+                task.attempts += 1
+                try:
+                    return await self._call(task, llm, messages, listener, stream)
+                except ProviderSaturated:
+                    raise  # backpressure (scheduler.py): the request backs off, no retry or fallback
+                except Exception as e:
+                    if task.streamed or len(chain) * retry.attempts == 1:
+                        raise
+                    logger.warning("Council task %s: %s call %d failed: %s", task.name, llm.model, attempt + 1, e)
+                    errors.append((llm.model, e))
+        raise TaskFailed(task.name, errors)
+
+    async def _call(self, task: CouncilTask, llm: Any, messages: List[Dict[str, str]],
+                    listener: Optional[Listener], stream: bool) -> str:
+        """One model call, in a CallLimiter slot, traced and recorded in task.call"""
+        reported: Dict[str, int] = {}
+        tracer = get_tracer()
+        wait_start = time.perf_counter()
+        async with self._call_slot(task, llm, messages) as call:
+            call_start = time.perf_counter()
+            if self.limiter is not None:
+                tracer.add_span("llm.queue", wait_start, call_start, model=llm.model)
+            with tracer.span("llm.call", model=llm.model, stream=stream) as span:
+                if stream and listener is not None:
+                    raw = await self._stream(task, llm, messages, listener, reported)
+                else:
+                    raw = await acall_llm(llm, messages, task.template, task.agent, reported)
+                span.set(**reported)
+            latency = time.perf_counter() - call_start
+            call.finish(str(raw))
+        task.call = self._call_record(task, llm.model, messages, str(raw), latency, reported)
+        task.model = llm.model
+        return raw
+
+    def _call_slot(self, task: CouncilTask, llm: Any, messages: List[Dict[str, str]]):
+        if self.limiter is None:
+            return nullcontext(CallHandle(None, 0, 0))
+        prompt = "\n".join(message["content"] for message in messages)
+        return self.limiter.slot(llm.model, prompt, priority=-task.phase)
+
+    def _call_record(self, task: CouncilTask, model: str, messages: List[Dict[str, str]], raw: str,
+                     latency: float, reported: Dict[str, int]) -> CallRecord:
+        prompt_tokens = reported.get("prompt_tokens", message_tokens(messages))
+        completion_tokens = reported.get("completion_tokens", estimate_tokens(raw))
+        return CallRecord(
+            task=task.name,
+            agent=task.agent.role,
+            model=model,
+            phase=task.phase_label,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency=latency,
+            cost=self.usage.cost(model, prompt_tokens, completion_tokens),
+            estimated=not reported,
+        )
+
+    async def _stream(self, task: CouncilTask, llm: Any, messages: List[Dict[str, str]], listener: Listener,
+                      usage: Optional[Dict[str, int]] = None) -> str:
+        parts: List[str] = []
+        async for delta in astream_llm(llm, messages, task.template, task.agent, usage):
+            parts.append(delta)
+            task.streamed = True
+            await listener({"event": "token", "index": task.index, "task": task.name, "delta": delta})
+        return "".join(parts)
+
+    async def _run_phase(self, name: str, phase: List[CouncilTask], inputs: Dict[str, str],
+                         listener: Optional[Listener], stream: bool, timings: Dict[str, float],
+                         report: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                         faults: Optional[Dict[str, Dict[str, Any]]] = None) -> List[CouncilTask]:
+        """Run one phase; returns the tasks that produced an output"""
+        phase_start = time.perf_counter()
+        with get_tracer().span(f"phase {name}", tasks=len(phase)) as span:
+            if (self.quorum is None or len(phase) == 1) and not self.degrade:
+                # gather() re-raises the first task exception, failing the run like crew.kickoff
+                await asyncio.gather(*(self._execute(task, inputs, listener, stream) for task in phase))
+                answered = phase
+            elif self.quorum is None or len(phase) == 1:
+                outcomes = await asyncio.gather(*(self._execute(task, inputs, listener, stream) for task in phase),
+                                                return_exceptions=True)
+                failed = [(task, error) for task, error in zip(phase, outcomes) if isinstance(error, BaseException)]
+                _raise_saturated(error for _, error in failed)
+                self._record_failures(name, failed, faults)
+                answered = [task for task, error in zip(phase, outcomes) if not isinstance(error, BaseException)]
+                if not answered and failed and self._required(phase):
+                    raise failed[0][1]
+            else:
+                answered = await self._run_quorum(name, phase, inputs, listener, stream, report, faults)
+            span.set(answered=len(answered))
+        timings[name] = time.perf_counter() - phase_start
+        return answered
+
+    def _required(self, phase: List[CouncilTask]) -> bool:
+        """Whether the council cannot go on without this phase: the drafts, or any phase without `degrade`"""
+        return not self.degrade or phase[0].phase == 0
+
+    def _record_failures(self, name: str, failed: List[Tuple[CouncilTask, BaseException]],
+                         faults: Optional[Dict[str, Dict[str, Any]]]) -> None:
+        for task, error in failed:
+            logger.warning("Council task %s failed: %s", task.name, error)
+            self._resilience_counts["failed_tasks"] += 1
+            if faults is not None:
+                phase = faults.setdefault(name, {})
+                phase.setdefault("failed", []).append(task.name)
+                phase.setdefault("errors", {})[task.name] = str(error)
+
+    async def _run_quorum(self, name: str, phase: List[CouncilTask], inputs: Dict[str, str],
+                          listener: Optional[Listener], stream: bool,
+                          report: Optional[Dict[str, Dict[str, List[str]]]],
+                          faults: Optional[Dict[str, Dict[str, Any]]] = None) -> List[CouncilTask]:
+        """Wait for k of the phase's tasks (each under its deadline), then cancel the stragglers"""
+        pending = {
+            asyncio.create_task(asyncio.wait_for(
+                self._execute(task, inputs, listener, stream),
+                self.quorum.timeout_for(task.agent.llm.model),
+            )): task
+            for task in phase
+        }
+        needed = self.quorum.needed(len(phase))
+        outcome: Dict[str, List[CouncilTask]] = {"answered": [], "timed_out": [], "failed": []}
+        errors: List[BaseException] = []
+        try:
+            while pending and len(outcome["answered"]) < needed:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = pending.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        outcome["answered"].append(task)
+                    elif isinstance(error, asyncio.TimeoutError):
+                        outcome["timed_out"].append(task)
+                    elif isinstance(error, ProviderSaturated):
+                        raise error
+                    else:
+                        self._record_failures(name, [(task, error)], faults)
+                        outcome["failed"].append(task)
+                        errors.append(error)
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        outcome["cancelled"] = list(pending.values())
+
+        for key, tasks in outcome.items():
+            for task in tasks:
+                counts = self._quorum_counts.setdefault(task.name, {})
+                counts[key] = counts.get(key, 0) + 1
+        if report is not None:
+            report[name] = {key: [task.name for task in tasks] for key, tasks in outcome.items()}
+
+        if not outcome["answered"] and self._required(phase):
+            if errors:
+                raise errors[0]
+            raise asyncio.TimeoutError(f"No task of the {name} phase answered before its deadline")
+        return sorted(outcome["answered"], key=lambda task: task.index)
+
+    async def akickoff(self, inputs: Dict[str, str], listener: Optional[Listener] = None,
+                       crew: Optional[Crew] = None, consensus_task: Optional[Task] = None,
+                       phase_names: Optional[List[str]] = None,
+                       restored: Optional[Dict[str, str]] = None,
+                       speculative_tasks: Optional[Tuple[Task, Task]] = None) -> CouncilResult:
+        """Run one council; `listener` (optional) sees every finished task and the final phase's tokens
+
+        `crew` (with its own `consensus_task`, `phase_names` and `speculative_tasks`) runs another
+        council shape than the engine's default crew, sharing the engine's caches, limits and stats.
+        `restored` maps task names to outputs of an interrupted run of the same council:
+        those tasks are not called again.
+        """
+        if crew is None:
+            crew, consensus_task, phase_names = self.crew, self.consensus_task, self.phase_names
+            speculative_tasks = self.speculative_tasks
+        names = list(phase_names or PHASE_NAMES)
+        restored = restored or {}
+        graph = build_graph(crew)
+        for task in graph:
+            task.restored = restored.get(task.name)
+        phases = council_phases(graph, context=lambda task: task.context)
+
+        timings: Dict[str, float] = {}
+        executed: List[CouncilTask] = []
+        final_answer: Optional[str] = None
+        fast_path: Optional[Dict[str, Any]] = None
+        report: Optional[Dict[str, Dict[str, List[str]]]] = {} if self.quorum is not None else None
+        faults: Dict[str, Dict[str, Any]] = {}
+        answered: List[CouncilTask] = []
+        prefix: Optional[SharedPrefix] = None
+        speculation: Optional[_Speculation] = None
+        speculative: Optional[Dict[str, Any]] = None
+        merged: Optional[Tuple[int, int]] = None  # tokens of the raw and the merged critiques the chairman got
+        try:
+            for index, phase in enumerate(phases):
+                stream = index == len(phases) - 1
+                name = phase_name(index, names)
+                for task in phase:
+                    task.phase, task.phase_label = index, name
+                if index > 0 and (self.quorum is not None or self.degrade):
+                    phase = self._adapt_contexts(name, phase, report, faults)
+                if index > 0:
+                    merged = self._merge_critiques(phase, inputs) or merged
+                if prefix is not None:
+                    for task in phase:
+                        task.messages = self.context.render(task, prefix, inputs, name)
+                if speculation is not None and stream:
+                    answered, speculative = await self._settle(speculation, name, phase, inputs, listener,
+                                                               timings, prefix, faults)
+                else:
+                    answered = await self._run_phase(name, phase, inputs, listener, stream, timings, report, faults)
+                executed.extend(answered)
+
+                if index == 0 and self.context is not None and len(phases) > 1:
+                    prefix = self.context.prefix(inputs, [task for task in phase if task.output is not None])
+                if index == 0 and self.consensus is not None and len(phases) > 2:
+                    fast_path, final_answer = await self._consensus(graph, phases, inputs, listener, timings,
+                                                                    executed, consensus_task, prefix, names,
+                                                                    restored, faults)
+                    if fast_path["fired"]:
+                        break
+                if index == 0 and self.speculative is not None and speculative_tasks is not None and len(phases) > 2:
+                    speculation = self._speculate(graph, phases, inputs, listener, speculative_tasks, prefix,
+                                                  names, restored)
+        finally:
+            if speculation is not None and not speculation.future.done():
+                speculation.future.cancel()  # the council failed before the draft was needed
+
+        fallback: Optional[str] = None  # draft standing in for a final phase that produced nothing
+        if fast_path is None or not fast_path["fired"]:
+            # A speculative final phase only waited for the tail of the draft: no estimate of a full one
+            skip = (phase_name(len(phases) - 1, names), SPECULATIVE_PHASE) if speculation is not None else ()
+            self._record_full_run({name: seconds for name, seconds in timings.items() if name not in skip})
+            if speculative is not None and "fallback" in speculative:
+                fallback = speculative["fallback"]
+            if not answered:
+                drafts = [task for task in phases[0] if task.output is not None]
+                best = drafts[most_central([task.output.raw for task in drafts])]
+                final_answer, fallback = best.output.raw, best.name
+        elif "fallback" in fast_path:
+            fallback = fast_path["fallback"]
+        recovered = {task.name: {"attempts": task.attempts, "model": task.model}
+                     for task in executed if task.attempts > 1}
+        degraded = degradation_report(faults, recovered, f"draft:{fallback}" if fallback else None)
+        if degraded is not None and degraded["partial"]:
+            self._resilience_counts["degraded"] += 1
+
+        context_tokens = self._context_tokens(executed, inputs)
+        self._record_context(context_tokens, prefix)
+        usage = [task.call for task in executed if task.call is not None]
+        self.usage.record(usage)
+
+        return CouncilResult(
+            final_answer=final_answer if final_answer is not None else executed[-1].output.raw,
+            tasks=executed,
+            phase_timings=timings,
+            fast_path=fast_path,
+            quorum=report,
+            context_tokens=context_tokens,
+            usage=usage,
+            degraded=degraded,
+            speculative=speculative,
+            critiques=self._critique_report(executed, inputs, merged),
+        )
+
+    # ============================================
+    # Context accounting
+    # ============================================
+    def _context_tokens(self, executed: List[CouncilTask], inputs: Dict[str, str]) -> Dict[str, Dict[str, int]]:
+        """Estimated input tokens per phase: crewAI-style rendering ("before") vs what was sent ("after")"""
+        tokens: Dict[str, Dict[str, int]] = {}
+        for task in executed:
+            plain = message_tokens(task.render(inputs))
+            counts = tokens.setdefault(task.phase_label, {"before": 0, "after": 0})
+            counts["before"] += plain
+            counts["after"] += message_tokens(task.messages) if task.messages else plain
+        return tokens
+
+    def _record_context(self, tokens: Dict[str, Dict[str, int]], prefix: Optional[SharedPrefix]) -> None:
+        counts = self._context_counts
+        counts["councils"] += 1
+        counts["tokens_before"] += sum(phase["before"] for phase in tokens.values())
+        counts["tokens_after"] += sum(phase["after"] for phase in tokens.values())
+        if prefix is not None:
+            counts["deduped_sentences"] += prefix.deduped_sentences
+            counts["truncated"] += int(prefix.truncated)
+
+    def context_stats(self) -> Dict[str, Any]:
+        """Input tokens sent vs plain rendering across all councils, plus compaction counters"""
+        counts = self._context_counts
+        before, after = counts["tokens_before"], counts["tokens_after"]
+        return {
+            "enabled": self.context is not None,
+            "prefix_budget": self.context.prefix_budget if self.context else None,
+            "phase_budgets": dict(self.context.phase_budgets) if self.context else None,
+            **counts,
+            "saved_ratio": round(1 - after / before, 3) if before else 0.0,
+        }
+
+    def _adapt_contexts(self, name: str, phase: List[CouncilTask], report: Optional[Dict[str, Dict[str, List[str]]]],
+                        faults: Optional[Dict[str, Dict[str, Any]]] = None) -> List[CouncilTask]:
+        """Drop upstream tasks that never answered; skip tasks left with no context at all"""
+        runnable = []
+        skipped = []
+        for task in phase:
+            had_context = bool(task.context)
+            task.context = [t for t in task.context if t.output is not None]
+            if had_context and not task.context:
+                skipped.append(task.name)
+            else:
+                runnable.append(task)
+        if skipped and report is not None:
+            report.setdefault(name, {})["skipped"] = skipped
+            for task_name in skipped:
+                counts = self._quorum_counts.setdefault(task_name, {})
+                counts["skipped"] = counts.get("skipped", 0) + 1
+        if skipped and faults is not None and self.degrade:
+            faults.setdefault(name, {})["skipped"] = skipped
+        if not runnable and not self.degrade:
+            raise RuntimeError(f"No task of the {name} phase has any upstream output to work from")
+        return runnable
+
+    # ============================================
+    # Consensus fast path
+    # ============================================
+    async def _consensus(self, graph: List[CouncilTask], phases: List[List[CouncilTask]],
+                         inputs: Dict[str, str], listener: Optional[Listener], timings: Dict[str, float],
+                         executed: List[CouncilTask], consensus_task: Optional[Task],
+                         prefix: Optional[SharedPrefix] = None, names: List[str] = PHASE_NAMES,
+                         restored: Optional[Dict[str, str]] = None,
+                         faults: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Score the gather drafts and, if they agree, finish the council without critiques
+
+        Returns (fast_path report, final answer or None to use the last executed task).
+        """
+        drafts = [task for task in phases[0] if task.output is not None]
+        decision = self.consensus.evaluate([task.output.raw for task in drafts])
+        self._consensus_counts["councils"] += 1
+        report: Dict[str, Any] = {
+            "fired": False,
+            "agreement": decision.agreement if decision else None,
+            "threshold": self.consensus.threshold,
+            "action": self.consensus.action,
+        }
+        if decision is None or not decision.agreed:
+            return report, None
+
+        skipped = [phase_name(i, names) for i in range(1, len(phases))]
+        final = phase_name(len(phases) - 1, names)
+        final_answer = None
+        if self.consensus.action == MAJORITY or consensus_task is None:
+            report["action"] = MAJORITY
+            final_answer = drafts[decision.majority_index].output.raw
+            extra_time = 0.0
+        else:
+            synthesis = CouncilTask(
+                name=consensus_task.name,
+                template=consensus_task,
+                agent=consensus_task.agent,
+                index=len(graph),
+                phase=len(phases) - 1,
+                phase_label=final,
+                context=list(drafts),
+                restored=(restored or {}).get(consensus_task.name),
+            )
+            if prefix is not None:
+                synthesis.messages = self.context.render(synthesis, prefix, inputs, final)
+            extra_time = 0.0
+            if await self._run_phase(final, [synthesis], inputs, listener, True, timings, faults=faults):
+                executed.append(synthesis)
+                extra_time = timings[final]
+            else:
+                # The synthesis failed (degrade): the agreeing drafts' majority answer stands in
+                report.update(action=MAJORITY, fallback=drafts[decision.majority_index].name)
+                final_answer = drafts[decision.majority_index].output.raw
+
+        calls_saved = sum(len(phase) for phase in phases[1:]) - (len(executed) - len(drafts))
+        report.update(fired=True, calls_saved=calls_saved, skipped_phases=skipped)
+        if all(name in self._phase_avg for name in skipped):
+            saved = max(0.0, sum(self._phase_avg[name] for name in skipped) - extra_time)
+            report["est_latency_saved_s"] = round(saved, 3)
+            self._consensus_counts["latency_saved_s"] += saved
+        self._consensus_counts["fast_path"] += 1
+        self._consensus_counts["calls_saved"] += calls_saved
+        return report, final_answer
+
+    def _record_full_run(self, timings: Dict[str, float]) -> None:
+        for name, seconds in timings.items():
+            previous = self._phase_avg.get(name)
+            self._phase_avg[name] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+
+    def consensus_stats(self) -> Optional[Dict[str, Any]]:
+        """How often the fast path fired and what it saved (None when consensus mode is off)"""
+        if self.consensus is None:
+            return None
+        counts = self._consensus_counts
+        return {
+            "threshold": self.consensus.threshold,
+            "method": self.consensus.method,
+            "action": self.consensus.action,
+            "councils": counts["councils"],
+            "fast_path": counts["fast_path"],
+            "fire_rate": round(counts["fast_path"] / counts["councils"], 3) if counts["councils"] else 0.0,
+            "calls_saved": counts["calls_saved"],
+            "est_latency_saved_s": round(counts["latency_saved_s"], 3),
+        }
+
+    # ============================================
+    # Structured critiques
+    # ============================================
+    @staticmethod
+    def _structured_critiques(tasks: List[CouncilTask]) -> List[CouncilTask]:
+        return [task for task in tasks if task.output is not None and isinstance(task.output.pydantic, CritiqueReport)]
+
+    @staticmethod
+    def _draft_labels(critiques: List[CouncilTask], inputs: Dict[str, str]) -> Dict[str, str]:
+        return {draft.name: interpolate_only(draft.agent.role, inputs) for task in critiques for draft in task.context}
+
+    def _merge_critiques(self, phase: List[CouncilTask], inputs: Dict[str, str]) -> Optional[Tuple[int, int]]:
+        """Swap the structured critiques in each task's context for one merged block (critique.py)
+
+        Returns the estimated tokens of the raw and the merged critiques, None when there were none.
+        """
+        tokens = None
+        for task in phase:
+            critiques = self._structured_critiques(task.context)
+            if not critiques:
+                continue
+            summaries, _ = summarize(
+                [(critique.name, critique.context, critique.output.pydantic) for critique in critiques],
+                self._draft_labels(critiques, inputs))
+            text = merged_text(summaries)
+            first = critiques[0]
+            merged = CouncilTask(
+                name=MERGED_CRITIQUES,
+                template=first.template,
+                agent=None,  # written by no single agent (ContextBuilder labels it by name only)
+                index=first.index,
+                phase=first.phase,
+                phase_label=first.phase_label,
+                output=TaskOutput(name=MERGED_CRITIQUES, description=first.output.description, agent="", raw=text),
+            )
+            position = task.context.index(first)
+            rest = [t for t in task.context if t not in critiques]
+            task.context = rest[:position] + [merged] + rest[position:]
+            tokens = (sum(estimate_tokens(critique.output.raw) for critique in critiques), estimate_tokens(text))
+        return tokens
+
+    def _critique_report(self, executed: List[CouncilTask], inputs: Dict[str, str],
+                         merged: Optional[Tuple[int, int]]) -> Optional[Dict[str, Any]]:
+        """The result's `critiques` field: drafts ranked by score (None without structured critique phases)"""
+        expected = [task for task in executed if task.template.output_pydantic is CritiqueReport]
+        if not expected:
+            return None
+        critiques = self._structured_critiques(expected)
+        summaries, dropped = summarize(
+            [(critique.name, critique.context, critique.output.pydantic) for critique in critiques],
+            self._draft_labels(critiques, inputs))
+        invalid = [task.name for task in expected if task not in critiques]
+        for name, answers in dropped.items():
+            logger.warning("Council task %s: dropped reviews of answers %s (not given, or reviewed twice)",
+                           name, answers)
+        counts = self._critique_counts
+        counts["councils"] += 1
+        counts["critiques"] += len(expected)
+        counts["invalid"] += len(invalid)
+        counts["dropped"] += sum(len(answers) for answers in dropped.values())
+        report: Dict[str, Any] = {
+            "ranking": ranking(summaries),
+            "reviews": {critique.name: critique.output.json_dict for critique in critiques},
+            "invalid": invalid,
+            "dropped": dropped,
+        }
+        if merged is not None:
+            counts["tokens_raw"] += merged[0]
+            counts["tokens_merged"] += merged[1]
+            report["chairman_tokens"] = {"raw": merged[0], "merged": merged[1]}
+        return report
+
+    def critique_stats(self) -> Dict[str, Any]:
+        """Structured critiques so far: replies that failed validation, reviews dropped, and the chairman tokens merging saved"""
+        counts = self._critique_counts
+        raw = counts["tokens_raw"]
+        return {**counts, "saved_ratio": round(1 - counts["tokens_merged"] / raw, 3) if raw else 0.0}
+
+    # ============================================
+    # Speculative chairman
+    # ============================================
+    def _speculate(self, graph: List[CouncilTask], phases: List[List[CouncilTask]], inputs: Dict[str, str],
+                   listener: Optional[Listener], templates: Tuple[Task, Task], prefix: Optional[SharedPrefix],
+                   names: List[str], restored: Dict[str, str]) -> "_Speculation":
+        """Start the chairman's draft from the gather drafts; it runs while the critiques do"""
+        final = phase_name(len(phases) - 1, names)
+        draft, revise = (
+            CouncilTask(
+                name=template.name,
+                template=template,
+                agent=template.agent,
+                index=len(graph) + offset,
+                phase=len(phases) - 1,  # the limiter serves them like the final answer they stand in for
+                phase_label=final,
+                restored=restored.get(template.name),
+            )
+            for offset, template in enumerate(templates)
+        )
+        draft.context = [task for task in phases[0] if task.output is not None]
+        if prefix is not None:
+            draft.messages = self.context.render(draft, prefix, inputs, final)
+        return _Speculation(draft, revise, asyncio.create_task(self._draft(draft, inputs, listener)))
+
+    async def _draft(self, task: CouncilTask, inputs: Dict[str, str], listener: Optional[Listener]) -> Optional[float]:
+        """Run the speculative draft; its duration, or None when it failed (the final phase then runs as usual)"""
+        start = time.perf_counter()
+        try:
+            with get_tracer().span(f"phase {SPECULATIVE_PHASE}", tasks=1):
+                await self._execute(task, inputs, listener)
+        except Exception as e:
+            logger.warning("Speculative draft %s failed: %s", task.name, e)
+            return None
+        return time.perf_counter() - start
+
+    async def _settle(self, speculation: "_Speculation", name: str, phase: List[CouncilTask],
+                      inputs: Dict[str, str], listener: Optional[Listener], timings: Dict[str, float],
+                      prefix: Optional[SharedPrefix] = None,
+                      faults: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[List[CouncilTask], Dict[str, Any]]:
+        """The final phase once the critiques are in: keep the speculative draft or revise it
+
+        Returns (the tasks that produced an output, the result's `speculative` report).
+        """
+        start = time.perf_counter()
+        draft_s = await speculation.future
+        counts = self._speculative_counts
+        counts["councils"] += 1
+        if draft_s is None:
+            counts["failed"] += 1
+            answered = await self._run_phase(name, phase, inputs, listener, True, timings, faults=faults)
+            return answered, {"accepted": False, "failed": True}
+
+        draft = speculation.draft
+        final = phase[0] if phase else None  # None: no critique answered (degrade), nothing to address
+        critiques = [task for task in final.context if task.phase > 0] if final is not None else []
+        decision = self.speculative.evaluate(draft.output.raw, [task.output.raw for task in critiques])
+        answered = [draft]
+        report: Dict[str, Any] = {
+            "accepted": decision.accepted,
+            "coverage": decision.coverage,
+            "threshold": self.speculative.accept_threshold,
+        }
+        if decision.accepted:
+            counts["accepted"] += 1
+            if listener is not None:
+                # The draft was not streamed (it might have been revised): the answer arrives as one chunk
+                await listener({"event": "token", "index": draft.index, "task": draft.name,
+                                "delta": draft.output.raw})
+        else:
+            counts["revised"] += 1
+            revise = speculation.revise
+            revise.context = [draft] + critiques
+            if prefix is not None:
+                revise.messages = self.context.render(revise, prefix, inputs, name)
+            revised = await self._run_phase(name, [revise], inputs, listener, True, timings, faults=faults)
+            answered.extend(revised)
+            if not revised:
+                report["fallback"] = draft.name  # the revise pass failed (degrade): the draft stands
+        wait_s = time.perf_counter() - start
+        timings[SPECULATIVE_PHASE] = draft_s
+        timings[name] = wait_s
+
+        # The final answer call this replaced: its prompt, and a completion about as long as the answer
+        spent = sum(task.call.prompt_tokens + task.call.completion_tokens for task in answered if task.call)
+        replaced = 0
+        if final is not None:
+            answer = answered[-1]
+            replaced = message_tokens(final.messages or final.render(inputs)) + (
+                answer.call.completion_tokens if answer.call else estimate_tokens(answer.output.raw))
+        # Without speculation the final phase would have taken about as long as the draft did
+        saved = draft_s - wait_s
+        report.update(
+            draft_s=round(draft_s, 3),
+            wait_s=round(wait_s, 3),
+            est_latency_saved_s=round(saved, 3),
+            extra_calls=len(answered) - (1 if final is not None else 0),
+            extra_tokens=spent - replaced,
+        )
+        counts["latency_saved_s"] += saved
+        counts["extra_tokens"] += spent - replaced
+        return answered, report
+
+    def speculative_stats(self) -> Optional[Dict[str, Any]]:
+        """How often speculative drafts stood or were revised, the latency they cut and the tokens they cost"""
+        if self.speculative is None:
+            return None
+        counts = self._speculative_counts
+        settled = counts["accepted"] + counts["revised"]
+        return {
+            "accept_threshold": self.speculative.accept_threshold,
+            "councils": counts["councils"],
+            "accepted": counts["accepted"],
+            "revised": counts["revised"],
+            "failed": counts["failed"],
+            "accept_rate": round(counts["accepted"] / settled, 3) if settled else 0.0,
+            "est_latency_saved_s": round(counts["latency_saved_s"], 3),
+            "extra_tokens": counts["extra_tokens"],
+        }
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Retries, fallbacks, failed tasks and degraded councils so far, and the per-agent policies"""
+        return {
+            "degrade": self.degrade,
+            **self._resilience_counts,
+            "policies": {
+                role: {"attempts": policy.retry.attempts, "backoff_s": policy.retry.backoff,
+                       "fallbacks": [llm.model for llm in policy.fallbacks]}
+                for role, policy in self.policies.items()
+            },
+        }
+
+    def quorum_stats(self) -> Optional[Dict[str, Any]]:
+        """Per-task outcome counts (answered/cancelled/timed_out/failed/skipped); None when quorum mode is off"""
+        if self.quorum is None:
+            return None
+        return {
+            "k": self.quorum.k,
+            "timeout_s": self.quorum.timeout,
+            "model_timeouts_s": self.quorum.model_timeouts,
+            "by_task": {name: dict(counts) for name, counts in sorted(self._quorum_counts.items())},
+        }
+
+    def kickoff(self, inputs: Dict[str, str], listener: Optional[Listener] = None,
+                crew: Optional[Crew] = None, consensus_task: Optional[Task] = None,
+                phase_names: Optional[List[str]] = None,
+                restored: Optional[Dict[str, str]] = None,
+                speculative_tasks: Optional[Tuple[Task, Task]] = None) -> CouncilResult:
+        """Blocking wrapper around akickoff() for the CLI and benchmarks"""
+        return asyncio.run(self.akickoff(inputs, listener, crew, consensus_task, phase_names, restored,
+                                         speculative_tasks))
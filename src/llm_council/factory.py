@@ -0,0 +1,183 @@
+"""
+Build the council crew once and hand out cheap, isolated runs per request
+
+LlmCouncil().crew() re-reads agents.yaml/tasks.yaml and validates 4 Agents,
+7 Tasks and a Crew. crewAI's @agent/@task memoize caches are also keyed on
+the LlmCouncil instance, so building one per request keeps every past crew
+alive. The factory does that work once; PARALLEL runs share the template crew
+through CouncilEngine, which keeps all per-request state in its own graph.
+
+Per-request council shapes (Topology.override) get their own template crew,
+built once and kept in a small LRU; they share the engine and its caches.
+With a Recorder (recording.py) every crew's LLMs record or replay their calls.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from crewai import Crew, Task
+
+try:
+    from .cache import PhaseCache
+    from .consensus import ConsensusPolicy
+    from .context import ContextBuilder
+    from .crew import LlmCouncil
+    from .recording import Recorder
+    from .scheduler import CallLimiter
+    from .speculative import SpeculativePolicy
+    from .topology import Topology
+    from .tracing import get_tracer
+    from .usage import UsageTracker
+    from .engine import PARALLEL, SEQUENTIAL, CouncilEngine, CouncilResult, Listener, QuorumPolicy, run_in_thread
+except ImportError:
+    from cache import PhaseCache
+    from consensus import ConsensusPolicy
+    from context import ContextBuilder
+    from crew import LlmCouncil
+    from recording import Recorder
+    from scheduler import CallLimiter
+    from speculative import SpeculativePolicy
+    from topology import Topology
+    from tracing import get_tracer
+    from usage import UsageTracker
+    from engine import PARALLEL, SEQUENTIAL, CouncilEngine, CouncilResult, Listener, QuorumPolicy, run_in_thread
+
+
+def council_fingerprint(crew: Crew) -> str:
+    """Short hash of every prompt, persona and model id in the crew (changes when the council does)"""
+    parts = [
+        [task.name, task.description, task.expected_output,
+         task.agent.role, task.agent.goal, task.agent.backstory, task.agent.llm.model]
+        for task in crew.tasks
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()[:16]
+
+
+@dataclass
+class CouncilVariant:
+    """A template crew for one council topology"""
+    topology: Topology
+    template: Crew
+    consensus_task: Optional[Task]
+    fingerprint: str
+    speculative_tasks: Optional[Tuple[Task, Task]] = None  # speculative chairman draft and revise pass
+
+
+class CouncilFactory:
+    """Owns the template crew and the engine that runs it"""
+
+    def __init__(self, llms: Optional[Dict[str, object]] = None, phase_cache: Optional[PhaseCache] = None,
+                 consensus: Optional[ConsensusPolicy] = None, quorum: Optional[QuorumPolicy] = None,
+                 limiter: Optional[CallLimiter] = None, context: Optional[ContextBuilder] = None,
+                 usage: Optional[UsageTracker] = None, topology: Optional[Topology] = None,
+                 max_variants: int = 32, recorder: Optional[Recorder] = None, degrade: bool = False,
+                 speculative: Optional[SpeculativePolicy] = None):
+        self.llms = llms
+        self.recorder = recorder
+        council = self._council(topology)
+        self.topology = council.topology
+        self.template = council.crew()
+        self.engine = CouncilEngine(
+            self.template,
+            phase_cache=phase_cache,
+            consensus=consensus,
+            consensus_task=council.consensus_answer(),
+            quorum=quorum,
+            limiter=limiter,
+            context=context,
+            usage=usage,
+            phase_names=[phase.name for phase in self.topology.phases],
+            policies=council.policies(),
+            degrade=degrade,
+            speculative=speculative,
+            speculative_tasks=council.speculative_answers(),
+        )
+        self.fingerprint = council_fingerprint(self.template)
+        self.max_variants = max_variants
+        self._variants: "OrderedDict[str, CouncilVariant]" = OrderedDict()
+
+    def _council(self, topology: Optional[Topology]) -> LlmCouncil:
+        return LlmCouncil(llms=self.llms, topology=topology,
+                          wrap_llm=self.recorder.wrap if self.recorder is not None else None)
+
+    def variant(self, topology: Optional[Topology]) -> CouncilVariant:
+        """The template crew for `topology` (None or the default topology: the factory's own)"""
+        if topology is None or topology == self.topology:
+            return CouncilVariant(self.topology, self.template, self.engine.consensus_task, self.fingerprint,
+                                  self.engine.speculative_tasks)
+        key = topology.fingerprint()
+        variant = self._variants.get(key)
+        if variant is None:
+            council = self._council(topology)
+            template = council.crew()
+            for role, policy in council.policies().items():
+                self.engine.policies.setdefault(role, policy)
+            variant = CouncilVariant(topology, template, council.consensus_answer(), council_fingerprint(template),
+                                     council.speculative_answers())
+            self._variants[key] = variant
+            while len(self._variants) > self.max_variants:
+                self._variants.popitem(last=False)
+        self._variants.move_to_end(key)
+        return variant
+
+    def council_llms(self) -> List[Any]:
+        """Every LLM the configured council calls: the agents' own and their fallback models"""
+        llms = [agent.llm for agent in self.template.agents]
+        for policy in self.engine.policies.values():
+            llms.extend(policy.fallbacks)
+        return llms
+
+    def new_crew(self, topology: Optional[Topology] = None) -> Crew:
+        """A private crew for crewAI's own kickoff, which mutates tasks and agents"""
+        return self._council(topology or self.topology).crew()
+
+    def _kickoff_sequential(self, inputs: Dict[str, str], topology: Optional[Topology] = None) -> CouncilResult:
+        crew = self.new_crew(topology)
+        return CouncilResult(final_answer=str(crew.kickoff(inputs=inputs)), tasks=crew.tasks)
+
+    async def akickoff(self, inputs: Dict[str, str], mode: str = PARALLEL,
+                       listener: Optional[Listener] = None, topology: Optional[Topology] = None,
+                       restored: Optional[Dict[str, str]] = None) -> CouncilResult:
+        """Run one council on the caller's event loop (`topology`: a per-request council shape)
+
+        `restored`: task outputs of an interrupted run of this council, reused
+        instead of calling their models again (parallel mode only).
+        """
+        with get_tracer().span("council", mode=mode):
+            result = await self._akickoff(inputs, mode, listener, topology, restored)
+        if self.recorder is not None:
+            council = topology.as_override() if topology is not None and topology != self.topology else None
+            self.recorder.record_council(inputs, mode, str(result), council)
+        return result
+
+    async def _akickoff(self, inputs: Dict[str, str], mode: str, listener: Optional[Listener],
+                        topology: Optional[Topology], restored: Optional[Dict[str, str]] = None) -> CouncilResult:
+        if mode == PARALLEL:
+            if topology is None:
+                return await self.engine.akickoff(inputs, listener, restored=restored)
+            variant = self.variant(topology)
+            return await self.engine.akickoff(inputs, listener, variant.template, variant.consensus_task,
+                                              [phase.name for phase in topology.phases], restored,
+                                              variant.speculative_tasks)
+        if mode == SEQUENTIAL:
+            # crewAI's kickoff is blocking; keep it off the event loop (no per-task spans: crewAI runs it all)
+            with get_tracer().span("crew.kickoff"):
+                result = await run_in_thread(self._kickoff_sequential, inputs, topology)
+            if listener is not None:
+                # crewAI gives no progress hooks here, so report every task once it is all done
+                for index, task in enumerate(result.tasks):
+                    await listener({
+                        "event": "task", "index": index, "task": task.name,
+                        "agent": task.agent.role, "output": task.output.raw, "cached": False,
+                    })
+            return result
+        raise ValueError(f"Unknown council mode: {mode!r} (expected '{SEQUENTIAL}' or '{PARALLEL}')")
+
+    def kickoff(self, inputs: Dict[str, str], mode: str = PARALLEL,
+                listener: Optional[Listener] = None, topology: Optional[Topology] = None) -> CouncilResult:
+        """Run one council (blocking)"""
+        return asyncio.run(self.akickoff(inputs, mode, listener, topology))
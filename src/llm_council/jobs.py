@@ -0,0 +1,324 @@
+"""
+Asynchronous council jobs with a durable result store
+
+A council takes tens of seconds; when it runs inside one HTTP request a proxy
+timeout or a client disconnect throws the paid calls away. A job is submitted
+(POST /jobs), runs on a pool of worker tasks and is polled or streamed by id.
+
+JobStore keeps jobs and every finished task output in SQLite, written as each
+task completes. On start JobRunner re-queues the jobs a previous process left
+queued or running; their saved outputs are handed back to the engine
+(CouncilEngine.akickoff `restored`), so only the remaining tasks are called
+again. Outputs are only reused while the council configuration is the one
+they were produced with (the job's fingerprint). A job whose runs keep being
+interrupted (e.g. it takes the process down) fails after `max_attempts`
+instead of being re-queued forever.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from .cache import CachedAnswer
+except ImportError:
+    from cache import CachedAnswer
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    council TEXT,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    fingerprint TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+CREATE TABLE IF NOT EXISTS job_outputs (
+    job_id TEXT NOT NULL,
+    task TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    agent TEXT NOT NULL,
+    output TEXT NOT NULL,
+    cached INTEGER NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (job_id, task)
+);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    question: str
+    status: str
+    created: float
+    council: Optional[Dict[str, Any]] = None  # Topology.override() arguments, None for the configured council
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    attempts: int = 0  # runs started, > 1 after a resume
+    fingerprint: Optional[str] = None  # council configuration the saved outputs belong to
+    result: Optional[Dict[str, Any]] = None  # CachedAnswer fields plus "cache_hit"
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("fingerprint")
+        return data
+
+
+# ============================================
+# Store
+# ============================================
+class JobStore:
+    """Jobs and their per-task outputs in one SQLite file (":memory:" for a throwaway store)
+
+    Every write is its own short transaction; WAL mode keeps readers from
+    blocking on the writer, so the calls are cheap enough for the event loop.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def _execute(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self._lock, self._db:
+            return self._db.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Job:
+        data = dict(row)
+        for name in ("council", "result"):
+            if data[name] is not None:
+                data[name] = json.loads(data[name])
+        return Job(**data)
+
+    def create(self, question: str, council: Optional[Dict[str, Any]] = None) -> Job:
+        job = Job(id=uuid.uuid4().hex, question=question, status=QUEUED, created=time.time(), council=council)
+        self._execute("INSERT INTO jobs (id, question, council, status, created) VALUES (?, ?, ?, ?, ?)",
+                      (job.id, question, json.dumps(council) if council is not None else None, QUEUED, job.created))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._job(rows[0]) if rows else None
+
+    def start(self, job_id: str, fingerprint: str) -> None:
+        """Mark a job running; outputs saved under another council configuration are dropped"""
+        with self._lock, self._db:
+            row = self._db.execute("SELECT fingerprint FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is not None and row["fingerprint"] not in (None, fingerprint):
+                self._db.execute("DELETE FROM job_outputs WHERE job_id = ?", (job_id,))
+            self._db.execute("UPDATE jobs SET status = ?, started = ?, attempts = attempts + 1, fingerprint = ? "
+                             "WHERE id = ?", (RUNNING, time.time(), fingerprint, job_id))
+
+    def save_output(self, job_id: str, event: Dict[str, Any]) -> None:
+        """Persist one finished task (an engine "task" event); a restored task keeps its first save"""
+        self._execute("INSERT OR IGNORE INTO job_outputs (job_id, task, position, agent, output, cached, created) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                      (job_id, event["task"], event["index"], event["agent"], event["output"],
+                       int(event["cached"]), time.time()))
+
+    def outputs(self, job_id: str) -> List[Dict[str, Any]]:
+        """Saved task events of a job, in the order they finished"""
+        rows = self._execute("SELECT task, position, agent, output, cached FROM job_outputs WHERE job_id = ? "
+                             "ORDER BY created, position", (job_id,))
+        return [{"event": "task", "index": row["position"], "task": row["task"], "agent": row["agent"],
+                 "output": row["output"], "cached": bool(row["cached"])} for row in rows]
+
+    def finish(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._execute("UPDATE jobs SET status = ?, finished = ?, result = ?, error = NULL WHERE id = ?",
+                      (DONE, time.time(), json.dumps(result), job_id))
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._execute("UPDATE jobs SET status = ?, finished = ?, error = ? WHERE id = ?",
+                      (FAILED, time.time(), error, job_id))
+
+    def unfinished(self) -> List[str]:
+        """Ids of queued and running jobs, oldest first (what a restart has to pick up)"""
+        rows = self._execute("SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created", (QUEUED, RUNNING))
+        return [row["id"] for row in rows]
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs (and their outputs) that finished more than `older_than` seconds ago"""
+        cutoff = time.time() - older_than
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM job_outputs WHERE job_id IN "
+                             "(SELECT id FROM jobs WHERE status IN (?, ?) AND finished < ?)", (DONE, FAILED, cutoff))
+            return self._db.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished < ?",
+                                    (DONE, FAILED, cutoff)).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        return {row["status"]: row["n"] for row in
+                self._execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ============================================
+# Runner
+# ============================================
+# Receives the engine's progress events (engine.Listener)
+JobListener = Callable[[Dict[str, Any]], Awaitable[None]]
+# Runs one job: (job, restored task outputs, listener) -> (answer, cache hit)
+JobFunc = Callable[[Job, Dict[str, str], JobListener], Awaitable[Tuple[CachedAnswer, Optional[str]]]]
+# Held around each run of a job, e.g. an admission slot (api.py)
+JobAdmission = Callable[[Job], AsyncContextManager]
+
+
+class JobRunner:
+    """A pool of `workers` tasks running queued jobs, with live events for subscribers
+
+    `fingerprint(job)` identifies the council configuration a job runs with;
+    saved outputs are only restored into a run with the same fingerprint.
+    A job that has already started `max_attempts` runs is failed, not run again.
+    """
+
+    def __init__(self, store: JobStore, run: JobFunc, fingerprint: Callable[[Job], str], workers: int = 4,
+                 max_attempts: int = 3):
+        self.store = store
+        self.run = run
+        self.fingerprint = fingerprint
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.admit: Optional[JobAdmission] = None
+        self.resumed = 0
+        self.restored_tasks = 0
+        self.abandoned = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running: Set[str] = set()
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    def start(self, admit: Optional[JobAdmission] = None) -> None:
+        """Start the workers (on the running loop) and re-queue what a previous process left unfinished
+
+        `admit(job)` is held around each run of a job (None: jobs run as soon as a worker is free).
+        """
+        if self._tasks:
+            return
+        self.admit = admit
+        self._queue = asyncio.Queue()
+        for job_id in self.store.unfinished():
+            self.resumed += 1
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; interrupted jobs stay "running" in the store and resume on the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, question: str, council: Optional[Dict[str, Any]] = None) -> Job:
+        if self._queue is None:
+            raise RuntimeError("JobRunner.start() has not been called")
+        job = self.store.create(question, council)
+        self._queue.put_nowait(job.id)
+        return job
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Live events of a job: engine "task"/"token" events, then one "final" or "error" event"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(job_id, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._subscribers.pop(job_id, None)
+
+    def _publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(job_id, []):
+            queue.put_nowait(event)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("Job %s crashed", job_id)
+
+    async def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if job is None or job.status in (DONE, FAILED):
+            return
+        if job.attempts >= self.max_attempts:
+            self.abandoned += 1
+            error = f"Gave up after {job.attempts} interrupted attempts"
+            logger.warning("Job %s: %s", job_id, error)
+            self.store.fail(job_id, error)
+            self._publish(job_id, {"event": "error", "detail": error})
+            return
+        async with self.admit(job) if self.admit is not None else nullcontext():
+            await self._attempt(job)
+
+    async def _attempt(self, job: Job) -> None:
+        job_id = job.id
+        self.store.start(job_id, self.fingerprint(job))
+        restored = {event["task"]: event["output"] for event in self.store.outputs(job_id)}
+        self.restored_tasks += len(restored)
+        self._running.add(job_id)
+
+        async def listener(event: Dict[str, Any]) -> None:
+            if event["event"] == "task":
+                self.store.save_output(job_id, event)
+            self._publish(job_id, event)
+
+        try:
+            answer, cache_hit = await self.run(job, restored, listener)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.store.fail(job_id, str(e))
+            self._publish(job_id, {"event": "error", "detail": str(e)})
+        else:
+            self.store.finish(job_id, {**asdict(answer), "cache_hit": cache_hit})
+            self._publish(job_id, {"event": "final", "job": self.store.get(job_id).to_dict()})
+        finally:
+            self._running.discard(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.store.path,
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": len(self._running),
+            "resumed_jobs": self.resumed,
+            "restored_tasks": self.restored_tasks,
+            "max_attempts": self.max_attempts,
+            "abandoned_jobs": self.abandoned,
+            "by_status": self.store.counts(),
+        }
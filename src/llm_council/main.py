@@ -191,265 +191,46 @@
 
 
 """
-Rate limiting implementation for LLM Council API
-Install: pip install slowapi redis
+LLM Council command line: run, batch, serve, train, replay and test
+
+Only the chosen command's dependencies are loaded: `serve` imports the API
+(api.py), and crewAI is imported once a council is actually built (see
+service.py). `from llm_council.main import app` still works.
 """
 
-import sys
-from datetime import datetime
-from typing import List, Optional
 import asyncio
-
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 try:
-    from .crew import LlmCouncil
+    from .batch import read_jsonl, run_batch
+    from .service import (BATCH_CONCURRENCY, COUNCIL_MODE, STATE_KIND, answer_question, build_council_factory,
+                          get_council_factory, route_question)
 except ImportError:
-    from crew import LlmCouncil
-
-# ============================================
-# Rate Limiting Setup
-# ============================================
-# Option 1: In-memory rate limiting (simpler, single instance)
-limiter = Limiter(key_func=get_remote_address)
-
-# Option 2: Redis-based (for production with multiple instances)
-# from slowapi.util import get_remote_address
-# limiter = Limiter(
-#     key_func=get_remote_address,
-#     storage_uri="redis://localhost:6379"
-# )
-
-# ============================================
-# Concurrent Request Limiter
-# ============================================
-class ConcurrentRequestLimiter:
-    """Limit total concurrent requests to prevent resource exhaustion"""
-    def __init__(self, max_concurrent: int = 5):
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.active_requests = 0
-    
-    async def __aenter__(self):
-        self.active_requests += 1
-        await self.semaphore.acquire()
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.semaphore.release()
-        self.active_requests -= 1
-    
-    def get_active_count(self):
-        return self.active_requests
-
-# Global concurrent limiter (max 5 questions being processed at once)
-concurrent_limiter = ConcurrentRequestLimiter(max_concurrent=5)
-
-# ============================================
-# FastAPI Setup
-# ============================================
-app = FastAPI(
-    title="LLM Council API",
-    description="Multi-model AI council API with rate limiting",
-    version="1.0.0"
-)
-
-# Add rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-app.add_middleware(SlowAPIMiddleware)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Request/Response Models
-class QuestionRequest(BaseModel):
-    question: str
-
-class SimpleResponse(BaseModel):
-    question: str
-    answer: str
-    timestamp: str
-    execution_time: float
-    rate_limit_info: Optional[dict] = None
-
-class TaskOutput(BaseModel):
-    agent: str
-    task_name: str
-    output: str
-
-class DetailedResponse(BaseModel):
-    question: str
-    timestamp: str
-    individual_outputs: List[TaskOutput]
-    final_answer: str
-    execution_time: float
-    rate_limit_info: Optional[dict] = None
-
-# ============================================
-# FastAPI Endpoints
-# ============================================
-@app.get("/")
-def root():
-    return {
-        "message": "LLM Council API",
-        "version": "1.0.0",
-        "rate_limits": {
-            "per_user": "10 requests per hour",
-            "concurrent": "5 max concurrent requests",
-            "cost_per_question": "7 LLM API calls"
-        },
-        "endpoints": {
-            "POST /ask": "Get final answer only (rate limited)",
-            "POST /ask/detailed": "Get all outputs (rate limited)",
-            "GET /health": "Health check",
-            "GET /status": "Rate limit status",
-            "GET /docs": "API documentation"
-        }
-    }
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
-
-@app.get("/status")
-def status_check(request: Request):
-    """Check current rate limit status"""
-    return {
-        "active_concurrent_requests": concurrent_limiter.get_active_count(),
-        "max_concurrent_requests": 5,
-        "your_ip": get_remote_address(request),
-        "rate_limit": "10 requests per hour per IP"
-    }
-
-@app.post("/ask", response_model=SimpleResponse)
-@limiter.limit("10/hour")  # 10 requests per hour per IP
-async def ask_council(request: Request, question_req: QuestionRequest):
-    """
-    Submit a question and get the final synthesized answer
-    
-    Rate Limits:
-    - 10 requests per hour per IP address
-    - Max 5 concurrent requests across all users
-    """
-    
-    if not question_req.question.strip():
-        raise HTTPException(status_code=400, detail="Question cannot be empty")
-    
-    # Check concurrent request limit
-    if concurrent_limiter.active_requests >= 5:
-        raise HTTPException(
-            status_code=429,
-            detail="Server is at capacity. Please try again in a moment."
-        )
-    
-    try:
-        async with concurrent_limiter:
-            start_time = datetime.now()
-            
-            # Create and execute crew (this runs in executor to avoid blocking)
-            llm_council = LlmCouncil()
-            crew = llm_council.crew()
-            result = await asyncio.to_thread(
-                crew.kickoff,
-                inputs={"question": question_req.question}
-            )
-            
-            execution_time = (datetime.now() - start_time).total_seconds()
-            
-            return SimpleResponse(
-                question=question_req.question,
-                answer=str(result),
-                timestamp=start_time.isoformat(),
-                execution_time=execution_time,
-                rate_limit_info={
-                    "limit": "10 per hour",
-                    "ip": get_remote_address(request)
-                }
-            )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/ask/detailed", response_model=DetailedResponse)
-@limiter.limit("5/hour")  # Stricter limit for detailed endpoint (more data)
-async def ask_council_detailed(request: Request, question_req: QuestionRequest):
-    """
-    Submit a question and get all outputs (initial answers + critiques + final)
-    
-    Rate Limits:
-    - 5 requests per hour per IP address (stricter than /ask)
-    - Max 5 concurrent requests across all users
-    """
-    
-    if not question_req.question.strip():
-        raise HTTPException(status_code=400, detail="Question cannot be empty")
-    
-    # Check concurrent request limit
-    if concurrent_limiter.active_requests >= 5:
-        raise HTTPException(
-            status_code=429,
-            detail="Server is at capacity. Please try again in a moment."
-        )
-    
-    try:
-        async with concurrent_limiter:
-            start_time = datetime.now()
-            
-            # Create and execute crew
-            llm_council = LlmCouncil()
-            crew = llm_council.crew()
-            result = await asyncio.to_thread(
-                crew.kickoff,
-                inputs={"question": question_req.question}
-            )
-            
-            # Extract outputs
-            task_names = [
-                "GPT Initial Answer",
-                "Claude Initial Answer", 
-                "Gemini Initial Answer",
-                "GPT Critique",
-                "Claude Critique",
-                "Gemini Critique",
-                "Chairman Synthesis"
-            ]
-            
-            individual_outputs = []
-            for i, task in enumerate(crew.tasks):
-                output_text = task.output.raw if hasattr(task.output, 'raw') else str(task.output)
-                individual_outputs.append(TaskOutput(
-                    agent=task.agent.role,
-                    task_name=task_names[i] if i < len(task_names) else f"Task {i+1}",
-                    output=output_text
-                ))
-            
-            execution_time = (datetime.now() - start_time).total_seconds()
-            
-            return DetailedResponse(
-                question=question_req.question,
-                timestamp=start_time.isoformat(),
-                individual_outputs=individual_outputs,
-                final_answer=str(result),
-                execution_time=execution_time,
-                rate_limit_info={
-                    "limit": "5 per hour",
-                    "ip": get_remote_address(request)
-                }
-            )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    from batch import read_jsonl, run_batch
+    from service import (BATCH_CONCURRENCY, COUNCIL_MODE, STATE_KIND, answer_question, build_council_factory,
+                         get_council_factory, route_question)
+
+if TYPE_CHECKING:
+    from .factory import CouncilFactory
+
+# The server's port (LLM_COUNCIL_PORT, default 8000)
+PORT = int(os.getenv("LLM_COUNCIL_PORT", "8000"))
+
+def __getattr__(name: str):
+    # The FastAPI app moved to api.py; importing it here loads FastAPI only when asked for
+    if name == "app":
+        try:
+            from .api import app
+        except ImportError:
+            from api import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ============================================
 # CLI Functions
@@ -467,8 +248,11 @@ def run():
     
     print(f"\nProcessing question: {user_question}\n")
     
-    llm_council = LlmCouncil()
-    result = llm_council.crew().kickoff(inputs={"question": user_question})
+    topology, routing = route_question(user_question)
+    if routing is not None:
+        print(f"Routed as {routing['tier']} (score {routing['score']}, {routing['calls_per_question']} LLM calls)\n")
+    
+    result = get_council_factory().kickoff({"question": user_question}, COUNCIL_MODE, topology=topology)
     
     print("\n" + "=" * 50)
     print("===== FINAL OUTPUT =====")
@@ -476,19 +260,202 @@ def run():
     print(result)
     print("=" * 50)
 
+def batch():
+    """Answer a JSONL file of questions: batch <questions.jsonl> [results.jsonl]
+
+    Results are written (to stdout without an output file) as each question completes.
+    """
+    args = sys.argv[1:]
+    if args and args[0] == "batch":
+        args = args[1:]
+    if not args:
+        print("Usage: batch <questions.jsonl> [results.jsonl]")
+        sys.exit(1)
+
+    with open(args[0], encoding="utf-8") as f:
+        items = read_jsonl(f)
+    output = open(args[1], "w", encoding="utf-8") if len(args) > 1 else sys.stdout
+
+    async def write_results():
+        done = 0
+        async for row in run_batch(items, answer_question, BATCH_CONCURRENCY):
+            output.write(json.dumps(row) + "\n")
+            output.flush()
+            done += 1
+            print(f"[{done}/{len(items)}] {row['id']}" + (" (error)" if "error" in row else ""), file=sys.stderr)
+
+    try:
+        asyncio.run(write_results())
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+def train():
+    """Train the crew with human feedback: train <n_iterations> <filename>"""
+    inputs = {"question": "What are the main trade-offs between SQL and NoSQL databases?"}
+    try:
+        get_council_factory().new_crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+    except Exception as e:
+        raise Exception(f"An error occurred while training the crew: {e}")
+
+async def replay_councils(factory: "CouncilFactory", councils: List[Dict[str, Any]], rounds: int = 1,
+                          mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Re-run recorded councils one after another; one row per council and round"""
+    rows = []
+    for round_no in range(1, rounds + 1):
+        factory.recorder.store.rewind()
+        for index, council in enumerate(councils, start=1):
+            topology = factory.topology.override(**council["council"]) if council.get("council") else None
+            misses = factory.recorder.misses
+            start = time.perf_counter()
+            result = await factory.akickoff(council["inputs"], mode or council["mode"], topology=topology)
+            wall = time.perf_counter() - start
+            # Model time on the critical path: the slowest call of each phase (parallel mode only)
+            slowest: Dict[str, float] = {}
+            for call in getattr(result, "usage", []):
+                slowest[call.phase] = max(slowest.get(call.phase, 0.0), call.latency)
+            model = sum(slowest.values()) if slowest else None
+            rows.append({
+                "round": round_no, "council": index, "wall_s": wall,
+                "model_s": model, "overhead_s": wall - model if model is not None else None,
+                "cached_tasks": sum(bool(getattr(task, "cached", False)) for task in result.tasks),
+                "misses": factory.recorder.misses - misses,
+                "match": str(result) == council["final_answer"],
+            })
+    return rows
+
+def replay_summary(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    walls = sorted(row["wall_s"] for row in rows)
+    overheads = [row["overhead_s"] for row in rows if row["overhead_s"] is not None]
+    return {
+        "councils": len(rows),
+        "mean_s": round(sum(walls) / len(walls), 4),
+        "p50_s": round(walls[len(walls) // 2], 4),
+        "p95_s": round(walls[min(len(walls) - 1, math.ceil(0.95 * len(walls)) - 1)], 4),
+        "mean_overhead_s": round(sum(overheads) / len(overheads), 4) if overheads else None,
+        "cached_tasks": sum(row["cached_tasks"] for row in rows),
+        "misses": sum(row["misses"] for row in rows),
+        "mismatches": sum(not row["match"] for row in rows),
+    }
+
+def replay():
+    """Re-run the councils of a recording offline (no API keys or network)
+
+    replay <recording.jsonl[.gz]> [--latency recorded|none|SECONDS] [--speed X]
+           [--missing error|synthetic] [--rounds N] [--mode parallel|sequential]
+
+    Record one with LLM_COUNCIL_RECORD=<file>. With --latency none the wall
+    time left is the orchestration overhead of the engine (or crewAI's kickoff).
+    The council settings (cache, context, consensus, quorum, limits) come from
+    the environment as for the server.
+    """
+    import argparse
+    try:
+        from .recording import ERROR, NO_LATENCY, RECORDED, REPLAY, CallStore, Recorder
+    except ImportError:
+        from recording import ERROR, NO_LATENCY, RECORDED, REPLAY, CallStore, Recorder
+    args = sys.argv[1:]
+    if args and args[0] == "replay":
+        args = args[1:]
+    parser = argparse.ArgumentParser(prog="replay", description="Re-run recorded councils offline")
+    parser.add_argument("recording")
+    parser.add_argument("--latency", default=RECORDED, help="recorded, none or fixed seconds per call")
+    parser.add_argument("--speed", type=float, default=1.0, help="multiplies recorded latencies")
+    parser.add_argument("--missing", default=ERROR, choices=[ERROR, "synthetic"])
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--mode", default=None, help="parallel or sequential (default: as recorded)")
+    args = parser.parse_args(args)
+
+    store = CallStore(args.recording)
+    if not store.councils:
+        print(f"No recorded councils in {args.recording}")
+        sys.exit(1)
+    latency = args.latency if args.latency in (RECORDED, NO_LATENCY) else float(args.latency)
+    recorder = Recorder(store, REPLAY, latency=latency, speed=args.speed, missing=args.missing)
+    rows = asyncio.run(replay_councils(build_council_factory(recorder), store.councils, args.rounds, args.mode))
+
+    print(f"{'round':>5}{'council':>8}{'wall_s':>10}{'model_s':>10}{'overhead_s':>12}{'cached':>8}{'misses':>8}  match")
+    for row in rows:
+        model = f"{row['model_s']:.4f}" if row["model_s"] is not None else "-"
+        overhead = f"{row['overhead_s']:.4f}" if row["overhead_s"] is not None else "-"
+        print(f"{row['round']:>5}{row['council']:>8}{row['wall_s']:>10.4f}{model:>10}{overhead:>12}"
+              f"{row['cached_tasks']:>8}{row['misses']:>8}  {row['match']}")
+    print(json.dumps({"recording": args.recording, "rounds": args.rounds, "latency": args.latency,
+                      **replay_summary(rows), **recorder.stats()}))
+
+def test():
+    """Offline end-to-end check: test [n_iterations] [recording.jsonl[.gz]]
+
+    Replays the recording n times (default 2) with no latency and fails unless
+    every call was recorded and every council gives its recorded answer. Without
+    a recording, a council is first recorded against stub LLMs, then replayed.
+    """
+    args = sys.argv[1:]
+    if args and args[0] == "test":
+        args = args[1:]
+    iterations = int(args[0]) if args else 2
+    try:
+        from .factory import CouncilFactory
+        from .recording import NO_LATENCY, RECORD, REPLAY, CallStore, Recorder
+    except ImportError:
+        from factory import CouncilFactory
+        from recording import NO_LATENCY, RECORD, REPLAY, CallStore, Recorder
+
+    with tempfile.TemporaryDirectory() as tmp:
+        llms = None
+        if len(args) > 1:
+            path = args[1]
+        else:
+            try:
+                from .stubs import StubLLM
+            except ImportError:
+                from stubs import StubLLM
+            path = os.path.join(tmp, "calls.jsonl")
+            llms = {name: StubLLM(model=f"stub/{name}", delay=0.01, response=f"{name} answer")
+                    for name in ("gpt4o", "claude3", "gemini2")}
+            CouncilFactory(llms=llms, recorder=Recorder(CallStore(path), RECORD)).kickoff(
+                {"question": "Why is the sky blue?"})
+        store = CallStore(path)
+        recorder = Recorder(store, REPLAY, latency=NO_LATENCY, missing="synthetic")
+        factory = CouncilFactory(llms=llms, recorder=recorder)
+        rows = asyncio.run(replay_councils(factory, store.councils, iterations))
+
+    summary = replay_summary(rows)
+    print(json.dumps({"iterations": iterations, **summary}))
+    if summary["misses"] or summary["mismatches"]:
+        print("FAILED: replayed councils did not match the recording")
+        sys.exit(1)
+    print(f"OK: {len(store.councils)} council(s) x {iterations} replayed identically")
+
 def serve():
-    """Start the FastAPI server"""
+    """Start the FastAPI server: serve [--workers N] (or LLM_COUNCIL_WORKERS)"""
     import uvicorn
+    try:
+        from .api import MAX_CONCURRENT, app
+    except ImportError:
+        from api import MAX_CONCURRENT, app
+    workers = int(os.getenv("LLM_COUNCIL_WORKERS", "1"))
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
     print("🚀 Starting LLM Council API Server...")
     print("⚡ Rate Limiting Enabled:")
     print("   • 10 requests/hour per IP (/ask)")
     print("   • 5 requests/hour per IP (/ask/detailed)")
-    print("   • Max 5 concurrent requests")
-    print("\n📖 API Docs: http://localhost:8000/docs")
-    print("🏥 Health Check: http://localhost:8000/health")
-    print("📊 Status: http://localhost:8000/status")
+    print(f"   • Max {MAX_CONCURRENT} concurrent requests")
+    if workers > 1:
+        print(f"   • {workers} workers, limits {'shared via Redis' if STATE_KIND == 'redis' else 'PER WORKER'}")
+        if STATE_KIND != "redis":
+            print("     ⚠️ Set LLM_COUNCIL_STATE=redis to share limits across workers")
+    print(f"\n📖 API Docs: http://localhost:{PORT}/docs")
+    print(f"🏥 Health Check: http://localhost:{PORT}/health")
+    print(f"📊 Status: http://localhost:{PORT}/status")
     print("\nPress CTRL+C to stop\n")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    if workers > 1:
+        # Worker processes import the app themselves
+        uvicorn.run(f"{__package__}.api:app" if __package__ else "api:app",
+                    host="0.0.0.0", port=PORT, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=PORT)
 
 # ============================================
 # Main Entry Point
@@ -496,5 +463,11 @@ def serve():
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "serve":
         serve()
+    elif len(sys.argv) > 1 and sys.argv[1] == "batch":
+        batch()
+    elif len(sys.argv) > 1 and sys.argv[1] == "replay":
+        replay()
+    elif len(sys.argv) > 1 and sys.argv[1] == "test":
+        test()
     else:
-        run()
\ No newline at end of file
+        run()
@@ -0,0 +1,357 @@
+"""
+Shared, connection-pooled HTTP clients for model calls
+
+litellm picks an HTTP client per call from its own cache: clients are keyed
+by call parameters and expire after an hour, their pool sizes are fixed, and
+nothing connects before the first request, so the first calls of every
+provider (and the first after each expiry) pay for TCP and TLS setup.
+
+ClientPool keeps one long-lived httpx.AsyncClient per provider endpoint and
+hands it to litellm.acompletion as `client` (engine.acall_llm): keep-alive
+connections with pool limits, and warm() opens connections before the first
+request. HTTP/1.1 clients send over aiohttp, like litellm's own (httpx's
+transport costs more CPU per call, which shows as latency under load);
+with the h2 package installed the clients speak HTTP/2 over httpx instead.
+Connection setup is traced, so stats() reports how many TCP connections and
+TLS handshakes the calls actually needed.
+
+Only litellm's "openai" route (OpenAI and any OpenAI-compatible base_url)
+and its "anthropic" and "gemini" handlers accept a shared client; other
+providers keep litellm's own. httpx clients belong to the event loop they
+were first used on, so calls from any other loop (a CLI `asyncio.run` per
+question) also fall back to litellm's clients.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Where each provider's API lives when an LLM sets no base_url
+DEFAULT_BASES = {
+    "openai": "https://api.openai.com/v1",
+    "anthropic": "https://api.anthropic.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+}
+OPENAI_SDK = {"openai"}  # litellm takes an openai.AsyncOpenAI as `client`
+HTTPX_HANDLER = {"anthropic", "gemini"}  # litellm takes an AsyncHTTPHandler as `client`
+
+Endpoint = Tuple[str, str]  # (provider, base url)
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the h2 package: pip install 'httpx[http2]'"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0  # model calls (warm-up requests not included)
+    connections: int = 0  # TCP connections opened
+    tls_handshakes: int = 0
+    connect_s: float = 0.0  # time spent in TCP connect and TLS handshakes
+    warmed: int = 0  # connections opened by warm()
+
+
+class ClientPool:
+    """One keep-alive httpx.AsyncClient per provider endpoint, shared by every council
+
+    max_connections: connections per endpoint (requests beyond it wait for one)
+    max_keepalive: idle connections kept open per endpoint (HTTP/1.1 keeps
+        every idle connection within max_connections; 0 closes each after use)
+    keepalive_expiry: seconds an idle connection is kept
+    http2: None for "when h2 is installed"
+    warm_connections: connections warm() opens per endpoint
+    verify: TLS verification (False or a CA bundle path for a local stub)
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, keepalive_expiry: float = 60.0,
+                 http2: Optional[bool] = None, warm_connections: int = 2, verify: Any = True,
+                 timeout: float = 600.0, connect_timeout: float = 5.0):
+        if http2 and not http2_available():
+            raise ValueError("HTTP/2 needs the h2 package: pip install 'httpx[http2]'")
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2_available() if http2 is None else http2
+        self.warm_connections = warm_connections
+        self.verify = verify
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[Endpoint, Any] = {}
+        self._connectors: Dict[Endpoint, Any] = {}  # aiohttp connectors of the HTTP/1.1 clients
+        self._handlers: Dict[Endpoint, Any] = {}
+        self._sdk_clients: Dict[Tuple[str, str], Any] = {}
+        self._stats: Dict[Endpoint, EndpointStats] = {}
+
+    # -------------------
+    # Clients
+    # -------------------
+    def endpoint(self, llm: Any) -> Optional[Endpoint]:
+        """(provider, base url) of a crewai.LLM, None for LLMs this pool cannot serve"""
+        llm = getattr(llm, "inner", llm)  # recording.RecordingLLM
+        if not hasattr(llm, "_prepare_completion_params"):
+            return None  # stubs and other non-litellm LLMs
+        import litellm
+
+        base = getattr(llm, "base_url", None) or getattr(llm, "api_base", None)
+        try:
+            _, provider, _, _ = litellm.get_llm_provider(model=llm.model, api_base=base)
+        except Exception:
+            return None
+        base = base or DEFAULT_BASES.get(provider)
+        if base is None or provider not in OPENAI_SDK | HTTPX_HANDLER:
+            return None
+        return provider, base.rstrip("/")
+
+    def _on_loop(self) -> bool:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        return loop is self._loop
+
+    def _client(self, endpoint: Endpoint):
+        client = self._clients.get(endpoint)
+        if client is None:
+            import httpx
+
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            hooks = {"request": [self._counting(stats)]}
+            if self.http2:
+                hooks["request"].append(self._httpcore_tracing(stats))
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_keepalive,
+                                    keepalive_expiry=self.keepalive_expiry),
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                http2=self.http2,
+                verify=self.verify,
+                follow_redirects=True,
+                event_hooks=hooks,
+                transport=None if self.http2 else self._aiohttp_transport(endpoint, stats),
+            )
+            self._clients[endpoint] = client
+        return client
+
+    def _ssl_context(self):
+        import ssl
+
+        import certifi
+
+        if self.verify is False:
+            return False
+        return ssl.create_default_context(cafile=self.verify if isinstance(self.verify, str) else certifi.where())
+
+    def _aiohttp_transport(self, endpoint: Endpoint, stats: EndpointStats):
+        """HTTP/1.1 over aiohttp (litellm's own default transport: faster than httpx's under load)"""
+        from aiohttp import ClientSession, TCPConnector, TraceConfig
+        from litellm.llms.custom_httpx.aiohttp_transport import LiteLLMAiohttpTransport
+
+        tracing = TraceConfig()
+        https = endpoint[1].startswith("https:")
+
+        async def on_start(session, context, params) -> None:
+            context.started = time.perf_counter()
+
+        async def on_end(session, context, params) -> None:
+            stats.connect_s += time.perf_counter() - context.started
+            stats.connections += 1
+            stats.tls_handshakes += https
+
+        tracing.on_connection_create_start.append(on_start)
+        tracing.on_connection_create_end.append(on_end)
+        ssl_context = self._ssl_context()
+
+        def session() -> ClientSession:
+            # Created on first use, on the loop the pool serves
+            if self.max_keepalive == 0:
+                connector = TCPConnector(limit=self.max_connections, force_close=True, ssl=ssl_context)
+            else:
+                connector = TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_expiry,
+                                         ssl=ssl_context)
+            self._connectors[endpoint] = connector
+            return ClientSession(connector=connector, trace_configs=[tracing])
+
+        return LiteLLMAiohttpTransport(client=session)
+
+    @staticmethod
+    def _counting(stats: EndpointStats):
+        async def on_request(request) -> None:
+            stats.requests += 1
+
+        return on_request
+
+    @staticmethod
+    def _httpcore_tracing(stats: EndpointStats):
+        """httpx request hook recording connection setup via httpcore's trace extension (HTTP/2 clients)"""
+        async def on_request(request) -> None:
+            started: Dict[str, float] = {}
+
+            async def trace(event: str, info: Dict[str, Any]) -> None:
+                step, _, state = event.rpartition(".")
+                if state == "started":
+                    started[step] = time.perf_counter()
+                elif state == "complete" and step in ("connection.connect_tcp", "connection.start_tls"):
+                    stats.connect_s += time.perf_counter() - started.pop(step, time.perf_counter())
+                    if step == "connection.connect_tcp":
+                        stats.connections += 1
+                    else:
+                        stats.tls_handshakes += 1
+
+            request.extensions["trace"] = trace
+
+        return on_request
+
+    def _handler(self, endpoint: Endpoint):
+        handler = self._handlers.get(endpoint)
+        if handler is None:
+            from litellm.llms.custom_httpx.http_handler import AsyncHTTPHandler
+
+            class PooledHandler(AsyncHTTPHandler):
+                """litellm's handler around the pool's client instead of a client of its own"""
+
+                def __init__(self, client):
+                    self.timeout = client.timeout
+                    self.event_hooks = None
+                    self.client = client
+                    self.client_alias = "llm_council"
+
+            handler = self._handlers[endpoint] = PooledHandler(self._client(endpoint))
+        return handler
+
+    def _sdk_client(self, endpoint: Endpoint, api_key: str):
+        key = (endpoint[1], api_key)
+        client = self._sdk_clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = self._sdk_clients[key] = AsyncOpenAI(api_key=api_key, base_url=endpoint[1],
+                                                          http_client=self._client(endpoint))
+        return client
+
+    def completion_kwargs(self, llm: Any) -> Dict[str, Any]:
+        """Extra litellm.acompletion arguments routing `llm`'s call through the pool ({} when it cannot)"""
+        endpoint = self.endpoint(llm)
+        if endpoint is None or not self._on_loop():
+            return {}
+        provider = endpoint[0]
+        if provider in HTTPX_HANDLER:
+            return {"client": self._handler(endpoint)}
+        api_key = getattr(getattr(llm, "inner", llm), "api_key", None) or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return {}  # litellm reports the missing key
+        return {"client": self._sdk_client(endpoint, api_key)}
+
+    # -------------------
+    # Warm-up and shutdown
+    # -------------------
+    def endpoints(self, llms: Iterable[Any]) -> List[Endpoint]:
+        found: List[Endpoint] = []
+        for llm in llms:
+            endpoint = self.endpoint(llm)
+            if endpoint is not None and endpoint not in found:
+                found.append(endpoint)
+        return found
+
+    async def warm(self, llms: Iterable[Any], connections: Optional[int] = None) -> Dict[str, int]:
+        """Open `connections` (default warm_connections) keep-alive connections to every endpoint of `llms`
+
+        Concurrent HEAD requests to each base URL each need their own
+        connection, which the pool keeps; the response status does not
+        matter. The OpenAI SDK clients also load their API resources, which
+        the SDK otherwise imports during the first call (~0.5 s). Returns the
+        connections opened per endpoint.
+        """
+        if not self._on_loop():
+            raise RuntimeError("ClientPool.warm() must run on the loop the pool serves")
+        llms = list(llms)
+        for llm in llms:
+            client = self.completion_kwargs(llm).get("client")
+            if client is not None and hasattr(client, "chat"):
+                await asyncio.to_thread(lambda: client.chat.completions)
+        count = self.warm_connections if connections is None else connections
+        opened: Dict[str, int] = {}
+        for endpoint in self.endpoints(llms):
+            client = self._client(endpoint)
+            stats = self._stats[endpoint]
+            before = stats.connections
+            results = await asyncio.gather(
+                *(client.head(endpoint[1], timeout=self.connect_timeout) for _ in range(count)),
+                return_exceptions=True,
+            )
+            errors = [r for r in results if isinstance(r, BaseException)]
+            if errors:
+                logger.warning("Could not pre-warm %s %s: %s", endpoint[0], endpoint[1], errors[0])
+            stats.requests -= count
+            stats.warmed += stats.connections - before
+            opened[self._name(endpoint)] = stats.connections - before
+        return opened
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._connectors.clear()
+        self._handlers.clear()
+        self._sdk_clients.clear()
+        self._loop = None
+
+    # -------------------
+    # Stats
+    # -------------------
+    @staticmethod
+    def _name(endpoint: Endpoint) -> str:
+        return f"{endpoint[0]} {endpoint[1]}"
+
+    def _open_connections(self, endpoint: Endpoint) -> Tuple[int, int]:
+        """(open, idle) connections in an endpoint's pool (aiohttp/httpcore internals, (0, 0) if they change)"""
+        connector = self._connectors.get(endpoint)
+        if connector is not None:
+            idle = sum(len(connections) for connections in getattr(connector, "_conns", {}).values())
+            return idle + len(getattr(connector, "_acquired", ())), idle
+        pool = getattr(getattr(self._clients.get(endpoint), "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        return len(connections), sum(1 for connection in connections if connection.is_idle())
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint, stats in self._stats.items():
+            open_, idle = self._open_connections(endpoint)
+            opened = stats.connections - stats.warmed
+            endpoints[self._name(endpoint)] = {
+                **asdict(stats),
+                "connect_s": round(stats.connect_s, 4),
+                "reused": max(0, stats.requests - opened),  # calls that found an open connection
+                "connections_per_call": round(opened / stats.requests, 3) if stats.requests else None,
+                "open": open_,
+                "idle": idle,
+            }
+        return {
+            "enabled": True,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "keepalive_expiry_s": self.keepalive_expiry,
+            "endpoints": endpoints,
+        }
+
+
+_pool: Optional[ClientPool] = None
+
+
+def get_client_pool() -> Optional[ClientPool]:
+    return _pool
+
+
+def set_client_pool(pool: Optional[ClientPool]) -> None:
+    global _pool
+    _pool = pool
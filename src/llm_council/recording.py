@@ -0,0 +1,316 @@
+"""
+Record and replay the model calls of council runs
+
+A Recorder wraps every LLM of a council. In record mode the calls go to the
+real models and each one is appended to a CallStore: a JSONL file (gzipped
+when the path ends in .gz) with one line per call
+
+    {"type": "call", "key", "model", "task", "response", "latency",
+     "prompt_tokens", "completion_tokens"}
+
+keyed by a hash of the model id and the exact messages, plus one line per
+council with its inputs, council shape and final answer. In replay mode no
+model is called: each call is answered from the store after its recorded
+latency (or none, or a fixed synthetic one), so councils, the API layer and
+the caches can be benchmarked reproducibly without network access.
+
+A call that is not in the store (a prompt changed since the recording)
+raises ReplayMiss, or gets a synthetic answer with missing="synthetic".
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+try:
+    from .engine import acall_llm, astream_llm
+except ImportError:
+    from engine import acall_llm, astream_llm
+
+# Recorder modes
+RECORD = "record"
+REPLAY = "replay"
+
+# Replay latency
+RECORDED = "recorded"  # sleep for the recorded latency (times `speed`)
+NO_LATENCY = "none"    # answer at once: the wall time left is pure orchestration overhead
+
+# Replay misses
+ERROR = "error"
+SYNTHETIC = "synthetic"
+
+Messages = Union[str, List[Dict[str, Any]]]
+
+
+class ReplayMiss(LookupError):
+    """A replayed call has no recording"""
+
+
+def call_key(model: str, messages: Messages) -> str:
+    """Hash of the model id and the exact messages"""
+    return hashlib.sha256(json.dumps([model, messages], sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+@dataclass
+class RecordedCall:
+    key: str
+    model: str
+    response: str
+    latency: float
+    task: str = ""
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+# ============================================
+# Store
+# ============================================
+class CallStore:
+    """Append-only JSONL file of recorded calls and councils, indexed in memory"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._calls: Dict[str, List[RecordedCall]] = {}
+        self._cursor: Dict[str, int] = {}
+        self.councils: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._file = None
+        if os.path.exists(path):
+            with self._open("rt") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        kind = entry.pop("type", "call")
+        if kind == "council":
+            self.councils.append(entry)
+        else:
+            self._calls.setdefault(entry["key"], []).append(RecordedCall(**entry))
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = self._open("at")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            self._index(dict(entry))
+
+    def add_call(self, call: RecordedCall) -> None:
+        self._append({"type": "call", **asdict(call)})
+
+    def add_council(self, inputs: Dict[str, str], mode: str, final_answer: str,
+                    council: Optional[Dict[str, Any]] = None) -> None:
+        self._append({"type": "council", "inputs": inputs, "mode": mode,
+                      "council": council, "final_answer": final_answer})
+
+    def lookup(self, key: str) -> Optional[RecordedCall]:
+        """The recorded call for `key`; repeated keys replay their recordings in order, then wrap around"""
+        with self._lock:
+            calls = self._calls.get(key)
+            if not calls:
+                return None
+            cursor = self._cursor.get(key, 0)
+            self._cursor[key] = cursor + 1
+            return calls[cursor % len(calls)]
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._cursor.clear()
+
+    def mean_latency(self, model: str) -> float:
+        latencies = [call.latency for calls in self._calls.values() for call in calls if call.model == model]
+        return sum(latencies) / len(latencies) if latencies else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __len__(self) -> int:
+        return sum(len(calls) for calls in self._calls.values())
+
+
+# ============================================
+# LLM wrappers
+# ============================================
+def _task_name(from_task: Any) -> str:
+    return getattr(from_task, "name", None) or ""
+
+
+class RecordingLLM(BaseLLM):
+    """Passes every call through to `inner` and appends it to the store"""
+
+    accepts_usage = True  # engine.acall_llm hands over the dict for provider-reported tokens
+
+    def __init__(self, inner: Any, store: CallStore):
+        super().__init__(model=inner.model)
+        self.inner = inner
+        self.store = store
+
+    def _save(self, messages: Messages, response: str, start: float, task: Any,
+              usage: Dict[str, int]) -> None:
+        self.store.add_call(RecordedCall(
+            key=call_key(self.model, messages),
+            model=self.model,
+            response=response,
+            latency=round(time.perf_counter() - start, 4),
+            task=_task_name(task),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        ))
+
+    def call(self, messages: Messages, tools: Optional[List[dict]] = None, callbacks: Optional[List[Any]] = None,
+             available_functions: Optional[Dict[str, Any]] = None, from_task: Optional[Any] = None,
+             from_agent: Optional[Any] = None) -> str:
+        start = time.perf_counter()
+        response = self.inner.call(messages, tools=tools, callbacks=callbacks,
+                                   available_functions=available_functions,
+                                   from_task=from_task, from_agent=from_agent)
+        self._save(messages, str(response), start, from_task, {})
+        return response
+
+    async def acall(self, messages: Messages, from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+                    usage: Optional[Dict[str, int]] = None) -> str:
+        usage = usage if usage is not None else {}
+        start = time.perf_counter()
+        response = await acall_llm(self.inner, messages, from_task, from_agent, usage)
+        self._save(messages, response, start, from_task, usage)
+        return response
+
+    async def astream(self, messages: Messages, from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+                      usage: Optional[Dict[str, int]] = None) -> AsyncIterator[str]:
+        usage = usage if usage is not None else {}
+        start = time.perf_counter()
+        parts: List[str] = []
+        async for delta in astream_llm(self.inner, messages, from_task, from_agent, usage):
+            parts.append(delta)
+            yield delta
+        self._save(messages, "".join(parts), start, from_task, usage)
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+
+class ReplayLLM(BaseLLM):
+    """Answers every call from the store; no model is called"""
+
+    accepts_usage = True
+
+    def __init__(self, model: str, recorder: "Recorder"):
+        super().__init__(model=model)
+        self.recorder = recorder
+
+    def _lookup(self, messages: Messages) -> RecordedCall:
+        recorder = self.recorder
+        call = recorder.store.lookup(call_key(self.model, messages))
+        if call is not None:
+            recorder.replayed += 1
+            return call
+        recorder.misses += 1
+        if recorder.missing != SYNTHETIC:
+            raise ReplayMiss(f"{self.model}: no recorded call for these messages in {recorder.store.path} "
+                             "(recorded with other prompts or council settings?)")
+        return RecordedCall(key="", model=self.model, response=f"[{self.model}] synthetic replay answer",
+                            latency=recorder.store.mean_latency(self.model))
+
+    def _delay(self, call: RecordedCall) -> float:
+        latency = self.recorder.latency
+        if latency == NO_LATENCY:
+            return 0.0
+        if latency == RECORDED:
+            return call.latency * self.recorder.speed
+        return float(latency)
+
+    @staticmethod
+    def _usage(call: RecordedCall, usage: Optional[Dict[str, int]]) -> None:
+        if usage is not None and call.prompt_tokens is not None:
+            usage["prompt_tokens"] = call.prompt_tokens
+            usage["completion_tokens"] = call.completion_tokens or 0
+
+    def call(self, messages: Messages, tools: Optional[List[dict]] = None, callbacks: Optional[List[Any]] = None,
+             available_functions: Optional[Dict[str, Any]] = None, from_task: Optional[Any] = None,
+             from_agent: Optional[Any] = None) -> str:
+        call = self._lookup(messages)
+        time.sleep(self._delay(call))
+        return call.response
+
+    async def acall(self, messages: Messages, from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+                    usage: Optional[Dict[str, int]] = None) -> str:
+        call = self._lookup(messages)
+        await asyncio.sleep(self._delay(call))
+        self._usage(call, usage)
+        return call.response
+
+    async def astream(self, messages: Messages, from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+                      usage: Optional[Dict[str, int]] = None) -> AsyncIterator[str]:
+        """The recorded answer one word at a time, with the delay spread across the words"""
+        call = self._lookup(messages)
+        delay = self._delay(call)
+        words = call.response.split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(delay / len(words))
+            yield word if i == 0 else " " + word
+        self._usage(call, usage)
+
+
+# ============================================
+# Recorder
+# ============================================
+class Recorder:
+    """Wraps a council's LLMs to record their calls to `store`, or to replay them from it
+
+    latency (replay): "recorded" (times `speed`), "none" or a fixed number of seconds
+    missing (replay): "error" (ReplayMiss) or "synthetic" (a placeholder answer)
+    """
+
+    def __init__(self, store: CallStore, mode: str = RECORD, latency: Union[str, float] = RECORDED,
+                 speed: float = 1.0, missing: str = ERROR):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown recorder mode: {mode!r} (expected '{RECORD}' or '{REPLAY}')")
+        self.store = store
+        self.mode = mode
+        self.latency = latency
+        self.speed = speed
+        self.missing = missing
+        self.replayed = 0
+        self.misses = 0
+        self._wrapped: Dict[int, Tuple[Any, BaseLLM]] = {}  # id(llm) -> (llm, stand-in); keeps ids stable
+
+    def wrap(self, llm: Any) -> BaseLLM:
+        """The recording/replaying stand-in for `llm` (one per underlying LLM)"""
+        entry = self._wrapped.get(id(llm))
+        if entry is None:
+            wrapped = RecordingLLM(llm, self.store) if self.mode == RECORD else ReplayLLM(llm.model, self)
+            entry = self._wrapped[id(llm)] = (llm, wrapped)
+        return entry[1]
+
+    def record_council(self, inputs: Dict[str, str], mode: str, final_answer: str,
+                       council: Optional[Dict[str, Any]] = None) -> None:
+        if self.mode == RECORD:
+            self.store.add_council(inputs, mode, final_answer, council)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"mode": self.mode, "path": self.store.path, "calls": len(self.store),
+                                 "councils": len(self.store.councils)}
+        if self.mode == REPLAY:
+            stats.update(latency=self.latency, speed=self.speed, missing=self.missing,
+                         replayed=self.replayed, misses=self.misses)
+        return stats
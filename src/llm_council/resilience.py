@@ -0,0 +1,102 @@
+"""
+Retries, fallback models and degraded answers for council tasks
+
+Each agent in config/agents.yaml may set
+
+    retry:                 # or just a number of attempts
+      attempts: 2          # calls per model before moving down the chain
+      backoff: 0.5         # seconds before the first retry, doubled after each
+      max_backoff: 8
+      jitter: 0.5          # each delay varies by +/- this fraction
+    fallback: [claude3]    # models tried after the agent's own, in order
+
+CouncilEngine tries the agent's model, retrying with jittered exponential
+backoff, then each fallback model the same way. A task whose chain is
+exhausted fails. With `degrade` on, a failed task no longer fails the
+council: later phases work from the outputs that exist, and when the final
+phase has nothing to go on, the most central gather draft becomes the
+answer. The result's `degraded` report says what was lost or recovered.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    from .consensus import jaccard
+except ImportError:
+    from consensus import jaccard
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 1
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    jitter: float = 0.5
+
+    def __post_init__(self):
+        if self.attempts < 1:
+            raise ValueError(f"Retry attempts must be at least 1, got {self.attempts}")
+
+    @classmethod
+    def from_config(cls, spec: Union[None, int, Dict[str, Any]]) -> "RetryPolicy":
+        if spec is None:
+            return cls()
+        if isinstance(spec, int):
+            return cls(attempts=spec)
+        return cls(**spec)
+
+    def delay(self, retry: int, rng: random.Random) -> float:
+        """Seconds to wait before retry number `retry` (1 = the first retry)"""
+        base = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        return max(0.0, base * (1 + rng.uniform(-self.jitter, self.jitter)))
+
+
+NO_RETRY = RetryPolicy()
+
+
+@dataclass
+class AgentPolicy:
+    """How hard to try for one agent's tasks"""
+    retry: RetryPolicy = NO_RETRY
+    fallbacks: List[Any] = field(default_factory=list)  # LLMs tried after the agent's own, in order
+
+
+class TaskFailed(RuntimeError):
+    """Every model in a task's chain failed (each after its retries)"""
+
+    def __init__(self, task: str, errors: List[Tuple[str, BaseException]]):
+        self.task = task
+        self.errors = errors
+        tried = "; ".join(f"{model}: {error}" for model, error in errors)
+        super().__init__(f"{task} failed after {len(errors)} attempts ({tried})")
+
+
+def most_central(texts: List[str]) -> int:
+    """Index of the text most similar, on average, to the others (the drafts' majority view)"""
+    if len(texts) < 2:
+        return 0
+    closeness = [
+        sum(jaccard(text, other) for j, other in enumerate(texts) if j != i) / (len(texts) - 1)
+        for i, text in enumerate(texts)
+    ]
+    return max(range(len(texts)), key=closeness.__getitem__)
+
+
+def degradation_report(faults: Dict[str, Dict[str, Any]], recovered: Dict[str, Dict[str, Any]],
+                       final_answer: Optional[str]) -> Optional[Dict[str, Any]]:
+    """The result's `degraded` field: None when every task answered on its first call
+
+    faults: per phase, the "failed" and "skipped" task names (and their "errors")
+    recovered: per task that needed a retry or a fallback model, its attempts and the model that answered
+    final_answer: where the answer came from when the final phase produced none (e.g. "draft:gpt_gather")
+    """
+    if not (faults or recovered or final_answer):
+        return None
+    return {
+        "partial": bool(faults) or final_answer is not None,
+        "phases": faults,
+        "recovered": recovered,
+        "final_answer": final_answer or "chairman",
+    }
@@ -0,0 +1,156 @@
+"""
+Difficulty router: send easy questions to a smaller council
+
+Every question normally costs the full council (3 drafts, 3 critiques and a
+synthesis). The router scores a question locally, with no model call, and
+picks a tier from config/router.yaml; each tier is a Topology.override() of
+the configured council, e.g.
+
+    easy    one cheap delegate drafts, the chairman answers     2 calls
+    medium  every delegate drafts, no critiques                 4 calls
+    hard    the full council                                    7 calls
+
+heuristic_score() looks at length, multi-part questions, reasoning cues
+("why", "compare", "trade-offs"), code and math, and discounts short factual
+lookups ("what is", "who wrote"). Any callable question -> (score, signals)
+can replace it, e.g. a small trained classifier.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+try:
+    from .topology import Topology
+except ImportError:
+    from topology import Topology
+
+# question -> (score in [0, 1], the signals that produced it)
+Classifier = Callable[[str], Tuple[float, Dict[str, Any]]]
+
+ROUTER_CONFIG = os.path.join(os.path.dirname(__file__), "config", "router.yaml")
+
+_WORD = re.compile(r"[A-Za-z0-9']+")
+_REASONING = re.compile(
+    r"\b(why|how (?:does|do|can|should|would)|explain|compare|contrast|versus|vs\.?|trade-?offs?|"
+    r"pros and cons|design|architect\w*|analy[sz]e|evaluate|assess|prove|derive|justify|implications?|"
+    r"strateg\w*|optimi[sz]\w*|debug|diagnose|critique|recommend|should (?:i|we))\b",
+    re.IGNORECASE,
+)
+_FACTUAL = re.compile(
+    r"^\s*(what(?: is|'s| are| was| were)|who(?: is|'s| was| wrote| invented)?|when|where|"
+    r"define|definition of|how many|how much|how old|translate|convert|spell)\b",
+    re.IGNORECASE,
+)
+_CODE = re.compile(r"```|`[^`]+`|\bdef |\bclass |\bfunction\b|\bSELECT\b|=>|\{\s*$|;\s*$", re.MULTILINE)
+_MATH = re.compile(r"\d\s*[-+*/^=<>]\s*\d|[∑∫√≤≥≠]|\b(integral|derivative|equation|probability|theorem)\b",
+                   re.IGNORECASE)
+_PARTS = re.compile(r"\?|^\s*(?:\d+[.)]|[-*])\s+", re.MULTILINE)
+
+
+def heuristic_score(question: str) -> Tuple[float, Dict[str, Any]]:
+    """Local difficulty estimate in [0, 1] (no model call)"""
+    words = len(_WORD.findall(question))
+    reasoning = sorted({match.lower() for match in _REASONING.findall(question)})
+    parts = max(1, len(_PARTS.findall(question)))
+    code = bool(_CODE.search(question))
+    math = bool(_MATH.search(question))
+    factual = bool(_FACTUAL.match(question)) and not reasoning
+
+    score = 0.35 * min(words / 80, 1.0)
+    score += min(0.2 * len(reasoning), 0.4)
+    score += min(0.15 * (parts - 1), 0.3)
+    score += 0.25 if code else 0.0
+    score += 0.15 if math else 0.0
+    score -= 0.15 if factual else 0.0
+    signals = {"words": words, "reasoning": reasoning, "parts": parts,
+               "code": code, "math": math, "factual": factual}
+    return round(min(max(score, 0.0), 1.0), 3), signals
+
+
+@dataclass
+class Tier:
+    name: str
+    max_score: float
+    topology: Optional[Topology]  # None: the configured council
+    calls: int
+
+
+@dataclass
+class RoutingDecision:
+    tier: str
+    score: float
+    signals: Dict[str, Any]
+    topology: Optional[Topology]
+    calls: int        # model calls of the chosen council (before any fast path or quorum)
+    full_calls: int   # model calls of the configured council
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tier": self.tier,
+            "score": self.score,
+            "signals": self.signals,
+            "calls_per_question": self.calls,
+            "calls_saved": self.full_calls - self.calls,
+        }
+
+
+@dataclass
+class DifficultyRouter:
+    """Picks a council tier per question and counts its decisions"""
+    tiers: List[Tier]
+    full_calls: int
+    classifier: Classifier = heuristic_score
+    counts: Dict[str, int] = field(default_factory=dict)
+    calls_saved: int = 0
+
+    @classmethod
+    def from_config(cls, topology: Topology, config: Dict[str, Dict[str, Any]],
+                    classifier: Classifier = heuristic_score) -> "DifficultyRouter":
+        """Tiers from router.yaml-shaped config, each an override of `topology`"""
+        full_calls = topology.describe()["calls_per_question"]
+        tiers = []
+        for name, spec in config.items():
+            spec = dict(spec or {})
+            max_score = float(spec.pop("max_score", 1.0))
+            try:
+                variant = topology.override(**spec) if spec else topology
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Router tier {name!r}: {e}")
+            tiers.append(Tier(
+                name=name,
+                max_score=max_score,
+                topology=None if variant == topology else variant,
+                calls=variant.describe()["calls_per_question"],
+            ))
+        if not tiers:
+            raise ValueError("The router needs at least one tier")
+        tiers.sort(key=lambda tier: tier.max_score)
+        return cls(tiers=tiers, full_calls=full_calls, classifier=classifier)
+
+    @classmethod
+    def from_yaml(cls, topology: Topology, path: str = ROUTER_CONFIG,
+                  classifier: Classifier = heuristic_score) -> "DifficultyRouter":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_config(topology, yaml.safe_load(f) or {}, classifier)
+
+    def route(self, question: str) -> RoutingDecision:
+        score, signals = self.classifier(question)
+        tier = next((tier for tier in self.tiers if score < tier.max_score), self.tiers[-1])
+        self.counts[tier.name] = self.counts.get(tier.name, 0) + 1
+        self.calls_saved += self.full_calls - tier.calls
+        return RoutingDecision(tier.name, score, signals, tier.topology, tier.calls, self.full_calls)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tiers": {
+                tier.name: {"max_score": tier.max_score, "calls_per_question": tier.calls,
+                            "routed": self.counts.get(tier.name, 0)}
+                for tier in self.tiers
+            },
+            "routed": sum(self.counts.values()),
+            "calls_saved": self.calls_saved,
+        }
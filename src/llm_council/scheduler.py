@@ -0,0 +1,269 @@
+"""
+Outbound LLM call scheduling for the LLM Council
+
+Many councils in flight (a batch, or a busy API worker) all compete for the
+same three providers, each with its own RPM/TPM quota. CallLimiter sits in
+front of every model call the engine makes:
+
+- a global cap on in-flight calls
+- per provider (the litellm prefix of the model id: "openai", "anthropic",
+  "gemini", ...) or per model id: a bounded concurrency pool, async token
+  buckets for requests/minute and tokens/minute, and a bounded wait queue
+  that rejects new calls (ProviderSaturated) instead of queueing forever
+
+Waiting calls are served by priority rather than arrival: calls of later
+phases go first, so councils that are already under way finish before new
+ones start their gather phase. stats()/saturated() expose live headroom for
+/status and admission control.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+
+def provider_of(model: str) -> str:
+    """litellm provider prefix of a model id ("openai/o3-mini" -> "openai")"""
+    return model.split("/", 1)[0] if "/" in model else model
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for quota pacing"""
+    return max(1, len(text) // 4)
+
+
+class ProviderSaturated(RuntimeError):
+    """A provider's wait queue is full: back off instead of piling up more calls"""
+
+
+class PrioritySemaphore:
+    """asyncio.Semaphore whose waiters are woken lowest priority value first (FIFO among equals)"""
+
+    def __init__(self, value: int):
+        self.limit = value
+        self._value = value
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def in_use(self) -> int:
+        return self.limit - self._value
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = 0) -> None:
+        if self._value > 0 and not self.waiting:
+            self._value -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Woken and cancelled in the same step: hand the slot on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `per_minute`; holds at most one minute's worth
+
+    Waiters are served one at a time in priority order, so a large request is
+    not starved by a stream of small ones.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+        self._turn = PrioritySemaphore(1)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    async def acquire(self, amount: float, priority: int = 0) -> None:
+        amount = min(amount, self.capacity)
+        await self._turn.acquire(priority)
+        try:
+            while self.available() < amount:
+                await asyncio.sleep((amount - self.tokens) * 60 / self.per_minute)
+            self.tokens -= amount
+        finally:
+            self._turn.release()
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) after the fact; may run into debt"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+@dataclass
+class ProviderLimits:
+    """Quota for one provider or model id (None: unlimited)"""
+    concurrency: Optional[int] = None
+    rpm: Optional[float] = None
+    tpm: Optional[float] = None
+    max_queue: Optional[int] = None  # calls allowed to wait; beyond that ProviderSaturated
+
+
+class _ProviderState:
+    def __init__(self, limits: ProviderLimits):
+        self.limits = limits
+        self.pool = PrioritySemaphore(limits.concurrency) if limits.concurrency else None
+        self.requests = TokenBucket(limits.rpm) if limits.rpm else None
+        self.tokens = TokenBucket(limits.tpm) if limits.tpm else None
+        self.queued = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.rejected = 0
+
+    def saturated(self) -> bool:
+        return self.limits.max_queue is not None and self.queued >= self.limits.max_queue
+
+    def headroom(self) -> float:
+        """Fraction of the tightest limit still free right now (1.0 = idle or unlimited)"""
+        free = [1.0]
+        if self.pool is not None:
+            free.append(1 - self.pool.in_use / self.pool.limit)
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                free.append(max(0.0, bucket.available()) / bucket.capacity)
+        if self.limits.max_queue:
+            free.append(1 - min(self.queued, self.limits.max_queue) / self.limits.max_queue)
+        return round(min(free), 3)
+
+
+class CallHandle:
+    """Yielded by CallLimiter.slot(); report the output so the token bucket sees real usage"""
+
+    def __init__(self, state: Optional[_ProviderState], reserved: int, prompt_tokens: int):
+        self._state = state
+        self._reserved = reserved
+        self._prompt_tokens = prompt_tokens
+
+    def finish(self, output: str) -> None:
+        if self._state is not None and self._state.tokens is not None:
+            self._state.tokens.adjust(self._prompt_tokens + estimate_tokens(output) - self._reserved)
+            self._state = None
+
+
+class CallLimiter:
+    """Global and per-provider limits on outbound LLM calls
+
+    max_calls: in-flight calls across all providers (None: unlimited)
+    providers: limits keyed by provider ("openai") or full model id
+        ("openai/o3-mini-2025-01-31"); a model id entry wins over its provider
+    completion_reserve: tokens reserved for each call's output until the real
+        output is known
+    """
+
+    def __init__(self, max_calls: Optional[int] = None, providers: Optional[Dict[str, ProviderLimits]] = None,
+                 completion_reserve: int = 512):
+        self.max_calls = max_calls
+        self.completion_reserve = completion_reserve
+        self._global = PrioritySemaphore(max_calls) if max_calls else None
+        self._states = {name: _ProviderState(limits) for name, limits in (providers or {}).items()}
+        self.calls: Dict[str, int] = {}
+
+    def _key(self, model: str) -> str:
+        return model if model in self._states else provider_of(model)
+
+    @asynccontextmanager
+    async def slot(self, model: str, prompt: str = "", priority: int = 0) -> AsyncIterator[CallHandle]:
+        """Hold one call slot for `model`; lower priority values are served first
+
+        Raises ProviderSaturated straight away when the provider's queue is full.
+        """
+        key = self._key(model)
+        state = self._states.get(key)
+        if state is not None and state.saturated():
+            state.rejected += 1
+            raise ProviderSaturated(f"{key}: {state.queued} calls already waiting")
+
+        prompt_tokens = estimate_tokens(prompt)
+        reserved = prompt_tokens + self.completion_reserve
+        acquired = []
+        if state is not None:
+            state.queued += 1
+        try:
+            try:
+                # Provider first: a call waiting on its provider should not sit on a global slot
+                for semaphore in (state.pool if state else None, self._global):
+                    if semaphore is not None:
+                        await semaphore.acquire(priority)
+                        acquired.append(semaphore)
+                if state is not None and state.requests is not None:
+                    await state.requests.acquire(1, priority)
+                if state is not None and state.tokens is not None:
+                    await state.tokens.acquire(reserved, priority)
+            finally:
+                if state is not None:
+                    state.queued -= 1
+            self.calls[key] = self.calls.get(key, 0) + 1
+            if state is not None:
+                state.in_flight += 1
+                state.calls += 1
+            try:
+                yield CallHandle(state, reserved, prompt_tokens)
+            finally:
+                if state is not None:
+                    state.in_flight -= 1
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    def saturated(self) -> List[str]:
+        """Providers whose wait queue is full right now"""
+        return [key for key, state in self._states.items() if state.saturated()]
+
+    def stats(self) -> Dict[str, Any]:
+        providers = {}
+        for key in sorted(set(self._states) | set(self.calls)):
+            state = self._states.get(key)
+            if state is None:
+                providers[key] = {"calls": self.calls.get(key, 0), "headroom": 1.0}
+                continue
+            limits = state.limits
+            providers[key] = {
+                "concurrency": limits.concurrency,
+                "in_flight": state.in_flight,
+                "queued": state.queued,
+                "max_queue": limits.max_queue,
+                "rpm": limits.rpm,
+                "requests_available": round(state.requests.available(), 1) if state.requests else None,
+                "tpm": limits.tpm,
+                "tokens_available": round(state.tokens.available()) if state.tokens else None,
+                "calls": state.calls,
+                "rejected": state.rejected,
+                "headroom": state.headroom(),
+                "saturated": state.saturated(),
+            }
+        return {
+            "max_calls": self.max_calls,
+            "in_flight": self._global.in_use if self._global else sum(
+                s.in_flight for s in self._states.values()),
+            "waiting": self._global.waiting if self._global else None,
+            "providers": providers,
+        }
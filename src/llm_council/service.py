@@ -0,0 +1,447 @@
+"""
+The council service behind the CLI and the API: settings, caches and the question flow
+
+Everything here is configured from LLM_COUNCIL_* environment variables (and
+.env). Importing this module is cheap: crewAI, litellm and the LLM clients
+are only loaded when the first council is built (get_council_factory(), or
+warm_council() in the background), so `run`, `serve` and /health start
+without waiting for them.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+import socket
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    from .cache import (CachedAnswer, InMemoryBackend, PhaseCache, RedisBackend, ResponseCache,
+                        hashing_embedder, litellm_embedder)
+    from .consensus import JACCARD, SYNTHESIZE, ConsensusPolicy
+    from .context import ContextBuilder
+    from .jobs import Job, JobRunner, JobStore
+    from .pool import ClientPool, get_client_pool, set_client_pool
+    from .routing import ROUTER_CONFIG, DifficultyRouter
+    from .scheduler import CallLimiter, ProviderLimits
+    from .shared import RedisSharedState
+    from .speculative import SpeculativePolicy
+    from .topology import Topology
+    from .tracing import get_tracer
+    from .usage import UsageTracker
+except ImportError:
+    from cache import (CachedAnswer, InMemoryBackend, PhaseCache, RedisBackend, ResponseCache,
+                       hashing_embedder, litellm_embedder)
+    from consensus import JACCARD, SYNTHESIZE, ConsensusPolicy
+    from context import ContextBuilder
+    from jobs import Job, JobRunner, JobStore
+    from pool import ClientPool, get_client_pool, set_client_pool
+    from routing import ROUTER_CONFIG, DifficultyRouter
+    from scheduler import CallLimiter, ProviderLimits
+    from shared import RedisSharedState
+    from speculative import SpeculativePolicy
+    from topology import Topology
+    from tracing import get_tracer
+    from usage import UsageTracker
+
+if TYPE_CHECKING:
+    from .engine import Listener, QuorumPolicy
+    from .factory import CouncilFactory
+    from .recording import Recorder
+
+load_dotenv()
+
+# Shared state for running several workers/hosts behind one set of limits
+# LLM_COUNCIL_STATE: "local" (default, limits per process) or "redis" (LLM_COUNCIL_REDIS_URL):
+# per-IP rate limits, the concurrency cap and active-request counts are then cluster-wide
+STATE_KIND = os.getenv("LLM_COUNCIL_STATE", "local").lower()
+REDIS_URL = os.getenv("LLM_COUNCIL_REDIS_URL", "redis://localhost:6379")
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+WORKER_TTL = 15.0
+shared_state = RedisSharedState(url=REDIS_URL) if STATE_KIND == "redis" else None
+
+# "parallel" fans out every council phase (critiques included);
+# "sequential" runs crewAI's own Process.sequential kickoff
+COUNCIL_MODE = os.getenv("LLM_COUNCIL_MODE", "parallel")
+
+def parse_mapping(value: str, cast=float) -> Dict[str, Any]:
+    """ "a=1,b/c=2" -> {"a": 1, "b/c": 2} (keys may themselves contain "/")"""
+    mapping = {}
+    for item in value.split(","):
+        if item.strip():
+            key, _, number = item.rpartition("=")
+            mapping[key.strip()] = cast(number)
+    return mapping
+
+# Early exit: when the three drafts agree (mean pairwise similarity >= threshold)
+# skip the critiques. Unset LLM_COUNCIL_CONSENSUS_THRESHOLD keeps the full 7-call council.
+# LLM_COUNCIL_CONSENSUS_METHOD: "jaccard" (default) or "cosine"
+# LLM_COUNCIL_CONSENSUS_ACTION: "synthesize" (one short chairman call) or "majority" (no extra call)
+def build_consensus_policy() -> Optional[ConsensusPolicy]:
+    threshold = os.getenv("LLM_COUNCIL_CONSENSUS_THRESHOLD")
+    if not threshold:
+        return None
+    return ConsensusPolicy(
+        threshold=float(threshold),
+        method=os.getenv("LLM_COUNCIL_CONSENSUS_METHOD", JACCARD).lower(),
+        action=os.getenv("LLM_COUNCIL_CONSENSUS_ACTION", SYNTHESIZE).lower(),
+    )
+
+# Speculative chairman (see speculative.py): draft the final answer from the gather drafts
+# while the critiques run, then keep the draft or revise it. Costs one extra chairman prompt.
+# LLM_COUNCIL_SPECULATIVE: "off" (default) or "on"
+# LLM_COUNCIL_SPECULATIVE_ACCEPT: share of the critiques' points the draft must already cover
+# to stand without a revise pass (default 0.5; 0 always keeps the draft)
+def build_speculative_policy() -> Optional[SpeculativePolicy]:
+    if os.getenv("LLM_COUNCIL_SPECULATIVE", "off").lower() != "on":
+        return None
+    return SpeculativePolicy(accept_threshold=float(os.getenv("LLM_COUNCIL_SPECULATIVE_ACCEPT", "0.5")))
+
+# Quorum: stop waiting for slow delegates. Off unless one of these is set.
+# LLM_COUNCIL_QUORUM: k - a phase proceeds once k of its tasks answered (e.g. 2 of 3 drafts)
+# LLM_COUNCIL_TIMEOUT: default per-call deadline in seconds
+# LLM_COUNCIL_MODEL_TIMEOUTS: per-model deadlines, e.g. "openai/o3-mini-2025-01-31=20,gemini/gemini-2.0-flash-lite=8"
+def build_quorum_policy() -> Optional["QuorumPolicy"]:
+    k = os.getenv("LLM_COUNCIL_QUORUM")
+    timeout = os.getenv("LLM_COUNCIL_TIMEOUT")
+    model_timeouts = parse_mapping(os.getenv("LLM_COUNCIL_MODEL_TIMEOUTS", ""))
+    if not (k or timeout or model_timeouts):
+        return None
+    try:
+        from .engine import QuorumPolicy
+    except ImportError:
+        from engine import QuorumPolicy
+    return QuorumPolicy(
+        k=int(k) if k else None,
+        timeout=float(timeout) if timeout else None,
+        model_timeouts=model_timeouts,
+    )
+
+# Outbound call limits, shared by every council in this worker. Keys are litellm
+# providers ("openai") or full model ids ("openai/o3-mini-2025-01-31").
+# LLM_COUNCIL_MAX_CALLS: in-flight model calls across all providers
+# LLM_COUNCIL_PROVIDER_CONCURRENCY: in-flight calls, e.g. "openai=8,anthropic=16,gemini=16"
+# LLM_COUNCIL_PROVIDER_RPM / LLM_COUNCIL_PROVIDER_TPM: requests / tokens per minute, e.g. "openai=500"
+# LLM_COUNCIL_PROVIDER_MAX_QUEUE: calls allowed to wait before new ones are refused, e.g. "openai=100"
+def build_call_limiter() -> Optional[CallLimiter]:
+    max_calls = os.getenv("LLM_COUNCIL_MAX_CALLS")
+    settings = {
+        "concurrency": parse_mapping(os.getenv("LLM_COUNCIL_PROVIDER_CONCURRENCY", ""), int),
+        "rpm": parse_mapping(os.getenv("LLM_COUNCIL_PROVIDER_RPM", "")),
+        "tpm": parse_mapping(os.getenv("LLM_COUNCIL_PROVIDER_TPM", "")),
+        "max_queue": parse_mapping(os.getenv("LLM_COUNCIL_PROVIDER_MAX_QUEUE", ""), int),
+    }
+    providers = {
+        key: ProviderLimits(**{name: values.get(key) for name, values in settings.items()})
+        for key in set().union(*settings.values())
+    }
+    if not (max_calls or providers):
+        return None
+    return CallLimiter(max_calls=int(max_calls) if max_calls else None, providers=providers)
+
+# Context building for critique and chairman calls (see context.py)
+# LLM_COUNCIL_CONTEXT: "raw" (default: crewAI-style prompts, every context pasted in full)
+# or "compact" (shared question + drafts prefix, sentences repeated across critiques sent once)
+# LLM_COUNCIL_CONTEXT_BUDGET: token budgets, "prefix" for the shared drafts block and
+# one per phase for the extra context of its calls, e.g. "prefix=1500,synthesis=1200"
+def build_context_builder() -> Optional[ContextBuilder]:
+    if os.getenv("LLM_COUNCIL_CONTEXT", "raw").lower() != "compact":
+        return None
+    budgets = parse_mapping(os.getenv("LLM_COUNCIL_CONTEXT_BUDGET", ""), int)
+    return ContextBuilder(prefix_budget=budgets.pop("prefix", None), phase_budgets=budgets)
+
+# Token and cost accounting (see usage.py). Costs come from litellm's price table;
+# LLM_COUNCIL_PRICES overrides or adds prices in USD per million input:output tokens,
+# e.g. "openai/o3-mini-2025-01-31=1.1:4.4"
+def build_usage_tracker() -> UsageTracker:
+    prices = parse_mapping(os.getenv("LLM_COUNCIL_PRICES", ""),
+                           lambda value: tuple(float(price) for price in value.split(":")))
+    return UsageTracker(prices=prices)
+
+# Failures (see resilience.py): per-agent `retry` and `fallback` models are opt-in, in agents.yaml.
+# LLM_COUNCIL_DEGRADE: "off" (default) fails the request when a task fails; "on" leaves a
+# partial council instead (marked "degraded" in the response, and not cached)
+DEGRADE = os.getenv("LLM_COUNCIL_DEGRADE", "off").lower() == "on"
+
+# Record/replay of model calls (see recording.py)
+# LLM_COUNCIL_RECORD: append every model call (and council) to this file (.jsonl or .jsonl.gz)
+# LLM_COUNCIL_REPLAY: answer every model call from this recording instead; no API keys or network
+# LLM_COUNCIL_REPLAY_LATENCY: "recorded" (default), "none" or fixed seconds per call
+# LLM_COUNCIL_REPLAY_SPEED: multiplies recorded latencies (e.g. 0.1 for a 10x faster replay)
+# LLM_COUNCIL_REPLAY_MISSING: "error" (default) or "synthetic" for calls the recording lacks
+def build_recorder() -> Optional["Recorder"]:
+    record, replay = os.getenv("LLM_COUNCIL_RECORD"), os.getenv("LLM_COUNCIL_REPLAY")
+    if replay:
+        return build_replayer(replay)
+    if record:
+        try:
+            from .recording import RECORD, CallStore, Recorder
+        except ImportError:
+            from recording import RECORD, CallStore, Recorder
+        return Recorder(CallStore(record), RECORD)
+    return None
+
+def build_replayer(path: str) -> "Recorder":
+    try:
+        from .recording import ERROR, NO_LATENCY, RECORDED, REPLAY, CallStore, Recorder
+    except ImportError:
+        from recording import ERROR, NO_LATENCY, RECORDED, REPLAY, CallStore, Recorder
+    latency = os.getenv("LLM_COUNCIL_REPLAY_LATENCY", RECORDED).lower()
+    return Recorder(
+        CallStore(path),
+        REPLAY,
+        latency=latency if latency in (RECORDED, NO_LATENCY) else float(latency),
+        speed=float(os.getenv("LLM_COUNCIL_REPLAY_SPEED", "1")),
+        missing=os.getenv("LLM_COUNCIL_REPLAY_MISSING", ERROR).lower(),
+    )
+
+# ============================================
+# Answer and Phase Caches
+# ============================================
+# LLM_COUNCIL_CACHE: "memory" (default), "redis" (LLM_COUNCIL_REDIS_URL) or "off"
+# LLM_COUNCIL_CACHE_SIMILARITY: cosine threshold that enables the semantic tier (e.g. 0.92)
+# LLM_COUNCIL_CACHE_EMBEDDING_MODEL: "local" (default, no model call) or a litellm embedding model
+CACHE_KIND = os.getenv("LLM_COUNCIL_CACHE", "memory").lower()
+CACHE_TTL = float(os.getenv("LLM_COUNCIL_CACHE_TTL", "3600"))
+
+def build_cache_backend(prefix: str):
+    if CACHE_KIND == "redis":
+        return RedisBackend(url=REDIS_URL, prefix=prefix)
+    return InMemoryBackend(max_entries=int(os.getenv("LLM_COUNCIL_CACHE_MAX_ENTRIES", "1024")))
+
+def build_phase_cache() -> Optional[PhaseCache]:
+    if CACHE_KIND == "off":
+        return None
+    return PhaseCache(backend=build_cache_backend("llm_council:phase:"), ttl=CACHE_TTL)
+
+# ============================================
+# Council Factory
+# ============================================
+# YAML parsing and agent construction happen once; each request only builds
+# a cheap per-request task graph (see factory.py). Individual task outputs are
+# memoized in the phase cache, so a prompt change to one phase only recomputes
+# that phase and the ones after it.
+# The first call imports crewAI and builds the LLM clients (seconds); the server
+# does it in the background at startup (warm_council) so it can answer /health at once.
+_council_factory: Optional["CouncilFactory"] = None
+_council_lock = threading.Lock()
+
+def build_council_factory(recorder: Optional["Recorder"] = None,
+                          llms: Optional[Dict[str, Any]] = None) -> "CouncilFactory":
+    """The server's council; `llms` swaps in other LLMs (e.g. stubs for bench_load.py)"""
+    try:
+        from .factory import CouncilFactory
+    except ImportError:
+        from factory import CouncilFactory
+    return CouncilFactory(
+        llms=llms,
+        phase_cache=build_phase_cache(),
+        consensus=build_consensus_policy(),
+        quorum=build_quorum_policy(),
+        limiter=build_call_limiter(),
+        context=build_context_builder(),
+        usage=build_usage_tracker(),
+        recorder=recorder,
+        degrade=DEGRADE,
+        speculative=build_speculative_policy(),
+    )
+
+def get_council_factory() -> "CouncilFactory":
+    global _council_factory
+    if _council_factory is None:
+        with _council_lock:
+            if _council_factory is None:
+                _council_factory = build_council_factory(build_recorder())
+    return _council_factory
+
+def council_ready() -> bool:
+    return _council_factory is not None
+
+async def warm_council() -> "CouncilFactory":
+    """Build the council (and the answer cache) without blocking the event loop"""
+    if _council_factory is None:
+        await asyncio.to_thread(get_council_factory)
+    get_response_cache()
+    return _council_factory
+
+# ============================================
+# HTTP connection pool
+# ============================================
+# The server sends every model call through one keep-alive HTTP client per provider
+# (see pool.py) and opens its connections at startup.
+# LLM_COUNCIL_HTTP_POOL: "on" (default) or "off" (litellm's own clients)
+# LLM_COUNCIL_HTTP_MAX_CONNECTIONS: connections per provider (default 100)
+# LLM_COUNCIL_HTTP_KEEPALIVE: idle connections kept per provider (default 20)
+# LLM_COUNCIL_HTTP_KEEPALIVE_EXPIRY: seconds an idle connection stays open (default 60)
+# LLM_COUNCIL_HTTP2: "auto" (default, when h2 is installed), "on" or "off"
+# LLM_COUNCIL_HTTP_WARM: connections opened per provider at startup (default 2, 0 = none)
+def build_client_pool() -> Optional[ClientPool]:
+    if os.getenv("LLM_COUNCIL_HTTP_POOL", "on").lower() == "off":
+        return None
+    http2 = os.getenv("LLM_COUNCIL_HTTP2", "auto").lower()
+    return ClientPool(
+        max_connections=int(os.getenv("LLM_COUNCIL_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive=int(os.getenv("LLM_COUNCIL_HTTP_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("LLM_COUNCIL_HTTP_KEEPALIVE_EXPIRY", "60")),
+        http2=None if http2 == "auto" else http2 == "on",
+        warm_connections=int(os.getenv("LLM_COUNCIL_HTTP_WARM", "2")),
+    )
+
+async def warm_connections() -> None:
+    """Install the connection pool on the running loop, then open connections to the council's providers"""
+    if get_client_pool() is None:
+        set_client_pool(build_client_pool())
+    pool = get_client_pool()
+    factory = await warm_council()
+    if pool is not None and pool.warm_connections > 0:
+        await pool.warm(factory.council_llms())
+
+async def close_connections() -> None:
+    pool = get_client_pool()
+    if pool is not None:
+        await pool.close()
+        set_client_pool(None)
+
+# ============================================
+# Difficulty Router
+# ============================================
+# LLM_COUNCIL_ROUTER: "off" (default, every question gets the full council) or
+# "heuristic": each question is scored locally and answered by the council tier
+# for its difficulty (see routing.py), from LLM_COUNCIL_ROUTER_CONFIG
+# (default config/router.yaml). A request's own "council" override is never routed.
+ROUTER_KIND = os.getenv("LLM_COUNCIL_ROUTER", "off").lower()
+_router: Optional[DifficultyRouter] = None
+
+def get_router() -> Optional[DifficultyRouter]:
+    global _router
+    if _router is None and ROUTER_KIND == "heuristic":
+        _router = DifficultyRouter.from_yaml(get_council_factory().topology,
+                                             os.getenv("LLM_COUNCIL_ROUTER_CONFIG", ROUTER_CONFIG))
+    return _router
+
+# ============================================
+# Answer Cache (in front of the whole council)
+# ============================================
+_response_cache: Optional[ResponseCache] = None
+_response_cache_built = False
+
+def build_response_cache() -> Optional[ResponseCache]:
+    if CACHE_KIND == "off":
+        return None
+    backend = build_cache_backend("llm_council:answer:")
+
+    embedder = None
+    threshold = os.getenv("LLM_COUNCIL_CACHE_SIMILARITY")
+    if threshold:
+        model = os.getenv("LLM_COUNCIL_CACHE_EMBEDDING_MODEL", "local")
+        embedder = hashing_embedder() if model == "local" else litellm_embedder(model)
+
+    return ResponseCache(
+        backend=backend,
+        ttl=CACHE_TTL,
+        # Answers from an older prompt/model configuration are never served
+        namespace=get_council_factory().fingerprint,
+        embedder=embedder,
+        similarity_threshold=float(threshold or 0.92),
+    )
+
+def get_response_cache() -> Optional[ResponseCache]:
+    global _response_cache, _response_cache_built
+    if not _response_cache_built:
+        _response_cache = build_response_cache()
+        _response_cache_built = True
+    return _response_cache
+
+def cache_variant(topology: Optional[Topology]) -> str:
+    """Answers of a per-request council shape are cached apart from the default council's"""
+    return topology.fingerprint() if topology is not None else ""
+
+def route_question(question: str, topology: Optional[Topology] = None) -> Tuple[Optional[Topology], Optional[dict]]:
+    """(council shape, routing report) for a question; an explicit `topology` skips the router"""
+    router = get_router()
+    if topology is not None or router is None:
+        return topology, None
+    with get_tracer().span("route") as span:
+        decision = router.route(question)
+        span.set(tier=decision.tier, score=decision.score)
+    return decision.topology, decision.to_dict()
+
+async def cached_answer(question: str, topology: Optional[Topology] = None) -> Tuple[Optional[CachedAnswer], Optional[str]]:
+    """Look the question up in the answer cache: (answer, "exact" | "semantic") or (None, None)"""
+    cache = get_response_cache()
+    if cache is None:
+        return None, None
+    with get_tracer().span("cache.lookup") as span:
+        answer, cache_hit = await cache.get(question, cache_variant(topology))
+        span.set(hit=cache_hit)
+    return answer, cache_hit
+
+async def run_council(question: str, listener: Optional["Listener"] = None,
+                      topology: Optional[Topology] = None, restored: Optional[Dict[str, str]] = None) -> CachedAnswer:
+    """Run a full council and store the result in the answer cache"""
+    factory = await warm_council()
+    result = await factory.akickoff({"question": question}, COUNCIL_MODE, listener, topology, restored)
+    answer = CachedAnswer.from_result(result)
+    cache = get_response_cache()
+    # A partial council is served once; the next ask gets a fresh try
+    if cache is not None and not (answer.degraded and answer.degraded["partial"]):
+        await cache.set(question, answer, cache_variant(topology))
+    return answer
+
+async def answer_question(question: str, topology: Optional[Topology] = None) -> Tuple[CachedAnswer, Optional[str]]:
+    """Cached answer if there is one, otherwise a fresh council (routed by difficulty without `topology`)"""
+    await warm_council()
+    topology, routing = route_question(question, topology)
+    answer, cache_hit = await cached_answer(question, topology)
+    if answer is None:
+        answer = await run_council(question, topology=topology)
+    return dataclasses.replace(answer, routing=routing), cache_hit
+
+# ============================================
+# Jobs (submit now, poll or stream later)
+# ============================================
+# LLM_COUNCIL_JOBS_DB: SQLite file holding jobs and every finished task output, e.g.
+# /var/lib/llm_council/jobs.db; unfinished jobs resume from it on restart. Unset, jobs
+# are kept in memory (":memory:") and lost with the process
+# LLM_COUNCIL_JOB_WORKERS: jobs run at once (default 4)
+# LLM_COUNCIL_JOBS_TTL: seconds finished jobs are kept (default 7 days)
+# LLM_COUNCIL_JOB_MAX_ATTEMPTS: runs a job may start before it is failed (default 3);
+# each restart that interrupts a job costs it one
+JOBS_DB = os.getenv("LLM_COUNCIL_JOBS_DB", ":memory:")
+_job_runner: Optional[JobRunner] = None
+
+def job_topology(factory: "CouncilFactory", job: Job) -> Optional[Topology]:
+    return factory.topology.override(**job.council) if job.council else None
+
+def job_fingerprint(job: Job) -> str:
+    """Council configuration a job's saved outputs belong to (prompts, models and its override)"""
+    factory = get_council_factory()
+    return hashlib.sha256(json.dumps([factory.fingerprint, job.council], sort_keys=True).encode()).hexdigest()[:16]
+
+async def run_job(job: Job, restored: Dict[str, str], listener: "Listener") -> Tuple[CachedAnswer, Optional[str]]:
+    """answer_question() for a job: task outputs go to `listener`, `restored` ones are not recomputed"""
+    factory = await warm_council()
+    topology, routing = route_question(job.question, job_topology(factory, job))
+    answer, cache_hit = await cached_answer(job.question, topology)
+    if answer is None:
+        answer = await run_council(job.question, listener, topology, restored)
+    return dataclasses.replace(answer, routing=routing), cache_hit
+
+def get_job_runner() -> JobRunner:
+    global _job_runner
+    if _job_runner is None:
+        store = JobStore(JOBS_DB)
+        store.purge(float(os.getenv("LLM_COUNCIL_JOBS_TTL", str(7 * 24 * 3600))))
+        _job_runner = JobRunner(store, run_job, job_fingerprint,
+                                workers=int(os.getenv("LLM_COUNCIL_JOB_WORKERS", "4")),
+                                max_attempts=int(os.getenv("LLM_COUNCIL_JOB_MAX_ATTEMPTS", "3")))
+    return _job_runner
+
+# A batch runs up to BATCH_CONCURRENCY councils at once; over HTTP each one takes an
+# admission slot, so the default stays below LLM_COUNCIL_MAX_CONCURRENT
+BATCH_CONCURRENCY = int(os.getenv("LLM_COUNCIL_BATCH_CONCURRENCY", "4"))
+BATCH_MAX_QUESTIONS = int(os.getenv("LLM_COUNCIL_BATCH_MAX_QUESTIONS", "1000"))
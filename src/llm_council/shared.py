@@ -0,0 +1,114 @@
+"""
+Shared state for multi-worker / multi-node deployments of the LLM Council API
+
+Each uvicorn worker has its own admission queue, so without shared state N
+workers admit N times the configured number of councils. Cluster-wide caps
+are kept as *leases*: a holder takes one of `limit` slots under a name, keeps
+it alive with renew(), and gives it back with release(). A lease that is not
+renewed expires after its TTL, so a crashed worker cannot leak slots.
+
+- RedisSharedState: leases in a Redis sorted set (score = expiry), checked
+  and taken atomically by a Lua script using the Redis server clock
+- LocalSharedState: the same semantics in-process, a stand-in for Redis in
+  tests (tests/test_shared.py)
+
+Install for Redis: pip install redis
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Protocol
+
+
+class SharedState(Protocol):
+    async def try_acquire(self, name: str, holder: str, limit: Optional[int], ttl: float) -> bool: ...
+    async def renew(self, name: str, holder: str, ttl: float) -> None: ...
+    async def release(self, name: str, holder: str) -> None: ...
+    async def holders(self, name: str) -> List[str]: ...
+
+
+class LocalSharedState:
+    """In-process leases (tests)"""
+
+    def __init__(self):
+        self._leases: Dict[str, Dict[str, float]] = {}
+
+    def _live(self, name: str) -> Dict[str, float]:
+        now = time.monotonic()
+        leases = self._leases.setdefault(name, {})
+        for holder in [h for h, expires_at in leases.items() if expires_at <= now]:
+            del leases[holder]
+        return leases
+
+    async def try_acquire(self, name: str, holder: str, limit: Optional[int], ttl: float) -> bool:
+        leases = self._live(name)
+        if limit is not None and holder not in leases and len(leases) >= limit:
+            return False
+        leases[holder] = time.monotonic() + ttl
+        return True
+
+    async def renew(self, name: str, holder: str, ttl: float) -> None:
+        leases = self._live(name)
+        if holder in leases:
+            leases[holder] = time.monotonic() + ttl
+
+    async def release(self, name: str, holder: str) -> None:
+        self._live(name).pop(holder, None)
+
+    async def holders(self, name: str) -> List[str]:
+        return sorted(self._live(name))
+
+
+# KEYS[1] lease set; ARGV: holder, ttl (s), limit (0 = unlimited)
+_ACQUIRE = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local limit = tonumber(ARGV[3])
+if limit > 0 and not redis.call('ZSCORE', KEYS[1], ARGV[1]) and redis.call('ZCARD', KEYS[1]) >= limit then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+return 1
+"""
+
+# KEYS[1] lease set; ARGV: holder, ttl (s)
+_RENEW = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call('ZADD', KEYS[1], 'XX', now + tonumber(ARGV[2]), ARGV[1])
+return 1
+"""
+
+# KEYS[1] lease set
+_HOLDERS = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+return redis.call('ZRANGE', KEYS[1], 0, -1)
+"""
+
+
+class RedisSharedState:
+    """Leases shared by every worker pointed at the same Redis"""
+
+    def __init__(self, url: str = "redis://localhost:6379", prefix: str = "llm_council:lease:", client: Any = None):
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self._acquire = client.register_script(_ACQUIRE)
+        self._renew = client.register_script(_RENEW)
+        self._holders = client.register_script(_HOLDERS)
+
+    async def try_acquire(self, name: str, holder: str, limit: Optional[int], ttl: float) -> bool:
+        return bool(await self._acquire(keys=[self.prefix + name], args=[holder, ttl, limit or 0]))
+
+    async def renew(self, name: str, holder: str, ttl: float) -> None:
+        await self._renew(keys=[self.prefix + name], args=[holder, ttl])
+
+    async def release(self, name: str, holder: str) -> None:
+        await self.client.zrem(self.prefix + name, holder)
+
+    async def holders(self, name: str) -> List[str]:
+        return list(await self._holders(keys=[self.prefix + name]))
@@ -0,0 +1,81 @@
+"""
+Speculative chairman synthesis for the LLM Council
+
+The chairman's final answer waits for every critique, so its whole call sits
+on the critical path. In speculative mode the engine starts a draft synthesis
+from the gather drafts (speculative_answer in tasks.yaml) as soon as they
+arrive, alongside the critiques. Once the critiques land:
+
+- accept: the draft already covers what the critiques raise, so it is the
+  answer and the chairman call is off the critical path
+- revise: one short chairman call (revise_answer) fixes the draft using the
+  critiques, usually shorter than a full synthesis
+
+Coverage is a cheap local measure: the share of the terms in each critique's
+WEAKNESS and MISSING points that the draft already uses, averaged over the
+critiques. A speculation costs extra tokens either way (the draft prompt,
+plus the revise pass when it runs); the engine reports both next to the
+latency it cut.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Set
+
+try:
+    from .consensus import terms
+except ImportError:
+    from consensus import terms
+
+# Critique labels whose points the final answer has to address (free-text critiques, or the
+# merged structured ones, see critique.py)
+_POINTS = re.compile(r"^\W*(?:weakness|missing)\W*:\s*(.*)$", re.IGNORECASE | re.MULTILINE)
+_STRENGTH = re.compile(r"^\W*strength\W*:.*$", re.IGNORECASE | re.MULTILINE)
+
+# Critique phrasing that says nothing about the content
+_CRITIQUE_WORDS = frozenset(
+    "answer answers response responses model models mention mentions mentioned lacks lack missing "
+    "could should would more not no does doesn t explain explanation detail details none nothing ignores "
+    "ignore omits why how".split()
+)
+
+
+def _stems(text: str) -> Set[str]:
+    """Content terms with a plural "s" dropped, so "wavelengths" matches "wavelength" """
+    return {
+        word[:-1] if len(word) > 3 and word.endswith("s") else word
+        for word in terms(text) if word not in _CRITIQUE_WORDS
+    }
+
+
+def critique_points(critique: str) -> List[str]:
+    """The WEAKNESS/MISSING points of a critique (the whole text minus STRENGTH when unlabeled)"""
+    points = [point for point in _POINTS.findall(critique) if point.strip()]
+    return points or [_STRENGTH.sub("", critique)]
+
+
+def coverage(draft: str, critique: str) -> float:
+    """Share of the critique's point terms the draft already uses (1.0 when it raises nothing)"""
+    wanted = set().union(*(_stems(point) for point in critique_points(critique)))
+    if not wanted:
+        return 1.0
+    return len(wanted & _stems(draft)) / len(wanted)
+
+
+@dataclass
+class SpeculativeDecision:
+    coverage: float  # mean coverage of the critiques by the draft
+    accepted: bool
+
+
+@dataclass
+class SpeculativePolicy:
+    """When a speculative draft stands (accept_threshold) instead of being revised"""
+    accept_threshold: float = 0.5
+
+    def evaluate(self, draft: str, critiques: List[str]) -> SpeculativeDecision:
+        """Score the draft against the critiques (no critiques: nothing to address, accepted)"""
+        if not critiques:
+            return SpeculativeDecision(coverage=1.0, accepted=True)
+        score = sum(coverage(draft, critique) for critique in critiques) / len(critiques)
+        return SpeculativeDecision(coverage=round(score, 3), accepted=score >= self.accept_threshold)
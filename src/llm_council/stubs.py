@@ -0,0 +1,332 @@
+"""
+Stub LLMs for benchmarking the LLM Council without network access
+
+StubLLM is an in-process drop-in for crewai.LLM. StubLLMServer is a local
+OpenAI-compatible HTTP endpoint, so real crewai.LLM objects (litellm and its
+HTTP client included) can be exercised end to end without API keys; with
+`tls` it serves HTTPS with a throwaway self-signed certificate.
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import re
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+
+try:
+    from .critique import CritiqueReport
+except ImportError:
+    from critique import CritiqueReport
+
+
+# rng -> seconds for one call
+Delay = Callable[[random.Random], float]
+
+FIXED = "fixed"
+UNIFORM = "uniform"
+EXPONENTIAL = "exponential"
+LOGNORMAL = "lognormal"
+
+
+def latency_distribution(kind: str, mean: float, spread: float = 0.5) -> Delay:
+    """Per-call delays around `mean` seconds
+
+    fixed: always `mean`; uniform: mean +/- spread * mean; exponential: mean `mean`;
+    lognormal: median `mean` with log-space sigma `spread` (a long provider tail)
+    """
+    if kind == FIXED:
+        return lambda rng: mean
+    if kind == UNIFORM:
+        return lambda rng: rng.uniform(mean * (1 - spread), mean * (1 + spread))
+    if kind == EXPONENTIAL:
+        return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+    if kind == LOGNORMAL:
+        return lambda rng: rng.lognormvariate(math.log(mean), spread) if mean > 0 else 0.0
+    raise ValueError(f"Unknown latency distribution: {kind!r} "
+                     f"(expected {FIXED}, {UNIFORM}, {EXPONENTIAL} or {LOGNORMAL})")
+
+
+class StubLLM(BaseLLM):
+    """Drop-in replacement for crewai.LLM that sleeps for a fixed delay and echoes a canned answer
+
+    `delay` is seconds or a latency_distribution(). Fault injection: with
+    probability `slow_rate` a call takes `slow_delay` instead of `delay` (a
+    provider's latency tail), and with probability `error_rate` it raises
+    after its delay; the first `fail_first` calls always raise (a brief
+    outage). `seed` makes the delays and faults repeatable. `response` is a
+    function of the call's messages (used for every task) or a fixed answer
+    for free-text tasks; tasks with a structured output (critique.py) otherwise
+    get a valid canned critique of the answers their prompt marks.
+    """
+
+    def __init__(self, model: str = "stub/model", delay: Union[float, Delay] = 0.1,
+                 response: Union[str, Callable[[List[Dict[str, str]]], str], None] = None,
+                 slow_rate: float = 0.0, slow_delay: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None, fail_first: int = 0):
+        super().__init__(model=model)
+        self.delay = delay
+        self.response = response
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> str:
+        self.calls += 1
+        delay, fail = self._fault()
+        time.sleep(delay)
+        return self._answer(fail, messages, from_task)
+
+    async def acall(self, messages: Union[str, List[Dict[str, str]]], **kwargs: Any) -> str:
+        self.calls += 1
+        delay, fail = self._fault()
+        await asyncio.sleep(delay)
+        return self._answer(fail, messages, kwargs.get("from_task"))
+
+    async def astream(self, messages: Union[str, List[Dict[str, str]]], **kwargs: Any) -> AsyncIterator[str]:
+        """Same answer as acall(), one word at a time with the delay spread across the words"""
+        self.calls += 1
+        delay, fail = self._fault()
+        if fail:
+            await asyncio.sleep(delay)
+            self._answer(fail)
+        words = self._answer(messages=messages, task=kwargs.get("from_task")).split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(delay / len(words))
+            yield word if i == 0 else " " + word
+
+    def _fault(self):
+        """(delay, fail) for the next call"""
+        slow = self.slow_rate > 0 and self._rng.random() < self.slow_rate
+        fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        fail = fail or self.calls <= self.fail_first
+        if slow:
+            return self.slow_delay, fail
+        return (self.delay(self._rng) if callable(self.delay) else self.delay), fail
+
+    def _answer(self, fail: bool = False, messages: Union[str, List[Dict[str, str]], None] = None,
+                task: Optional[Any] = None) -> str:
+        if fail:
+            raise RuntimeError(f"{self.model}: injected provider error")
+        if callable(self.response):
+            return self.response(messages)
+        if getattr(task, "output_pydantic", None) is CritiqueReport:
+            return stub_critique(self.model, self.calls, answers_given(messages, task))
+        if self.response is not None:
+            return self.response
+        return f"[{self.model}] stub answer #{self.calls}"
+
+
+# The marks engine.py ("Answer 1:") and context.py ("Answer 1 = [GPT Delegate]") put on
+# the answers a structured critique reviews
+_ANSWER_MARK = re.compile(r"\bAnswer (\d+)(?=:\n| = \[)")
+
+
+# Opening of the critique_answers task (tasks.yaml), for callers that send no response_format
+_CRITIQUE_PROMPT = "Review the OTHER models' answers"
+
+
+def answers_given(messages: Union[str, List[Dict[str, str]], None], task: Optional[Any] = None) -> int:
+    """How many answers a critique prompt marks (unmarked, e.g. crewAI's own rendering: the task's context)"""
+    prompt = messages if isinstance(messages, str) else (messages or [{}])[-1].get("content", "")
+    marked = [int(position) for position in _ANSWER_MARK.findall(prompt)]
+    if marked:
+        return max(marked)
+    context = getattr(task, "context", None)
+    return len(context) if isinstance(context, list) else 1
+
+
+def stub_critique(model: str, call: int, answers: int) -> str:
+    """A valid structured critique (critique.py) reviewing answers 1..`answers`"""
+    return json.dumps({"reviews": [
+        {"answer": i, "score": 5 + (call + i) % 5, "strengths": [f"point {i} from {model}"],
+         "weaknesses": [f"gap {i} in call {call}"], "missing": []}
+        for i in range(1, answers + 1)
+    ]})
+
+
+def stub_llms(gpt: float = 0.3, claude: float = 0.2, gemini: float = 0.1) -> Dict[str, StubLLM]:
+    """Build the three council LLMs as stubs with the given per-call delays (seconds)"""
+    return {
+        "gpt4o": StubLLM(model="stub/gpt", delay=gpt),
+        "claude3": StubLLM(model="stub/claude", delay=claude),
+        "gemini2": StubLLM(model="stub/gemini", delay=gemini),
+    }
+
+
+# ============================================
+# Local OpenAI-compatible stub server
+# ============================================
+def stub_llm_app(delay: float = 0.2):
+    """FastAPI app answering /v1/chat/completions after `delay` seconds (streaming supported)"""
+    import json
+
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI(title="Stub LLM")
+
+    async def stream_chunks(model: str, content: str):
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(delay / len(words))
+            chunk = {
+                "id": "chatcmpl-stub", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word},
+                             "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    calls = itertools.count(1)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: dict):
+        messages = body.get("messages") or [{}]
+        prompt = str(messages[-1].get("content", ""))
+        if body.get("response_format") or _CRITIQUE_PROMPT in prompt:
+            # Structured critiques (critique.py) must parse as a CritiqueReport, as with StubLLM
+            content = stub_critique(body.get("model", "stub"), next(calls), answers_given(prompt))
+        else:
+            content = f"[{body.get('model')}] stub answer"
+        if body.get("stream"):
+            return StreamingResponse(stream_chunks(body.get("model", "stub"), content),
+                                     media_type="text/event-stream")
+        await asyncio.sleep(delay)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 8,
+                      "total_tokens": len(prompt) // 4 + 8},
+        }
+
+    return app
+
+
+class StubLLMServer:
+    """Run stub_llm_app() on a free local port in a background thread
+
+    with StubLLMServer(delay=0.2) as server:
+        llms = server.llms()
+
+    With `tls` the server speaks HTTPS; clients must trust `server.ca_file`.
+    """
+
+    def __init__(self, delay: float = 0.2, host: str = "127.0.0.1", port: int = 0, tls: bool = False):
+        self.delay = delay
+        self.host = host
+        self.port = port or _free_port(host)
+        self.tls = tls
+        self.ca_file: Optional[str] = None
+        self._key_file: Optional[str] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"{'https' if self.tls else 'http'}://{self.host}:{self.port}/v1"
+
+    def llms(self) -> Dict[str, LLM]:
+        """The three council LLMs, pointed at this server"""
+        return {
+            name: LLM(model=f"openai/stub-{name}", base_url=self.base_url, api_key="stub")
+            for name in ("gpt4o", "claude3", "gemini2")
+        }
+
+    def __enter__(self) -> "StubLLMServer":
+        import uvicorn
+
+        tls = {}
+        if self.tls:
+            self.ca_file, self._key_file = self_signed_certificate(self.host)
+            tls = {"ssl_certfile": self.ca_file, "ssl_keyfile": self._key_file}
+        config = uvicorn.Config(stub_llm_app(self.delay), host=self.host, port=self.port,
+                                log_level="warning", access_log=False, **tls)
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+        for path in (self.ca_file, self._key_file):
+            if path is not None:
+                os.unlink(path)
+
+
+def self_signed_certificate(host: str):
+    """(certificate, key) PEM files for `host`, valid for a day"""
+    import datetime
+    import ipaddress
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+    try:
+        alt_name = x509.IPAddress(ipaddress.ip_address(host))
+    except ValueError:
+        alt_name = x509.DNSName(host)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([alt_name]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    files = []
+    for data in (certificate.public_bytes(serialization.Encoding.PEM),
+                 key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                   serialization.NoEncryption())):
+        fd, path = tempfile.mkstemp(suffix=".pem", prefix="llm_council_stub_")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        files.append(path)
+    return files[0], files[1]
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
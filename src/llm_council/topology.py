@@ -0,0 +1,232 @@
+"""
+Council topology: which delegates sit on the council and which phases they run
+
+The topology is read from the `council:` entries in config/agents.yaml and
+config/tasks.yaml:
+
+    agents.yaml                       tasks.yaml
+    gpt_delegate:                     critique_answers:
+      llm: gpt4o                        description: ...
+      council: delegate                 council:
+    chairman:                             phase: critique
+      llm: gpt4o                          run_by: delegates
+      council: chairman                   sees: others
+
+- every `council: delegate` agent runs each `run_by: delegates` phase; the
+  `council: chairman` agent runs the `run_by: chairman` phases
+- phases run in file order; `sees` says which earlier outputs a task gets:
+  none, previous (the whole previous phase), others (the previous phase
+  minus the task's own delegate), own (its delegate's previous output) or
+  drafts (the first phase), alone or as a list; `output: critique` makes
+  the phase's replies structured critiques (see critique.py)
+- `llm` is a key of the LLM registry in crew.py (gpt4o, claude3, gemini2)
+  or a litellm model id
+- a task with `council: {fast_path: true}` is the consensus synthesis;
+  `council: {speculative: draft}` and `{speculative: revise}` are the
+  speculative chairman's draft and revise pass (see speculative.py)
+
+Topology.override() derives per-request variants: a subset of delegates
+(or other agents from agents.yaml), a subset of phases, other models. Those
+models must be in the registry (`models`): the crew.py LLM names plus every
+`llm` and `fallback` in agents.yaml, so a request cannot pick an arbitrary
+model id.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), "config")
+
+# run_by
+DELEGATES = "delegates"
+CHAIRMAN = "chairman"
+
+# sees
+NONE = "none"
+PREVIOUS = "previous"
+OTHERS = "others"
+OWN = "own"
+DRAFTS = "drafts"
+SEES = (NONE, PREVIOUS, OTHERS, OWN, DRAFTS)
+
+
+@dataclass(frozen=True)
+class PhaseSpec:
+    name: str
+    task: str  # tasks.yaml key
+    run_by: str = DELEGATES
+    sees: tuple = (NONE,)
+    output: Optional[str] = None  # structured output kind (critique.STRUCTURED_OUTPUTS), None for free text
+
+
+@dataclass(frozen=True)
+class Topology:
+    delegates: tuple          # agents.yaml keys, in council order
+    chairman: str
+    phases: tuple             # PhaseSpec, in run order
+    llms: Dict[str, str] = field(default_factory=dict, hash=False)  # agent key -> LLM registry key or model id
+    consensus_task: Optional[str] = None
+    speculative_task: Optional[str] = None  # speculative chairman draft
+    revise_task: Optional[str] = None       # ... and its revise pass
+    agents: tuple = ()        # every agent defined in agents.yaml (valid override targets)
+    available_phases: tuple = ()  # every phase defined in tasks.yaml
+    models: tuple = ()        # the model registry: LLM names and model ids an override may use
+
+    @classmethod
+    def from_config(cls, agents_config: Dict[str, Dict[str, Any]], tasks_config: Dict[str, Dict[str, Any]],
+                    models: Iterable[str] = ()) -> "Topology":
+        """The configured council; `models` are registry names besides the ones agents.yaml uses"""
+        delegates = [name for name, spec in agents_config.items() if spec.get("council") == "delegate"]
+        chairmen = [name for name, spec in agents_config.items() if spec.get("council") == "chairman"]
+        if len(chairmen) != 1:
+            raise ValueError(f"agents.yaml needs exactly one 'council: chairman' agent, found {chairmen}")
+        phases = []
+        consensus_task = None
+        speculative: Dict[str, str] = {}
+        for name, spec in tasks_config.items():
+            council = spec.get("council")
+            if not isinstance(council, dict):
+                continue
+            if council.get("fast_path"):
+                consensus_task = name
+                continue
+            if council.get("speculative"):
+                speculative[council["speculative"]] = name
+                continue
+            sees = council.get("sees", NONE)
+            phases.append(PhaseSpec(
+                name=council.get("phase", name),
+                task=name,
+                run_by=council.get("run_by", DELEGATES),
+                sees=tuple(sees) if isinstance(sees, list) else (sees,),
+                output=council.get("output"),
+            ))
+        llms = {name: str(spec["llm"]) for name, spec in agents_config.items() if spec.get("llm")}
+        fallbacks = [str(model) for spec in agents_config.values() for model in spec.get("fallback") or []]
+        topology = cls(
+            delegates=tuple(delegates),
+            chairman=chairmen[0],
+            phases=tuple(phases),
+            llms=llms,
+            consensus_task=consensus_task,
+            speculative_task=speculative.get("draft"),
+            revise_task=speculative.get("revise"),
+            agents=tuple(agents_config),
+            available_phases=tuple(phases),
+            models=tuple(sorted(set(models) | set(llms.values()) | set(fallbacks))),
+        )
+        topology.validate()
+        return topology
+
+    def validate(self) -> None:
+        if not self.delegates:
+            raise ValueError("A council needs at least one delegate")
+        unknown = [name for name in self.delegates + (self.chairman,) if self.agents and name not in self.agents]
+        if unknown:
+            raise ValueError(f"Unknown agents: {unknown} (defined in agents.yaml: {list(self.agents)})")
+        if len(set(self.delegates)) != len(self.delegates):
+            raise ValueError("Each delegate may only sit on the council once")
+        if self.chairman in self.delegates:
+            raise ValueError(f"The chairman ({self.chairman}) cannot also be a delegate")
+        if len(self.phases) < 2:
+            raise ValueError("A council needs at least two phases (drafts, then the chairman's answer)")
+        for index, phase in enumerate(self.phases):
+            if phase.run_by not in (DELEGATES, CHAIRMAN):
+                raise ValueError(f"Phase {phase.name}: run_by must be '{DELEGATES}' or '{CHAIRMAN}'")
+            bad = [sees for sees in phase.sees if sees not in SEES]
+            if bad:
+                raise ValueError(f"Phase {phase.name}: unknown 'sees' values {bad} (expected {list(SEES)})")
+            if index == 0 and (phase.run_by != DELEGATES or phase.sees != (NONE,)):
+                raise ValueError(f"The first phase ({phase.name}) must be run by the delegates and see nothing")
+            if index > 0 and NONE in phase.sees:
+                raise ValueError(f"Phase {phase.name} must see some earlier output")
+            if index > 0 and phase.run_by == DELEGATES and not self._sees_something(phase, self.phases[index - 1]):
+                raise ValueError(f"Phase {phase.name}: with delegates {list(self.delegates)} some delegate "
+                                 f"would see nothing (sees: {list(phase.sees)})")
+        if self.phases[-1].run_by != CHAIRMAN:
+            raise ValueError("The last phase must be run by the chairman (it gives the council's answer)")
+
+    def override(self, delegates: Optional[List[str]] = None, phases: Optional[List[str]] = None,
+                 models: Optional[Dict[str, str]] = None) -> "Topology":
+        """A per-request variant: other delegates, a subset of the phases, other models"""
+        variant = self
+        if delegates is not None:
+            variant = replace(variant, delegates=tuple(delegates))
+        if phases is not None:
+            known = [phase.name for phase in self.available_phases]
+            unknown = [name for name in phases if name not in known]
+            if unknown:
+                raise ValueError(f"Unknown phases: {unknown} (defined in tasks.yaml: {known})")
+            variant = replace(variant, phases=tuple(p for p in self.available_phases if p.name in phases))
+        if models:
+            unknown = [name for name in models if name not in self.agents]
+            if unknown:
+                raise ValueError(f"Unknown agents in models: {unknown}")
+            unregistered = sorted({model for model in models.values() if model not in self.models})
+            if unregistered:
+                raise ValueError(f"Unknown models: {unregistered} (available: {list(self.models)})")
+            variant = replace(variant, llms={**self.llms, **models})
+        variant.validate()
+        return variant
+
+    def _sees_something(self, phase: PhaseSpec, previous: PhaseSpec) -> bool:
+        """Whether every delegate gets some context in a delegates' phase (as crew.py wires it)"""
+        if PREVIOUS in phase.sees or DRAFTS in phase.sees:
+            return True
+        if OTHERS in phase.sees and (previous.run_by == CHAIRMAN or len(self.delegates) > 1):
+            return True
+        return OWN in phase.sees and previous.run_by == DELEGATES
+
+    def as_override(self) -> Dict[str, Any]:
+        """override() arguments that rebuild this council from the configured one"""
+        return {
+            "delegates": list(self.delegates),
+            "phases": [phase.name for phase in self.phases],
+            "models": {name: self.llms[name] for name in self.delegates + (self.chairman,) if name in self.llms},
+        }
+
+    def fingerprint(self) -> str:
+        """Short hash of the council shape (delegates, phases, models)"""
+        shape = [
+            list(self.delegates), self.chairman,
+            [[p.name, p.task, p.run_by, list(p.sees), p.output] for p in self.phases],
+            {name: self.llms.get(name) for name in self.delegates + (self.chairman,)},
+            self.consensus_task,
+            self.speculative_task,
+            self.revise_task,
+        ]
+        return hashlib.sha256(json.dumps(shape).encode()).hexdigest()[:16]
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "delegates": {name: self.llms.get(name) for name in self.delegates},
+            "chairman": {self.chairman: self.llms.get(self.chairman)},
+            "phases": [
+                {"name": p.name, "task": p.task, "run_by": p.run_by, "sees": list(p.sees), "output": p.output}
+                for p in self.phases
+            ],
+            "available_agents": list(self.agents),
+            "available_phases": [p.name for p in self.available_phases],
+            "available_models": list(self.models),
+            "calls_per_question": sum(
+                len(self.delegates) if p.run_by == DELEGATES else 1 for p in self.phases),
+        }
+
+
+def task_prefix(agent_name: str) -> str:
+    """Delegate task names are <prefix>_<phase>: gpt_delegate -> gpt (gpt_gather, gpt_critique)"""
+    return agent_name[: -len("_delegate")] if agent_name.endswith("_delegate") else agent_name
+
+
+def load_topology(config_dir: str = CONFIG_DIR, models: Iterable[str] = ()) -> Topology:
+    """The configured council read straight from agents.yaml and tasks.yaml: no crewAI, agents or LLMs"""
+    configs = []
+    for name in ("agents.yaml", "tasks.yaml"):
+        with open(os.path.join(config_dir, name), encoding="utf-8") as f:
+            configs.append(yaml.safe_load(f) or {})
+    return Topology.from_config(*configs, models=models)
@@ -0,0 +1,365 @@
+"""
+Span-based tracing for the LLM Council
+
+A trace follows one HTTP request (or one CLI council) through the council DAG:
+
+    http POST /ask
+      cache.lookup
+      admission.wait
+      council
+        phase gather
+          task gpt_gather
+            llm.queue      waiting for a CallLimiter slot / rate budget
+            llm.call       the model call itself (thread_wait_s when it ran in a worker thread)
+          ...
+        phase critique
+        phase synthesis
+
+Spans follow the asyncio task tree through contextvars, like OpenTelemetry's
+context propagation. A finished trace goes to every configured exporter:
+
+- InMemoryExporter: the last N traces, served by /traces
+- ConsoleExporter: an indented span tree and the critical path on stderr
+- OpenTelemetryExporter: replays spans through the opentelemetry SDK
+  (pip install opentelemetry-sdk opentelemetry-exporter-otlp)
+
+critical_path() walks a trace backwards from the root's end, always
+following the child that finished last, which splits the request's latency
+into the spans that actually gated it (a fast critique running alongside a
+slow one is not on the path).
+"""
+
+import contextvars
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Protocol, TextIO
+
+# perf_counter() -> epoch seconds, for exporters that want wall-clock timestamps
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start: float = 0.0  # time.perf_counter()
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start + _EPOCH_OFFSET, 6),
+            "duration_s": round(self.duration, 6),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan(Span):
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan(name="", trace_id="", span_id="")
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("llm_council_span", default=None)
+
+
+class Exporter(Protocol):
+    def export(self, spans: List[Span]) -> None: ...
+
+
+# ============================================
+# Critical path
+# ============================================
+def critical_path(spans: List[Span], min_self_s: float = 0.001) -> Dict[str, Any]:
+    """Split the root span's duration into the spans that gated it
+
+    Returns {"total_s", "path": [{"name", "self_s"}, ...] in time order,
+    "by_name": {span name without its argument: seconds}}. Time a span spent
+    outside all of its critical children counts as that span's own; "path"
+    leaves out steps shorter than `min_self_s`, "by_name" counts everything.
+    """
+    root = next((s for s in spans if s.parent_id is None), None)
+    if root is None:
+        return {"total_s": 0.0, "path": [], "by_name": {}}
+    children: Dict[str, List[Span]] = {}
+    for span in spans:
+        if span.parent_id is not None and span.end is not None:
+            children.setdefault(span.parent_id, []).append(span)
+
+    path: List[Dict[str, Any]] = []
+
+    def walk(span: Span, end: float) -> None:
+        cursor = end
+        segments = []
+        for child in sorted(children.get(span.span_id, []), key=lambda s: s.end, reverse=True):
+            if child.end <= cursor + 1e-9 and child.start >= span.start - 1e-9:
+                segments.append((span.name, cursor - child.end))
+                segments.append(child)
+                cursor = child.start
+        segments.append((span.name, cursor - span.start))
+        for segment in reversed(segments):
+            if isinstance(segment, Span):
+                walk(segment, segment.end)
+            elif segment[1] > 0:
+                path.append({"name": segment[0], "self_s": segment[1]})
+
+    walk(root, root.end if root.end is not None else time.perf_counter())
+    by_name: Dict[str, float] = {}
+    for step in path:
+        kind = step["name"].split(" ", 1)[0]
+        by_name[kind] = by_name.get(kind, 0.0) + step["self_s"]
+    # Merge consecutive self-time slices of the same span
+    merged: List[Dict[str, Any]] = []
+    for step in path:
+        if merged and merged[-1]["name"] == step["name"]:
+            merged[-1]["self_s"] += step["self_s"]
+        else:
+            merged.append(dict(step))
+    return {
+        "total_s": round(root.duration, 6),
+        "path": [{"name": step["name"], "self_s": round(step["self_s"], 6)}
+                 for step in merged if step["self_s"] >= min_self_s],
+        "by_name": {name: round(seconds, 6) for name, seconds in by_name.items()},
+    }
+
+
+def trace_summary(spans: List[Span]) -> Dict[str, Any]:
+    root = next((s for s in spans if s.parent_id is None), spans[0])
+    return {
+        "trace_id": root.trace_id,
+        "name": root.name,
+        "start": round(root.start + _EPOCH_OFFSET, 6),
+        "duration_s": round(root.duration, 6),
+        "spans": len(spans),
+        "error": root.error,
+        "critical_path": critical_path(spans),
+    }
+
+
+# ============================================
+# Exporters
+# ============================================
+class InMemoryExporter:
+    """Keeps the most recent `max_traces` traces"""
+
+    def __init__(self, max_traces: int = 100):
+        self.max_traces = max_traces
+        self.traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+
+    def export(self, spans: List[Span]) -> None:
+        self.traces[spans[0].trace_id] = spans
+        while len(self.traces) > self.max_traces:
+            self.traces.popitem(last=False)
+
+    def get(self, trace_id: str) -> Optional[List[Span]]:
+        return self.traces.get(trace_id)
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return [trace_summary(spans) for spans in reversed(list(self.traces.values())[-limit:])]
+
+
+class ConsoleExporter:
+    """Prints each trace as an indented span tree followed by its critical path"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stderr
+
+    def export(self, spans: List[Span]) -> None:
+        children: Dict[Optional[str], List[Span]] = {}
+        for span in spans:
+            children.setdefault(span.parent_id, []).append(span)
+        lines = [f"trace {spans[0].trace_id}"]
+
+        def show(span: Span, depth: int) -> None:
+            attributes = " ".join(f"{k}={v}" for k, v in span.attributes.items())
+            error = f" ERROR {span.error}" if span.error else ""
+            lines.append(f"{'  ' * (depth + 1)}{span.name} {span.duration * 1000:.1f}ms {attributes}{error}".rstrip())
+            for child in sorted(children.get(span.span_id, []), key=lambda s: s.start):
+                show(child, depth + 1)
+
+        for root in children.get(None, []):
+            show(root, 0)
+        path = critical_path(spans)
+        lines.append("  critical path: " + " -> ".join(
+            f"{step['name']} {step['self_s'] * 1000:.1f}ms" for step in path["path"]))
+        print("\n".join(lines), file=self.stream, flush=True)
+
+
+class OpenTelemetryExporter:
+    """Replays finished traces through the OpenTelemetry SDK's configured tracer provider"""
+
+    def __init__(self, tracer: Any = None):
+        if tracer is None:
+            from opentelemetry import trace
+            tracer = trace.get_tracer("llm_council")
+        self.tracer = tracer
+
+    def export(self, spans: List[Span]) -> None:
+        from opentelemetry import trace
+        from opentelemetry.trace import Status, StatusCode
+
+        replayed: Dict[str, Any] = {}
+        for span in sorted(spans, key=lambda s: s.start):
+            parent = replayed.get(span.parent_id)
+            context = trace.set_span_in_context(parent) if parent is not None else None
+            otel_span = self.tracer.start_span(
+                span.name, context=context,
+                start_time=int((span.start + _EPOCH_OFFSET) * 1e9),
+                attributes={k: v for k, v in span.attributes.items() if v is not None},
+            )
+            if span.error:
+                otel_span.set_status(Status(StatusCode.ERROR, span.error))
+            replayed[span.span_id] = otel_span
+        for span in spans:
+            replayed[span.span_id].end(end_time=int((span.start + span.duration + _EPOCH_OFFSET) * 1e9))
+
+
+# ============================================
+# Tracer
+# ============================================
+class Tracer:
+    """Creates spans and hands each finished trace to the exporters (no exporters: tracing off)"""
+
+    def __init__(self, exporters: Optional[List[Exporter]] = None):
+        self.exporters = list(exporters or [])
+        self._open: Dict[str, List[Span]] = {}  # trace_id -> finished spans so far
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def memory(self) -> Optional[InMemoryExporter]:
+        return next((e for e in self.exporters if isinstance(e, InMemoryExporter)), None)
+
+    def _start(self, name: str, start: float, attributes: Dict[str, Any]) -> Span:
+        parent = _current.get()
+        if parent is None or parent.trace_id not in self._open:
+            trace_id, parent_id = uuid.uuid4().hex, None
+            self._open[trace_id] = []
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        return Span(name=name, trace_id=trace_id, span_id=uuid.uuid4().hex[:16], parent_id=parent_id,
+                    start=start, attributes=attributes)
+
+    def _finish(self, span: Span) -> None:
+        spans = self._open.get(span.trace_id)
+        if spans is None:
+            return  # its trace was already exported
+        spans.append(span)
+        if span.parent_id is None:
+            del self._open[span.trace_id]
+            for exporter in self.exporters:
+                exporter.export(spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """A child of the current span (or a new trace's root); records the error if the block raises"""
+        if not self.enabled:
+            yield _NOOP
+            return
+        span = self._start(name, time.perf_counter(), attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current.reset(token)
+            self._finish(span)
+
+    def add_span(self, name: str, start: float, end: float, **attributes: Any) -> None:
+        """Record an interval measured elsewhere (perf_counter times) as a child of the current span"""
+        if not self.enabled or end <= start:
+            return
+        span = self._start(name, start, attributes)
+        span.end = end
+        self._finish(span)
+
+
+def current_span() -> Span:
+    """The innermost open span (a no-op span outside any trace)"""
+    return _current.get() or _NOOP
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current.get()
+    return span.trace_id if span is not None else None
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    global _tracer
+    _tracer = tracer
+
+
+def tracer_from_env(value: Optional[str] = None) -> Tracer:
+    """LLM_COUNCIL_TRACE: comma-separated "memory", "console", "otel"; "off" disables tracing"""
+    exporters: List[Exporter] = []
+    for kind in (value if value is not None else os.getenv("LLM_COUNCIL_TRACE", "memory")).split(","):
+        kind = kind.strip().lower()
+        if kind == "memory":
+            exporters.append(InMemoryExporter(int(os.getenv("LLM_COUNCIL_TRACE_KEEP", "100"))))
+        elif kind == "console":
+            exporters.append(ConsoleExporter())
+        elif kind == "otel":
+            exporters.append(OpenTelemetryExporter())
+        elif kind not in ("", "off"):
+            raise ValueError(f"Unknown trace exporter: {kind!r} (expected memory, console, otel or off)")
+    return Tracer(exporters)
+
+
+# ============================================
+# ASGI middleware
+# ============================================
+class TraceMiddleware:
+    """Root span per HTTP request, kept open until a streamed response has been sent in full
+
+    The trace id is returned in the X-Trace-Id response header.
+    """
+
+    def __init__(self, app: Any, exclude: tuple = ("/health", "/metrics", "/traces")):
+        self.app = app
+        self.exclude = exclude
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        tracer = get_tracer()
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not tracer.enabled or path.startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+        with tracer.span(f"http {scope['method']} {path}", method=scope["method"], path=path) as span:
+            async def send_with_trace(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    span.set(status=message["status"])
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"x-trace-id", span.trace_id.encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
@@ -0,0 +1,177 @@
+"""
+Token, latency and cost accounting for the LLM Council
+
+The engine records one CallRecord for every model call a council makes,
+tagged with the task, agent role, model and phase. Token counts come from
+the provider's `usage` when it reports one and are estimated from the text
+otherwise (`estimated: true`). Cost uses litellm's price table, or prices
+given per model in USD per million tokens.
+
+UsageTracker aggregates records across requests for /status and renders
+them in the Prometheus text format for /metrics.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .admission import Histogram
+except ImportError:
+    from admission import Histogram
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+
+@dataclass
+class CallRecord:
+    """One model call"""
+    task: str
+    agent: str
+    model: str
+    phase: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency: float             # seconds spent in the call (not waiting for a CallLimiter slot)
+    cost: Optional[float]      # USD; None when the model has no known price
+    estimated: bool = False    # token counts estimated from the text, not reported by the provider
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["latency"] = round(self.latency, 3)
+        return data
+
+
+def summarize(records: Iterable[CallRecord], key: Optional[str] = None) -> Dict[str, Any]:
+    """Totals over `records`, or totals per value of the `key` field ("phase", "model", ...)"""
+    if key is not None:
+        groups: Dict[str, List[CallRecord]] = {}
+        for record in records:
+            groups.setdefault(getattr(record, key), []).append(record)
+        return {name: summarize(group) for name, group in groups.items()}
+    records = list(records)
+    costs = [r.cost for r in records if r.cost is not None]
+    return {
+        "calls": len(records),
+        "prompt_tokens": sum(r.prompt_tokens for r in records),
+        "completion_tokens": sum(r.completion_tokens for r in records),
+        "latency_s": round(sum(r.latency for r in records), 3),
+        "cost_usd": round(sum(costs), 6) if costs else None,
+    }
+
+
+def request_usage(records: List[CallRecord]) -> Dict[str, Any]:
+    """Per-request usage report: every call, plus totals per phase and per model"""
+    return {
+        "calls": [record.to_dict() for record in records],
+        "by_phase": summarize(records, "phase"),
+        "by_model": summarize(records, "model"),
+        "total": summarize(records),
+    }
+
+
+class _Series:
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+
+class UsageTracker:
+    """Running usage totals per (model, phase, task, agent)
+
+    prices: USD per million tokens as (input, output), keyed by model id;
+        overrides litellm's price table (and prices models it does not know)
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.prices = prices or {}
+        self.started = time.time()
+        self._series: Dict[Tuple[str, str, str, str], _Series] = {}
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        if model in self.prices:
+            prompt_price, completion_price = self.prices[model]
+            return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+        import litellm  # several seconds to import; only needed once a model call is priced
+        if model not in litellm.model_cost and model.split("/", 1)[-1] not in litellm.model_cost:
+            return None
+        try:
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        except Exception:
+            return None
+        return prompt_cost + completion_cost
+
+    def record(self, records: Iterable[CallRecord]) -> None:
+        for record in records:
+            series = self._series.setdefault((record.model, record.phase, record.task, record.agent), _Series())
+            series.calls += 1
+            series.prompt_tokens += record.prompt_tokens
+            series.completion_tokens += record.completion_tokens
+            series.cost += record.cost or 0.0
+            series.latency.observe(record.latency)
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals overall and per model, phase and task, for /status"""
+        def totals(index: Optional[int]) -> Dict[str, Any]:
+            groups: Dict[str, Dict[str, Any]] = {}
+            for key, series in self._series.items():
+                group = groups.setdefault("total" if index is None else key[index], {
+                    "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+                group["calls"] += series.calls
+                group["prompt_tokens"] += series.prompt_tokens
+                group["completion_tokens"] += series.completion_tokens
+                group["cost_usd"] += series.cost
+            for group in groups.values():
+                group["cost_usd"] = round(group["cost_usd"], 6)
+            return groups
+
+        return {
+            "since": self.started,
+            "total": totals(None).get("total", {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                                                "cost_usd": 0.0}),
+            "by_model": totals(0),
+            "by_phase": totals(1),
+            "by_task": totals(2),
+        }
+
+    def prometheus(self, prefix: str = "llm_council") -> str:
+        """Prometheus text exposition of the running totals and latency histograms"""
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def labels(key: Tuple[str, str, str, str], **extra: str) -> str:
+            pairs = dict(zip(("model", "phase", "task", "agent"), key), **extra)
+            return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs.items())
+
+        metric("llm_calls_total", "counter", "Model calls made by council tasks")
+        for key, series in self._series.items():
+            lines.append(f"{prefix}_llm_calls_total{{{labels(key)}}} {series.calls}")
+        metric("llm_tokens_total", "counter", "Tokens sent and received by council tasks")
+        for key, series in self._series.items():
+            lines.append(f'{prefix}_llm_tokens_total{{{labels(key, type="prompt")}}} {series.prompt_tokens}')
+            lines.append(f'{prefix}_llm_tokens_total{{{labels(key, type="completion")}}} {series.completion_tokens}')
+        metric("llm_cost_usd_total", "counter", "Estimated cost of council model calls in USD")
+        for key, series in self._series.items():
+            lines.append(f"{prefix}_llm_cost_usd_total{{{labels(key)}}} {series.cost:.6f}")
+        metric("llm_call_seconds", "histogram", "Latency of council model calls")
+        for key, series in self._series.items():
+            histogram = series.latency
+            running = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                running += count
+                lines.append(f'{prefix}_llm_call_seconds_bucket{{{labels(key, le=str(bound))}}} {running}')
+            lines.append(f'{prefix}_llm_call_seconds_bucket{{{labels(key, le="+Inf")}}} {histogram.count}')
+            lines.append(f"{prefix}_llm_call_seconds_sum{{{labels(key)}}} {histogram.sum:.6f}")
+            lines.append(f"{prefix}_llm_call_seconds_count{{{labels(key)}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,87 @@
+"""Background jobs (jobs.py): resume, the attempt cap and admission of each run"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from llm_council.cache import CachedAnswer
+from llm_council.jobs import DONE, FAILED, QUEUED, JobRunner, JobStore
+
+
+def answer(text):
+    return CachedAnswer(final_answer=text)
+
+
+async def run_job(job, restored, listener):
+    await listener({"event": "task", "index": 0, "task": "gpt_gather", "agent": "GPT Delegate",
+                    "output": restored.get("gpt_gather", "draft"), "cached": "gpt_gather" in restored})
+    return answer(f"answer to {job.question}"), None
+
+
+async def finish(runner, job_id):
+    while runner.store.get(job_id).status not in (DONE, FAILED):
+        await asyncio.sleep(0.01)
+    await runner.stop()
+    return runner.store.get(job_id)
+
+
+def test_interrupted_job_resumes_from_saved_outputs():
+    async def scenario():
+        store = JobStore()
+        job = store.create("Why?")
+        store.start(job.id, "config")  # a previous process started it, saved a task and died
+        store.save_output(job.id, {"task": "gpt_gather", "index": 0, "agent": "GPT Delegate",
+                                   "output": "saved draft", "cached": False})
+        runner = JobRunner(store, run_job, lambda job: "config")
+        runner.start()
+        return runner, await finish(runner, job.id)
+
+    runner, job = asyncio.run(scenario())
+    assert (job.status, job.attempts, job.result["final_answer"]) == (DONE, 2, "answer to Why?")
+    assert (runner.resumed, runner.restored_tasks) == (1, 1)
+
+
+def test_job_fails_after_max_attempts():
+    async def scenario():
+        store = JobStore()
+        job = store.create("Why?")
+        for _ in range(3):
+            store.start(job.id, "config")  # three runs, each interrupted
+        calls = []
+
+        async def run(job, restored, listener):
+            calls.append(job.id)
+            return answer("never"), None
+
+        runner = JobRunner(store, run, lambda job: "config", max_attempts=3)
+        runner.start()
+        return runner, await finish(runner, job.id), calls
+
+    runner, job, calls = asyncio.run(scenario())
+    assert (job.status, job.attempts, calls) == (FAILED, 3, [])
+    assert "3 interrupted attempts" in job.error
+    assert runner.stats()["abandoned_jobs"] == 1
+
+
+def test_each_run_is_admitted():
+    async def scenario():
+        store = JobStore()
+        gate = asyncio.Event()
+        admitted = []
+
+        @asynccontextmanager
+        async def admit(job):
+            await gate.wait()  # no free slot yet
+            admitted.append(job.id)
+            yield
+
+        runner = JobRunner(store, run_job, lambda job: "config", workers=2)
+        runner.start(admit=admit)
+        job = runner.submit("Why?")
+        await asyncio.sleep(0.05)
+        waiting = store.get(job.id)
+        gate.set()
+        return waiting, await finish(runner, job.id), admitted
+
+    waiting, job, admitted = asyncio.run(scenario())
+    assert (waiting.status, waiting.attempts) == (QUEUED, 0)  # waiting for a slot does not use an attempt
+    assert (job.status, admitted) == (DONE, [job.id])
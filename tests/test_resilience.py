@@ -0,0 +1,125 @@
+"""Retries, fallback models, degraded councils and provider backpressure (engine.py, resilience.py)"""
+
+import pytest
+
+from llm_council.cache import PhaseCache
+from llm_council.factory import CouncilFactory
+from llm_council.resilience import AgentPolicy, RetryPolicy, TaskFailed
+from llm_council.scheduler import CallLimiter, ProviderLimits, ProviderSaturated
+from llm_council.stubs import StubLLM
+
+QUESTION = {"question": "Why is the sky blue?"}
+
+
+def llms(**faults):
+    """The council's three stubs; `faults` are StubLLM fault settings per model name"""
+    return {
+        name: StubLLM(model=f"stub/{name}", delay=0.0, response=f"{name} answer", **faults.get(name, {}))
+        for name in ("gpt4o", "claude3", "gemini2")
+    }
+
+
+# Resilience is opt-in (agents.yaml sets none): each agent retries once, then tries its fallback
+FALLBACKS = {
+    "GPT Delegate": "claude3",
+    "Claude Delegate": "gemini2",
+    "Gemini Delegate": "claude3",
+    "Council Chairman": "claude3",
+}
+
+
+def resilient(llms, **settings):
+    factory = CouncilFactory(llms=llms, **settings)
+    factory.engine.policies = {
+        role: AgentPolicy(retry=RetryPolicy(attempts=2, backoff=0.01), fallbacks=[llms[model]])
+        for role, model in FALLBACKS.items()
+    }
+    return factory
+
+
+def task(result, name):
+    return next(t for t in result.tasks if t.name == name)
+
+
+def test_retry_answers_with_the_agents_model_and_caches_it():
+    cache = PhaseCache()
+    result = resilient(llms(gpt4o={"fail_first": 1}), phase_cache=cache, degrade=True).kickoff(QUESTION)
+    draft = task(result, "gpt_gather")
+    assert (draft.model, draft.attempts, draft.output.raw) == ("stub/gpt4o", 2, "gpt4o answer")
+    assert result.degraded["recovered"]["gpt_gather"] == {"attempts": 2, "model": "stub/gpt4o"}
+    assert not result.degraded["partial"]
+
+    again = CouncilFactory(llms=llms(), phase_cache=cache).kickoff(QUESTION)
+    assert task(again, "gpt_gather").cached
+
+
+def test_fallback_answer_is_not_cached_under_the_primary_model():
+    cache = PhaseCache()
+    outage = llms(gpt4o={"error_rate": 1.0})
+    result = resilient(outage, phase_cache=cache, degrade=True).kickoff(QUESTION)
+    draft = task(result, "gpt_gather")
+    assert (draft.model, draft.attempts, draft.output.raw) == ("stub/claude3", 3, "claude3 answer")
+    assert result.degraded["recovered"]["gpt_gather"]["model"] == "stub/claude3"
+    assert task(result, "final_answer").model == "stub/claude3"  # the chairman's fallback too
+
+    # gpt4o is back: its tasks call it instead of replaying claude3's replies
+    healthy = llms()
+    again = CouncilFactory(llms=healthy, phase_cache=cache).kickoff(QUESTION)
+    draft = task(again, "gpt_gather")
+    assert (draft.cached, draft.model, draft.output.raw) == (False, "stub/gpt4o", "gpt4o answer")
+    assert task(again, "claude_gather").cached  # answered by its own model the first time
+    assert healthy["gpt4o"].calls == 3  # gather, critique and the chairman
+
+
+def test_exhausted_chain_degrades_to_a_partial_council():
+    cache = PhaseCache()
+    outage = llms(claude3={"error_rate": 1.0}, gemini2={"error_rate": 1.0})
+    result = resilient(outage, phase_cache=cache, degrade=True).kickoff(QUESTION)
+    gather = result.degraded["phases"]["gather"]
+    assert sorted(gather["failed"]) == ["claude_gather", "gemini_gather"]
+    assert "after 4 attempts" in gather["errors"]["claude_gather"]  # 2 on claude3, then 2 on gemini2
+    assert result.degraded["partial"]
+    assert [t.name for t in result.tasks] == ["gpt_gather"]
+    assert task(result, "gpt_gather").model == "stub/gpt4o"
+    assert (result.degraded["final_answer"], result.final_answer) == ("draft:gpt_gather", "gpt4o answer")
+    # Failed tasks store nothing: the next run asks them again
+    assert set(cache.misses) >= {"claude_gather", "gemini_gather"}
+    again = CouncilFactory(llms=llms(), phase_cache=cache).kickoff(QUESTION)
+    assert not task(again, "claude_gather").cached
+    assert task(again, "claude_gather").output.raw == "claude3 answer"
+
+
+def test_exhausted_chain_fails_the_council_without_degrade():
+    outage = llms(claude3={"error_rate": 1.0}, gemini2={"error_rate": 1.0})
+    with pytest.raises(TaskFailed) as failure:
+        resilient(outage, degrade=False).kickoff(QUESTION)
+    models = [model for model, _ in failure.value.errors]
+    assert len(models) == 4 and set(models) == {"stub/claude3", "stub/gemini2"}  # both chains, 2 attempts each
+
+
+def saturating_factory(degrade):
+    """Every delegate on one stub model that takes a single call and lets one more wait: the third is refused"""
+    shared = StubLLM(model="stub/shared", delay=0.1, response="shared answer")
+    limiter = CallLimiter(providers={"stub/shared": ProviderLimits(concurrency=1, max_queue=1)})
+    return resilient({name: shared for name in ("gpt4o", "claude3", "gemini2")}, limiter=limiter, degrade=degrade)
+
+
+@pytest.mark.parametrize("degrade", [False, True])
+def test_saturated_provider_is_not_retried_or_degraded(degrade):
+    factory = saturating_factory(degrade)
+    with pytest.raises(ProviderSaturated):
+        factory.kickoff(QUESTION)
+    assert factory.engine.resilience_stats()["retries"] == 0
+
+
+def test_saturated_provider_is_a_503(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from llm_council import api, service
+
+    monkeypatch.setattr(service, "_council_factory", saturating_factory(degrade=True))
+    with TestClient(api.app) as client:
+        for path in ("/ask", "/ask/detailed"):
+            response = client.post(path, json={"question": f"Saturated at {path}?"})
+            assert response.status_code == 503, path
+            assert "saturated" in response.json()["detail"]
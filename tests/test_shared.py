@@ -0,0 +1,134 @@
+"""Cluster-wide admission (admission.py) against in-process leases (shared.py)"""
+
+import asyncio
+
+import pytest
+
+from llm_council.admission import AdmissionQueue, QueueTimeout
+from llm_council.shared import LocalSharedState
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def worker(shared, **kwargs):
+    """One uvicorn worker's queue; workers of a cluster share `shared`"""
+    return AdmissionQueue(**{"max_concurrent": 1, "max_wait": 1.0, "shared": shared, "lease_ttl": 0.3, **kwargs})
+
+
+def test_leases_respect_the_limit():
+    async def scenario():
+        shared = LocalSharedState()
+        assert await shared.try_acquire("councils", "a", 2, ttl=10)
+        assert await shared.try_acquire("councils", "b", 2, ttl=10)
+        assert not await shared.try_acquire("councils", "c", 2, ttl=10)
+        assert await shared.try_acquire("councils", "a", 2, ttl=10)  # a holder renews its own lease
+        await shared.release("councils", "a")
+        assert await shared.try_acquire("councils", "c", 2, ttl=10)
+        return await shared.holders("councils")
+
+    assert run(scenario()) == ["b", "c"]
+
+
+def test_lease_expires_without_renewal():
+    async def scenario():
+        shared = LocalSharedState()
+        await shared.try_acquire("councils", "crashed", 1, ttl=0.05)
+        blocked = await shared.try_acquire("councils", "next", 1, ttl=10)
+        await asyncio.sleep(0.1)
+        return blocked, await shared.try_acquire("councils", "next", 1, ttl=10), await shared.holders("councils")
+
+    assert run(scenario()) == (False, True, ["next"])
+
+
+def test_renewal_keeps_a_lease_alive():
+    async def scenario():
+        shared = LocalSharedState()
+        await shared.try_acquire("councils", "a", 1, ttl=0.1)
+        for _ in range(3):
+            await asyncio.sleep(0.05)
+            await shared.renew("councils", "a", ttl=0.1)
+        return await shared.holders("councils")
+
+    assert run(scenario()) == ["a"]
+
+
+def test_cap_is_shared_across_workers():
+    async def scenario():
+        shared = LocalSharedState()
+        first, second = worker(shared), worker(shared)
+        order = []
+
+        async def council(queue, name, hold):
+            async with queue.admit("client"):
+                order.append((name, await queue.cluster_active()))
+                await asyncio.sleep(hold)
+
+        await asyncio.gather(council(first, "first", 0.2), council(second, "second", 0.0))
+        return order, await shared.holders("councils")
+
+    order, holders = run(scenario())
+    assert order == [("first", 1), ("second", 1)]  # never two councils in the cluster at once
+    assert holders == []
+
+
+def test_worker_times_out_when_cluster_is_full():
+    async def scenario():
+        shared = LocalSharedState()
+        first, second = worker(shared, lease_ttl=0.15), worker(shared, max_wait=0.3)
+        async with first.admit("client"):
+            # first keeps renewing its lease, so it outlives lease_ttl
+            with pytest.raises(QueueTimeout):
+                async with second.admit("client"):
+                    pass
+        return second.timed_out, second.active
+
+    assert run(scenario()) == (1, 0)
+
+
+def test_failed_council_releases_its_lease():
+    async def scenario():
+        shared = LocalSharedState()
+        queue = worker(shared)
+        with pytest.raises(RuntimeError):
+            async with queue.admit("client"):
+                raise RuntimeError("council crashed")
+        return await shared.holders("councils"), queue.active
+
+    assert run(scenario()) == ([], 0)
+
+
+def test_cancelled_council_releases_its_lease():
+    async def scenario():
+        shared = LocalSharedState()
+        queue = worker(shared)
+        admitted = asyncio.Event()
+
+        async def council():
+            async with queue.admit("client"):
+                admitted.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(council())
+        await admitted.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await shared.holders("councils"), queue.active
+
+    assert run(scenario()) == ([], 0)
+
+
+def test_crashed_worker_slot_frees_after_ttl():
+    async def scenario():
+        shared = LocalSharedState()
+        # A worker that died mid-council: its lease is never renewed or released
+        await shared.try_acquire("councils", "dead-worker", 1, ttl=0.2)
+        survivor = worker(shared, max_wait=2.0)
+        async with survivor.admit("client") as ticket:
+            return ticket.waited, await shared.holders("councils")
+
+    waited, holders = run(scenario())
+    assert 0.15 <= waited < 2.0
+    assert len(holders) == 1 and holders != ["dead-worker"]
@@ -0,0 +1,61 @@
+"""Per-request council overrides (topology.py)"""
+
+import pytest
+
+from llm_council.crew import MODELS, LlmCouncil
+
+
+def test_override_accepts_registry_models():
+    topology = LlmCouncil().topology
+    assert set(MODELS) <= set(topology.models)
+    variant = topology.override(models={"gemini_delegate": "claude3", "chairman": "gemini2"})
+    assert variant.llms["gemini_delegate"] == "claude3"
+    assert variant.models == topology.models
+
+
+def test_override_rejects_models_outside_the_registry():
+    with pytest.raises(ValueError, match="Unknown models"):
+        LlmCouncil().topology.override(models={"chairman": "openai/gpt-4o-mini"})
+
+
+def test_registry_includes_models_the_council_was_given():
+    topology = LlmCouncil(llms={"chair": object()}).topology
+    assert topology.override(models={"chairman": "chair"}).llms["chairman"] == "chair"
+
+
+def test_override_rejects_a_lone_delegate_with_nothing_to_critique():
+    # critique_answers sees the OTHER delegates' drafts: one delegate would review nothing
+    with pytest.raises(ValueError, match="would see nothing"):
+        LlmCouncil().topology.override(delegates=["gpt_delegate"])
+
+
+def test_lone_delegate_without_critiques_is_fine():
+    variant = LlmCouncil().topology.override(delegates=["gpt_delegate"], phases=["gather", "synthesis"])
+    assert variant.describe()["calls_per_question"] == 2
+
+
+def test_override_rejects_the_chairman_as_a_delegate():
+    with pytest.raises(ValueError, match="cannot also be a delegate"):
+        LlmCouncil().topology.override(delegates=["chairman"], phases=["gather", "synthesis"])
+    with pytest.raises(ValueError):
+        LlmCouncil().topology.override(delegates=["chairman"])
+
+
+def test_invalid_override_is_a_400(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from llm_council import api, service
+    from llm_council.factory import CouncilFactory
+    from llm_council.stubs import stub_llms
+
+    monkeypatch.setattr(service, "_council_factory", CouncilFactory(llms=stub_llms(0.0, 0.0, 0.0)))
+    with TestClient(api.app) as client:
+        for delegates in (["gpt_delegate"], ["chairman"]):
+            response = client.post("/ask", json={"question": "Why?", "council": {"delegates": delegates}})
+            assert response.status_code == 400, delegates
+
+
+def test_load_topology_matches_the_built_council():
+    from llm_council.topology import load_topology
+
+    assert load_topology().fingerprint() == LlmCouncil().topology.fingerprint()